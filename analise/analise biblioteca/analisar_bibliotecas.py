@@ -26,6 +26,8 @@ def criar_dataframe_comparativo(resultados):
         for nome_bib, dados_bib in teste['bibliotecas'].items():
             if 'estatisticas' in dados_bib:
                 est = dados_bib['estatisticas']
+                # Fases do resolvedor (modelo, resolução, extração); ausentes em JSONs antigos
+                fases = est.get('fases_media', {})
                 dados.append({
                     'Tamanho': tamanho,
                     'M': m,
@@ -39,7 +41,10 @@ def criar_dataframe_comparativo(resultados):
                     'Tempo_Max': est['tempo_max'],
                     'Memoria_MB': est['memoria_media'],
                     'Iteracoes': est.get('iteracoes_media', 0),
-                    'Taxa_Sucesso': est['taxa_sucesso']
+                    'Taxa_Sucesso': est['taxa_sucesso'],
+                    'Tempo_Modelo': fases.get('modelo', np.nan),
+                    'Tempo_Resolucao': fases.get('resolucao', np.nan),
+                    'Tempo_Extracao': fases.get('extracao', np.nan)
                 })
     
     return pd.DataFrame(dados)
@@ -203,6 +208,44 @@ def gerar_graficos_bibliotecas(df, output_dir='graficos_bibliotecas'):
     
     plt.close('all')
 
+def gerar_grafico_fases(df, output_dir='graficos_bibliotecas'):
+    """Barras empilhadas de montagem do modelo, resolução e extração por biblioteca, um painel por tamanho"""
+    colunas = ['Tempo_Modelo', 'Tempo_Resolucao', 'Tempo_Extracao']
+    rotulos = ['Montagem do modelo', 'Resolução (solver)', 'Extração do resultado']
+    df_fases = df.dropna(subset=colunas, how='all')
+    if df_fases.empty:
+        print("⚠ Sem tempos por fase no JSON (benchmark anterior à separação das fases)")
+        return
+    
+    Path(output_dir).mkdir(exist_ok=True)
+    tamanhos = df_fases['Tamanho'].unique()
+    num_colunas = min(3, len(tamanhos))
+    num_linhas = int(np.ceil(len(tamanhos) / num_colunas))
+    fig, axes = plt.subplots(num_linhas, num_colunas, figsize=(6 * num_colunas, 4.5 * num_linhas), squeeze=False)
+    cores = sns.color_palette("Set2", n_colors=len(colunas))
+    
+    for k, tamanho in enumerate(tamanhos):
+        ax = axes[k // num_colunas, k % num_colunas]
+        dados = df_fases[df_fases['Tamanho'] == tamanho].sort_values('Tempo_Medio')
+        esquerda = np.zeros(len(dados))
+        for coluna, rotulo, cor in zip(colunas, rotulos, cores):
+            valores = dados[coluna].fillna(0).values
+            ax.barh(dados['Biblioteca'], valores, left=esquerda, label=rotulo, color=cor)
+            esquerda += valores
+        ax.set_title(f'Problema {tamanho}')
+        ax.set_xlabel('Tempo médio (segundos)')
+        ax.grid(axis='x', alpha=0.3)
+    for k in range(len(tamanhos), num_linhas * num_colunas):
+        axes[k // num_colunas, k % num_colunas].axis('off')
+    
+    axes[0, 0].legend(loc='lower right')
+    plt.suptitle('Onde está o tempo de cada biblioteca: modelo × solver × extração',
+                 fontsize=14, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(f'{output_dir}/fases_bibliotecas.png', dpi=300, bbox_inches='tight')
+    print(f"✓ Gráfico salvo: {output_dir}/fases_bibliotecas.png")
+    plt.close('all')
+
 def gerar_relatorio_markdown(df, arquivo_saida='RELATORIO_BIBLIOTECAS.md'):
     """Gera relatório em Markdown"""
     with open(arquivo_saida, 'w', encoding='utf-8') as f:
@@ -396,6 +439,7 @@ if __name__ == "__main__":
     # Gerar gráficos
     print("\n🎨 Gerando gráficos...")
     gerar_graficos_bibliotecas(df)
+    gerar_grafico_fases(df)
     
     # Salvar CSV
     df.to_csv('comparacao_bibliotecas.csv', index=False)
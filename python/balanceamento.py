@@ -0,0 +1,104 @@
+"""
+Balanceamento automático do Problema de Transporte
+Quando oferta ≠ demanda, a diferença vai para um nó fictício: um destino
+fictício recebe a oferta que sobra ou uma origem fictícia cobre a demanda
+que falta, a um custo de penalidade por unidade (custo_ficticio).
+
+Os motores estruturados (Simplex de Rede, geração de colunas, decomposição)
+tratam o nó fictício implicitamente, com apenas m ou n arcos extras; as
+bibliotecas genéricas recebem o problema com a linha/coluna materializada.
+"""
+
+import numpy as np
+
+from rede_esparsa import RedeEsparsa
+
+CUSTO_FICTICIO = 0.0
+
+def excesso_oferta(oferta, demanda, tolerancia=1e-6):
+    """Oferta total - demanda total (0.0 se o problema já está balanceado)"""
+    excesso = float(np.sum(oferta) - np.sum(demanda))
+    return 0.0 if abs(excesso) <= tolerancia else excesso
+
+def penalidades(custo_ficticio, tamanho):
+    """custo_ficticio (escalar ou um valor por nó) como array de tamanho fixo"""
+    valores = np.asarray(custo_ficticio, dtype=np.float64)
+    if valores.ndim > 1 or (valores.ndim == 1 and len(valores) not in (1, tamanho)):
+        raise ValueError(f"custo_ficticio tem {valores.size} valores para {tamanho} nós fictícios")
+    return np.broadcast_to(valores, (tamanho,))
+
+# ========================================
+# NÓ FICTÍCIO IMPLÍCITO (motores de rede)
+# ========================================
+
+def arcos_ficticios(m, n, excesso, custo_ficticio=CUSTO_FICTICIO):
+    """Nó fictício na numeração do Simplex de Rede (origens 0..m-1, destinos m..m+n-1)
+
+    Retorna (suprimento, cauda, cabeca, custo): o suprimento do nó m + n e
+    os arcos que o ligam a todas as origens (excesso > 0) ou a todos os
+    destinos (excesso < 0).
+    """
+    ficticio = m + n
+    if excesso > 0:
+        cauda = np.arange(m, dtype=np.int64)
+        cabeca = np.full(m, ficticio, dtype=np.int64)
+        return -excesso, cauda, cabeca, penalidades(custo_ficticio, m).copy()
+    cauda = np.full(n, ficticio, dtype=np.int64)
+    cabeca = m + np.arange(n, dtype=np.int64)
+    return -excesso, cauda, cabeca, penalidades(custo_ficticio, n).copy()
+
+def folgas_do_fluxo(excesso, fluxo_ficticio):
+    """Nomeia o fluxo dos arcos fictícios: oferta não enviada ou demanda não atendida"""
+    if excesso > 0:
+        return {'nao_enviado': fluxo_ficticio}
+    return {'nao_atendido': fluxo_ficticio}
+
+# ========================================
+# NÓ FICTÍCIO MATERIALIZADO (bibliotecas)
+# ========================================
+
+def balancear_problema(oferta, demanda, custos, custo_ficticio=CUSTO_FICTICIO):
+    """Retorna (oferta, demanda, custos) balanceados com uma linha ou coluna fictícia
+
+    custos pode ser matriz m × n ou RedeEsparsa (ganha um nó e m ou n arcos).
+    Problemas já balanceados são devolvidos sem cópia.
+    """
+    excesso = excesso_oferta(oferta, demanda)
+    if excesso == 0.0:
+        return oferta, demanda, custos
+
+    oferta = np.asarray(oferta, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    m, n = len(oferta), len(demanda)
+
+    if excesso > 0:
+        demanda = np.append(demanda, excesso)
+    else:
+        oferta = np.append(oferta, -excesso)
+
+    if isinstance(custos, RedeEsparsa):
+        if excesso > 0:
+            origem = np.arange(m, dtype=np.int64)
+            destino = np.full(m, n, dtype=np.int64)
+            m_novo, n_novo = m, n + 1
+        else:
+            origem = np.full(n, m, dtype=np.int64)
+            destino = np.arange(n, dtype=np.int64)
+            m_novo, n_novo = m + 1, n
+        capacidade = custos.capacidade
+        if capacidade is not None:
+            capacidade = np.concatenate([capacidade, np.full(len(origem), np.inf)])
+        return oferta, demanda, RedeEsparsa(
+            m_novo, n_novo,
+            np.concatenate([custos.origem, origem]),
+            np.concatenate([custos.destino, destino]),
+            np.concatenate([custos.custo, penalidades(custo_ficticio, len(origem))]),
+            capacidade,
+        )
+
+    custos = np.asarray(custos, dtype=np.float64).reshape(m, n)
+    if excesso > 0:
+        custos = np.column_stack([custos, penalidades(custo_ficticio, m)])
+    else:
+        custos = np.vstack([custos, penalidades(custo_ficticio, n)])
+    return oferta, demanda, custos
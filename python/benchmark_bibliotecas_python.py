@@ -3,6 +3,7 @@ Benchmark de Bibliotecas Python para Problemas de Transporte
 Compara: Implementação Manual, SciPy, PuLP, CVXPY, OR-Tools
 """
 
+import sys
 import random
 import time
 import psutil
@@ -10,49 +11,112 @@ import os
 import json
 import statistics
 import gc
+import contextlib
 import numpy as np
 
+from tabela_vetorizada import construir_restricoes_transporte_csr, construir_tabela_transporte_rede
+from rede_esparsa import (
+    RedeEsparsa, gerar_rede_esparsa, gerar_rede_separavel, nos_sem_arcos, arcos_por_no,
+    arcos_do_problema, construir_restricoes_rede_csr,
+)
+from simplex_rede import resolver_transporte_rede
+from geracao_colunas import resolver_geracao_colunas
+from decomposicao import resolver_decomposto
+from balanceamento import balancear_problema, penalidades
+from certificado import verificar_solucao
+from gerador_instancias import gerar_instancia
+from formato_instancia import obter_instancia_cache
+from rastreamento import criar_rastreador, exportar_chrome, trecho, registrar_trecho
+from metricas import criar_registro, registrar_execucao, servir_metricas, pico_memoria
+from medicao_memoria import medir_memoria_isolada
+from medicao_robusta import executar_intercalado, estatisticas_tempo
+from execucao_limitada import executar_com_limites
+from execucao_paralela import mapear_paralelo, nucleo_atual
+from varredura import abrir_varredura, execucao_concluida, gravar_execucao, fechar_varredura
+
+# Rastreador da linha do tempo (rastreamento.criar_rastreador) da execução
+# corrente de executar_benchmark; None = sem rastreamento
+rastreador_ativo = None
+
+# Fases de cada resolvedor, devolvidas em extras['fases'] (segundos):
+# montagem do modelo, resolução pelo solver e extração do resultado
+FASES_RESOLVEDOR = ('modelo', 'resolucao', 'extracao')
+
+@contextlib.contextmanager
+def fase(fases, biblioteca, nome):
+    """Soma o tempo do bloco `with` em fases[nome] e o grava como trecho '<biblioteca>.<nome>'"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fim = time.perf_counter()
+        fases[nome] = fases.get(nome, 0.0) + fim - inicio
+        if rastreador_ativo is not None:
+            registrar_trecho(rastreador_ativo, f"{biblioteca}.{nome}", inicio, fim)
+
+def mover_compilacao_cvxpy(fases, prob):
+    """Passa a canonicalização do CVXPY, feita dentro de solve(), de 'resolucao' para 'modelo'
+
+    O custo de montar o modelo no CVXPY está quase todo na canonicalização;
+    prob.compilation_time (segundos) é o tempo dela na última chamada a solve().
+    """
+    compilacao = min(getattr(prob, 'compilation_time', None) or 0.0, fases.get('resolucao', 0.0))
+    fases['resolucao'] = fases.get('resolucao', 0.0) - compilacao
+    fases['modelo'] = fases.get('modelo', 0.0) + compilacao
+
 # ========================================
 # IMPORTAR BIBLIOTECAS (com tratamento de erro)
 # ========================================
 
 bibliotecas_disponiveis = {
     'manual': True,  # Nossa implementação sempre está disponível
+    'rede': True,    # Simplex de Rede (simplex_rede.py)
+    'colunas': True, # Geração de colunas sobre o Simplex de Rede (geracao_colunas.py)
+    'componentes': True,  # Simplex de Rede por componente conexa, em paralelo (decomposicao.py)
     'scipy': True,
     'pulp': True,
     'cvxpy': True,
     'ortools': True
 }
 
+# Só os flags são definidos no import: processos filhos (execucao_limitada,
+# execucao_paralela) reimportam este módulo e não devem repetir o relatório
 try:
     from scipy.optimize import linprog
-    bibliotecas_disponiveis['scipy'] = True
-    print("✓ SciPy disponível")
 except ImportError:
-    print("✗ SciPy não disponível (pip install scipy)")
+    bibliotecas_disponiveis['scipy'] = False
 
 try:
     import pulp
-    bibliotecas_disponiveis['pulp'] = True
-    print("✓ PuLP disponível")
 except ImportError:
-    print("✗ PuLP não disponível (pip install pulp)")
+    bibliotecas_disponiveis['pulp'] = False
 
 try:
     import cvxpy as cp
-    bibliotecas_disponiveis['cvxpy'] = True
-    print("✓ CVXPY disponível")
 except ImportError:
-    print("✗ CVXPY não disponível (pip install cvxpy)")
+    bibliotecas_disponiveis['cvxpy'] = False
 
 try:
     from ortools.linear_solver import pywraplp
-    bibliotecas_disponiveis['ortools'] = True
-    print("✓ OR-Tools disponível")
 except ImportError:
-    print("✗ OR-Tools não disponível (pip install ortools)")
+    bibliotecas_disponiveis['ortools'] = False
+
+# Nome exibido e pacote pip de cada biblioteca opcional
+BIBLIOTECAS_OPCIONAIS = {
+    'scipy': ('SciPy', 'scipy'),
+    'pulp': ('PuLP', 'pulp'),
+    'cvxpy': ('CVXPY', 'cvxpy'),
+    'ortools': ('OR-Tools', 'ortools'),
+}
 
-print()
+def relatar_bibliotecas():
+    """Imprime quais bibliotecas opcionais puderam ser importadas"""
+    for chave, (nome, pacote) in BIBLIOTECAS_OPCIONAIS.items():
+        if bibliotecas_disponiveis[chave]:
+            print(f"✓ {nome} disponível")
+        else:
+            print(f"✗ {nome} não disponível (pip install {pacote})")
+    print()
 
 # ========================================
 # GERADOR DE PROBLEMAS
@@ -139,11 +203,17 @@ def simplex_manual(tabela, max_iteracoes=1000000):
     
     return iteracao, None
 
-def construir_tabela_transporte(oferta, demanda, custos):
+def construir_tabela_transporte(oferta, demanda, custos, custo_ficticio=0.0):
     m = len(oferta)
     n = len(demanda)
     num_vars = m * n
     
+    # Desbalanceado: uma coluna fictícia por origem (sobra) ou por destino (falta)
+    excesso = sum(oferta) - sum(demanda)
+    num_ficticias = 0
+    if abs(excesso) > 1e-6:
+        num_ficticias = m if excesso > 0 else n
+    
     tabela = []
     
     # Restrições de oferta
@@ -152,11 +222,15 @@ def construir_tabela_transporte(oferta, demanda, custos):
         for j in range(n):
             linha[i * n + j] = 1.0
         
+        ficticias = [0.0] * num_ficticias
+        if num_ficticias and excesso > 0:
+            ficticias[i] = 1.0
+        
         folgas_oferta = [0.0] * m
         folgas_oferta[i] = 1.0
         folgas_demanda = [0.0] * n
         
-        linha += folgas_oferta + folgas_demanda
+        linha += ficticias + folgas_oferta + folgas_demanda
         linha.append(float(oferta[i]))
         tabela.append(linha)
     
@@ -170,7 +244,11 @@ def construir_tabela_transporte(oferta, demanda, custos):
         folgas_demanda = [0.0] * n
         folgas_demanda[j] = 1.0
         
-        linha += folgas_oferta + folgas_demanda
+        ficticias = [0.0] * num_ficticias
+        if num_ficticias and excesso < 0:
+            ficticias[j] = 1.0
+        
+        linha += ficticias + folgas_oferta + folgas_demanda
         linha.append(float(demanda[j]))
         tabela.append(linha)
     
@@ -180,6 +258,10 @@ def construir_tabela_transporte(oferta, demanda, custos):
         for j in range(n):
             linha_obj.append(-float(custos[i][j]))
     
+    # Penalidade por unidade nas variáveis fictícias: escalar ou um valor por variável
+    if num_ficticias:
+        linha_obj += (-penalidades(custo_ficticio, num_ficticias)).tolist()
+    
     linha_obj += [0.0] * (m + n)
     linha_obj.append(0.0)
     tabela.append(linha_obj)
@@ -187,54 +269,78 @@ def construir_tabela_transporte(oferta, demanda, custos):
     return tabela
 
 def resolver_manual(oferta, demanda, custos):
-    """Resolve usando implementação manual do Simplex"""
-    tabela = construir_tabela_transporte(oferta, demanda, custos)
-    iteracoes, custo = simplex_manual(tabela)
-    return custo, iteracoes
+    """Resolve usando implementação manual do Simplex (o custo sai do simplex: extração vazia)"""
+    fases = {}
+    if isinstance(custos, RedeEsparsa):
+        # Capacidades exigiriam uma linha extra por rota na tabela
+        if custos.capacidade is not None:
+            print("N/A (capacidades)", end=" ")
+            return None, -1
+        with fase(fases, 'manual', 'modelo'):
+            tabela = construir_tabela_transporte_rede(oferta, demanda, custos)
+            if tabela is not None:
+                tabela = tabela.tolist()
+        if tabela is None:
+            return None, -1
+    else:
+        with fase(fases, 'manual', 'modelo'):
+            tabela = construir_tabela_transporte(oferta, demanda, custos)
+    with fase(fases, 'manual', 'resolucao'):
+        iteracoes, custo = simplex_manual(tabela)
+    return custo, iteracoes, {'fases': fases}
 
 # ========================================
 # SCIPY
 # ========================================
 
+def solucao_original(retorno, m, n, m_balanceado, num_vars, denso):
+    """Leva (x, duais) do problema balanceado de volta às rotas e nós originais"""
+    if len(retorno) < 3 or 'solucao' not in retorno[2]:
+        return retorno
+    x, duais = retorno[2]['solucao']
+    if denso:
+        x = x.reshape(m_balanceado, -1)[:m, :n].ravel()
+    else:
+        x = x[:num_vars]
+    extras = dict(retorno[2], solucao=(x, duais[:m], duais[m_balanceado:m_balanceado + n]))
+    return retorno[0], retorno[1], extras
+
 def resolver_scipy(oferta, demanda, custos):
     """Resolve usando scipy.optimize.linprog"""
+    m_original, n_original = len(oferta), len(demanda)
+    denso = not isinstance(custos, RedeEsparsa)
+    num_vars = m_original * n_original if denso else custos.num_arcos
+    fases = {}
+    with fase(fases, 'scipy', 'modelo'):
+        oferta, demanda, custos = balancear_problema(oferta, demanda, custos)
+    if not denso:
+        retorno = resolver_scipy_esparso(oferta, demanda, custos, fases)
+        with fase(fases, 'scipy', 'extracao'):
+            return solucao_original(retorno, m_original, n_original, len(oferta), num_vars, denso)
+    
     m = len(oferta)
     n = len(demanda)
     
-    # Vetor de custos (função objetivo)
-    c = np.array([custos[i][j] for i in range(m) for j in range(n)])
-    
-    # Restrições de igualdade: A_eq * x = b_eq
-    A_eq = []
-    b_eq = []
-    
-    # Restrições de oferta
-    for i in range(m):
-        linha = [0] * (m * n)
-        for j in range(n):
-            linha[i * n + j] = 1
-        A_eq.append(linha)
-        b_eq.append(oferta[i])
-    
-    # Restrições de demanda
-    for j in range(n):
-        linha = [0] * (m * n)
-        for i in range(m):
-            linha[i * n + j] = 1
-        A_eq.append(linha)
-        b_eq.append(demanda[j])
-    
-    A_eq = np.array(A_eq)
-    b_eq = np.array(b_eq)
-    
-    # Limites das variáveis (não-negatividade)
-    bounds = [(0, None) for _ in range(m * n)]
+    with fase(fases, 'scipy', 'modelo'):
+        # Vetor de custos (função objetivo)
+        c = np.array([custos[i][j] for i in range(m) for j in range(n)])
+        
+        # Restrições de igualdade: A_eq * x = b_eq (CSR montada por aritmética de índices)
+        A_eq = construir_restricoes_transporte_csr(m, n)
+        b_eq = np.concatenate([oferta, demanda])
+        
+        # Limites das variáveis (não-negatividade)
+        bounds = [(0, None) for _ in range(m * n)]
     
     # Resolver
-    resultado = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
+    with fase(fases, 'scipy', 'resolucao'):
+        resultado = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
     
     if resultado.success:
-        return resultado.fun, resultado.nit if hasattr(resultado, 'nit') else 0
+        with fase(fases, 'scipy', 'extracao'):
+            retorno = (resultado.fun, resultado.nit if hasattr(resultado, 'nit') else 0,
+                       {'solucao': (resultado.x, resultado.eqlin.marginals), 'fases': fases})
+            return solucao_original(retorno, m_original, n_original, m, num_vars, denso)
     else:
         return None, -1
 
@@ -244,34 +350,44 @@ def resolver_scipy(oferta, demanda, custos):
 
 def resolver_pulp(oferta, demanda, custos):
     """Resolve usando PuLP"""
+    fases = {}
+    with fase(fases, 'pulp', 'modelo'):
+        oferta, demanda, custos = balancear_problema(oferta, demanda, custos)
+    if isinstance(custos, RedeEsparsa):
+        return resolver_pulp_esparso(oferta, demanda, custos, fases)
+    
     m = len(oferta)
     n = len(demanda)
     
-    # Criar problema
-    prob = pulp.LpProblem("Transporte", pulp.LpMinimize)
-    
-    # Variáveis de decisão
-    x = {}
-    for i in range(m):
+    with fase(fases, 'pulp', 'modelo'):
+        # Criar problema
+        prob = pulp.LpProblem("Transporte", pulp.LpMinimize)
+        
+        # Variáveis de decisão
+        x = {}
+        for i in range(m):
+            for j in range(n):
+                x[i, j] = pulp.LpVariable(f"x_{i}_{j}", lowBound=0)
+        
+        # Função objetivo
+        prob += pulp.lpSum(custos[i][j] * x[i, j] for i in range(m) for j in range(n))
+        
+        # Restrições de oferta
+        for i in range(m):
+            prob += pulp.lpSum(x[i, j] for j in range(n)) == oferta[i]
+        
+        # Restrições de demanda
         for j in range(n):
-            x[i, j] = pulp.LpVariable(f"x_{i}_{j}", lowBound=0)
-    
-    # Função objetivo
-    prob += pulp.lpSum(custos[i][j] * x[i, j] for i in range(m) for j in range(n))
-    
-    # Restrições de oferta
-    for i in range(m):
-        prob += pulp.lpSum(x[i, j] for j in range(n)) == oferta[i]
-    
-    # Restrições de demanda
-    for j in range(n):
-        prob += pulp.lpSum(x[i, j] for i in range(m)) == demanda[j]
+            prob += pulp.lpSum(x[i, j] for i in range(m)) == demanda[j]
     
     # Resolver (silencioso)
-    prob.solve(pulp.PULP_CBC_CMD(msg=0))
+    with fase(fases, 'pulp', 'resolucao'):
+        prob.solve(pulp.PULP_CBC_CMD(msg=0))
     
     if prob.status == pulp.LpStatusOptimal:
-        return pulp.value(prob.objective), 0  # PuLP não retorna iterações facilmente
+        with fase(fases, 'pulp', 'extracao'):
+            custo = pulp.value(prob.objective)
+        return custo, 0, {'fases': fases}  # PuLP não retorna iterações facilmente
     else:
         return None, -1
 
@@ -281,35 +397,46 @@ def resolver_pulp(oferta, demanda, custos):
 
 def resolver_cvxpy(oferta, demanda, custos):
     """Resolve usando CVXPY"""
+    fases = {}
+    with fase(fases, 'cvxpy', 'modelo'):
+        oferta, demanda, custos = balancear_problema(oferta, demanda, custos)
+    if isinstance(custos, RedeEsparsa):
+        return resolver_cvxpy_esparso(oferta, demanda, custos, fases)
+    
     m = len(oferta)
     n = len(demanda)
     
-    # Variáveis de decisão
-    x = cp.Variable((m, n), nonneg=True)
-    
-    # Matriz de custos
-    C = np.array(custos)
-    
-    # Função objetivo
-    objective = cp.Minimize(cp.sum(cp.multiply(C, x)))
-    
-    # Restrições
-    constraints = []
-    
-    # Restrições de oferta
-    for i in range(m):
-        constraints.append(cp.sum(x[i, :]) == oferta[i])
-    
-    # Restrições de demanda
-    for j in range(n):
-        constraints.append(cp.sum(x[:, j]) == demanda[j])
+    with fase(fases, 'cvxpy', 'modelo'):
+        # Variáveis de decisão
+        x = cp.Variable((m, n), nonneg=True)
+        
+        # Matriz de custos
+        C = np.array(custos)
+        
+        # Função objetivo
+        objective = cp.Minimize(cp.sum(cp.multiply(C, x)))
+        
+        # Restrições
+        constraints = []
+        
+        # Restrições de oferta
+        for i in range(m):
+            constraints.append(cp.sum(x[i, :]) == oferta[i])
+        
+        # Restrições de demanda
+        for j in range(n):
+            constraints.append(cp.sum(x[:, j]) == demanda[j])
+        
+        prob = cp.Problem(objective, constraints)
     
-    # Resolver
-    prob = cp.Problem(objective, constraints)
-    prob.solve(solver=cp.ECOS, verbose=False)
+    with fase(fases, 'cvxpy', 'resolucao'):
+        prob.solve(solver=cp.ECOS, verbose=False)
+    mover_compilacao_cvxpy(fases, prob)
     
     if prob.status == cp.OPTIMAL:
-        return prob.value, 0
+        with fase(fases, 'cvxpy', 'extracao'):
+            custo = prob.value
+        return custo, 0, {'fases': fases}
     else:
         return None, -1
 
@@ -319,44 +446,268 @@ def resolver_cvxpy(oferta, demanda, custos):
 
 def resolver_ortools(oferta, demanda, custos):
     """Resolve usando Google OR-Tools"""
+    fases = {}
+    with fase(fases, 'ortools', 'modelo'):
+        oferta, demanda, custos = balancear_problema(oferta, demanda, custos)
+    if isinstance(custos, RedeEsparsa):
+        return resolver_ortools_esparso(oferta, demanda, custos, fases)
+    
     m = len(oferta)
     n = len(demanda)
     
     # Criar solver
-    solver = pywraplp.Solver.CreateSolver('GLOP')
+    with fase(fases, 'ortools', 'modelo'):
+        solver = pywraplp.Solver.CreateSolver('GLOP')
     if not solver:
         return None, -1
     
-    # Variáveis de decisão
-    x = {}
-    for i in range(m):
+    with fase(fases, 'ortools', 'modelo'):
+        # Variáveis de decisão
+        x = {}
+        for i in range(m):
+            for j in range(n):
+                x[i, j] = solver.NumVar(0, solver.infinity(), f'x_{i}_{j}')
+        
+        # Função objetivo
+        objective = solver.Objective()
+        for i in range(m):
+            for j in range(n):
+                objective.SetCoefficient(x[i, j], custos[i][j])
+        objective.SetMinimization()
+        
+        # Restrições de oferta
+        for i in range(m):
+            constraint = solver.Constraint(oferta[i], oferta[i])
+            for j in range(n):
+                constraint.SetCoefficient(x[i, j], 1)
+        
+        # Restrições de demanda
         for j in range(n):
-            x[i, j] = solver.NumVar(0, solver.infinity(), f'x_{i}_{j}')
+            constraint = solver.Constraint(demanda[j], demanda[j])
+            for i in range(m):
+                constraint.SetCoefficient(x[i, j], 1)
     
-    # Função objetivo
-    objective = solver.Objective()
-    for i in range(m):
-        for j in range(n):
-            objective.SetCoefficient(x[i, j], custos[i][j])
-    objective.SetMinimization()
+    # Resolver
+    with fase(fases, 'ortools', 'resolucao'):
+        status = solver.Solve()
     
-    # Restrições de oferta
-    for i in range(m):
-        constraint = solver.Constraint(oferta[i], oferta[i])
-        for j in range(n):
-            constraint.SetCoefficient(x[i, j], 1)
+    if status == pywraplp.Solver.OPTIMAL:
+        with fase(fases, 'ortools', 'extracao'):
+            custo, iteracoes = solver.Objective().Value(), solver.iterations()
+        return custo, iteracoes, {'fases': fases}
+    else:
+        return None, -1
+
+# ========================================
+# SIMPLEX DE REDE
+# ========================================
+
+def solucao_rede(resultado, oferta, demanda):
+    """(valores, u, v) a partir dos potenciais do Simplex de Rede"""
+    m, n = len(oferta), len(demanda)
+    potenciais = resultado['potenciais']
+    return resultado['valores'], -potenciais[:m], potenciais[m:m + n]
+
+def resolver_rede(oferta, demanda, custos):
+    """Resolve usando o Simplex de Rede (matriz densa ou RedeEsparsa)
+
+    A matriz densa vira a rede completa (arcos na ordem i*n + j) na fase de
+    modelo; resolver_transporte_rede recebe a rede já montada.
+    """
+    fases = {}
+    with fase(fases, 'rede', 'modelo'):
+        rede = arcos_do_problema(oferta, demanda, custos)
+    with fase(fases, 'rede', 'resolucao'):
+        resultado = resolver_transporte_rede(oferta, demanda, rede)
     
-    # Restrições de demanda
-    for j in range(n):
-        constraint = solver.Constraint(demanda[j], demanda[j])
-        for i in range(m):
-            constraint.SetCoefficient(x[i, j], 1)
+    if resultado is not None and resultado['status'] == 'otimo':
+        with fase(fases, 'rede', 'extracao'):
+            solucao = solucao_rede(resultado, oferta, demanda)
+        return resultado['custo_total'], resultado['iteracoes'], {'solucao': solucao, 'fases': fases}
+    else:
+        return None, -1
+
+def resolver_colunas(oferta, demanda, custos):
+    """Resolve por geração de colunas (começa com as 5 rotas mais baratas de cada origem)
+
+    Retorna também a fração de rotas que chegou a ser ativada.
+    """
+    # Numa rede esparsa o conjunto de rotas já é explícito: não há o que gerar
+    if isinstance(custos, RedeEsparsa):
+        return resolver_rede(oferta, demanda, custos)
+
+    m, n = len(oferta), len(demanda)
+    fases = {}
+    with fase(fases, 'colunas', 'modelo'):
+        matriz = np.asarray(custos).reshape(m, n)
+    with fase(fases, 'colunas', 'resolucao'):
+        resultado = resolver_geracao_colunas(oferta, demanda, matriz)
     
-    # Resolver
-    status = solver.Solve()
+    if resultado is not None and resultado['status'] == 'otimo':
+        with fase(fases, 'colunas', 'extracao'):
+            resultado['valores'] = np.zeros(m * n)
+            resultado['valores'][resultado['origem'] * n + resultado['destino']] = resultado['fluxo']
+            solucao = solucao_rede(resultado, oferta, demanda)
+        extras = {
+            'rodadas': resultado['rodadas'],
+            'arcos_ativos': resultado['arcos_ativos'],
+            'fracao_ativa': resultado['fracao_ativa'],
+            'solucao': solucao,
+            'fases': fases,
+        }
+        return resultado['custo_total'], resultado['iteracoes'], extras
+    else:
+        return None, -1
+
+def resolver_componentes(oferta, demanda, custos):
+    """Resolve cada componente conexa separadamente (pool de processos)"""
+    fases = {}
+    with fase(fases, 'componentes', 'modelo'):
+        rede = arcos_do_problema(oferta, demanda, custos)
+    with fase(fases, 'componentes', 'resolucao'):
+        resultado = resolver_decomposto(oferta, demanda, rede)
+    
+    if resultado is not None and resultado['status'] == 'otimo':
+        with fase(fases, 'componentes', 'extracao'):
+            solucao = solucao_rede(resultado, oferta, demanda)
+        return resultado['custo_total'], resultado['iteracoes'], {
+            'componentes': resultado['componentes'],
+            'solucao': solucao,
+            'fases': fases,
+        }
+    else:
+        return None, -1
+
+# ========================================
+# REDES ESPARSAS (apenas rotas permitidas viram variáveis)
+# ========================================
+
+def rede_viavel(oferta, demanda, rede):
+    """Detecta origens/destinos sem nenhum arco (problema inviável)"""
+    origens, destinos = nos_sem_arcos(rede, oferta, demanda)
+    if len(origens) or len(destinos):
+        print(f"INVIÁVEL: {len(origens)} origens e {len(destinos)} destinos sem arcos", end=" ")
+        return False
+    return True
+
+def limites_superiores(rede):
+    """Capacidade de cada arco como lista (None = sem limite)"""
+    if rede.capacidade is None:
+        return [None] * rede.num_arcos
+    return [None if np.isinf(u) else u for u in rede.capacidade.tolist()]
+
+def resolver_scipy_esparso(oferta, demanda, rede, fases):
+    """linprog com uma coluna por arco"""
+    if not rede_viavel(oferta, demanda, rede):
+        return None, -1
+    
+    with fase(fases, 'scipy', 'modelo'):
+        A_eq = construir_restricoes_rede_csr(rede)
+        b_eq = np.concatenate([oferta, demanda])
+        if rede.capacidade is None:
+            bounds = (0, None)
+        else:
+            bounds = np.column_stack([np.zeros(rede.num_arcos), rede.capacidade])
+    with fase(fases, 'scipy', 'resolucao'):
+        resultado = linprog(rede.custo, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
+    
+    if resultado.success:
+        return (resultado.fun, resultado.nit if hasattr(resultado, 'nit') else 0,
+                {'solucao': (resultado.x, resultado.eqlin.marginals), 'fases': fases})
+    else:
+        return None, -1
+
+def resolver_pulp_esparso(oferta, demanda, rede, fases):
+    """PuLP com uma variável por arco"""
+    if not rede_viavel(oferta, demanda, rede):
+        return None, -1
+    
+    with fase(fases, 'pulp', 'modelo'):
+        por_origem, por_destino = arcos_por_no(rede)
+        prob = pulp.LpProblem("Transporte", pulp.LpMinimize)
+        
+        x = [pulp.LpVariable(f"x_{i}_{j}", lowBound=0, upBound=u)
+             for i, j, u in zip(rede.origem.tolist(), rede.destino.tolist(), limites_superiores(rede))]
+        prob += pulp.lpSum(c * xk for c, xk in zip(rede.custo.tolist(), x))
+        
+        for i, arcos in enumerate(por_origem):
+            prob += pulp.lpSum(x[k] for k in arcos) == oferta[i]
+        for j, arcos in enumerate(por_destino):
+            prob += pulp.lpSum(x[k] for k in arcos) == demanda[j]
+    
+    with fase(fases, 'pulp', 'resolucao'):
+        prob.solve(pulp.PULP_CBC_CMD(msg=0))
+    
+    if prob.status == pulp.LpStatusOptimal:
+        with fase(fases, 'pulp', 'extracao'):
+            custo = pulp.value(prob.objective)
+        return custo, 0, {'fases': fases}
+    else:
+        return None, -1
+
+def resolver_cvxpy_esparso(oferta, demanda, rede, fases):
+    """CVXPY com vetor de fluxos por arco e restrições em matriz esparsa"""
+    if not rede_viavel(oferta, demanda, rede):
+        return None, -1
+    
+    with fase(fases, 'cvxpy', 'modelo'):
+        A = construir_restricoes_rede_csr(rede)
+        x = cp.Variable(rede.num_arcos, nonneg=True)
+        
+        objective = cp.Minimize(rede.custo @ x)
+        constraints = [A @ x == np.concatenate([oferta, demanda])]
+        if rede.capacidade is not None:
+            finitas = np.flatnonzero(np.isfinite(rede.capacidade))
+            constraints.append(x[finitas] <= rede.capacidade[finitas])
+        
+        prob = cp.Problem(objective, constraints)
+    with fase(fases, 'cvxpy', 'resolucao'):
+        prob.solve(solver=cp.ECOS, verbose=False)
+    mover_compilacao_cvxpy(fases, prob)
+    
+    if prob.status == cp.OPTIMAL:
+        with fase(fases, 'cvxpy', 'extracao'):
+            custo = prob.value
+        return custo, 0, {'fases': fases}
+    else:
+        return None, -1
+
+def resolver_ortools_esparso(oferta, demanda, rede, fases):
+    """OR-Tools (GLOP) com uma variável por arco"""
+    if not rede_viavel(oferta, demanda, rede):
+        return None, -1
+    
+    with fase(fases, 'ortools', 'modelo'):
+        solver = pywraplp.Solver.CreateSolver('GLOP')
+    if not solver:
+        return None, -1
+    
+    with fase(fases, 'ortools', 'modelo'):
+        por_origem, por_destino = arcos_por_no(rede)
+        x = [solver.NumVar(0, solver.infinity() if u is None else u, f'x_{i}_{j}')
+             for i, j, u in zip(rede.origem.tolist(), rede.destino.tolist(), limites_superiores(rede))]
+        
+        objective = solver.Objective()
+        for c, xk in zip(rede.custo.tolist(), x):
+            objective.SetCoefficient(xk, c)
+        objective.SetMinimization()
+        
+        for i, arcos in enumerate(por_origem):
+            constraint = solver.Constraint(float(oferta[i]), float(oferta[i]))
+            for k in arcos:
+                constraint.SetCoefficient(x[k], 1)
+        for j, arcos in enumerate(por_destino):
+            constraint = solver.Constraint(float(demanda[j]), float(demanda[j]))
+            for k in arcos:
+                constraint.SetCoefficient(x[k], 1)
+    
+    with fase(fases, 'ortools', 'resolucao'):
+        status = solver.Solve()
     
     if status == pywraplp.Solver.OPTIMAL:
-        return solver.Objective().Value(), solver.iterations()
+        with fase(fases, 'ortools', 'extracao'):
+            custo, iteracoes = solver.Objective().Value(), solver.iterations()
+        return custo, iteracoes, {'fases': fases}
     else:
         return None, -1
 
@@ -364,8 +715,140 @@ def resolver_ortools(oferta, demanda, custos):
 # BENCHMARK
 # ========================================
 
-def executar_benchmark(m, n, num_repeticoes=10):
-    """Executa benchmark comparando todas as bibliotecas"""
+def obter_problema(m, n, semente=42, familia=None, usar_cache=False, densidade=None, blocos=None,
+                   capacidade=None):
+    """Gera a instância: gerador original (familia=None) ou família vetorizada
+
+    Com usar_cache=True a instância é lida do cache binário em disco
+    (gerada e gravada apenas na primeira vez); a do gerador original volta
+    como listas, como sai do gerador, para os construtores de tabela
+    baseados em listas medirem o mesmo que sem cache. Com densidade, gera uma
+    rede esparsa (RedeEsparsa) com essa fração das m·n rotas; com blocos,
+    a rede é separável em blocos independentes (componentes conexas).
+    Com capacidade, as rotas da rede esparsa recebem limites superiores
+    com essa média.
+    """
+    if blocos is not None:
+        return gerar_rede_separavel(m, n, blocos, densidade or 0.05, total=100000, semente=semente,
+                                    capacidade_media=capacidade)
+    if densidade is not None:
+        return gerar_rede_esparsa(m, n, densidade, total=100000, semente=semente,
+                                  capacidade_media=capacidade)
+    
+    if familia is None:
+        gerador, parametros = gerar_problema_transporte, {'m': m, 'n': n, 'total': 100000, 'semente': semente}
+    else:
+        gerador, parametros = gerar_instancia, {'m': m, 'n': n, 'familia': familia, 'total': 100000, 'semente': semente}
+    
+    if usar_cache:
+        oferta, demanda, custos = obter_instancia_cache(gerador, **parametros)
+        if familia is None:
+            return oferta.tolist(), demanda.tolist(), custos.tolist()
+        return oferta, demanda, custos
+    return gerador(**parametros)
+
+# Bibliotecas a testar: nome → (descrição, resolvedor)
+BIBLIOTECAS = {
+    'manual': ('Implementação Manual', resolver_manual),
+    'rede': ('Simplex de Rede', resolver_rede),
+    'colunas': ('Geração de Colunas', resolver_colunas),
+    'componentes': ('Componentes Conexas', resolver_componentes),
+    'scipy': ('SciPy (linprog)', resolver_scipy),
+    'pulp': ('PuLP', resolver_pulp),
+    'cvxpy': ('CVXPY', resolver_cvxpy),
+    'ortools': ('OR-Tools', resolver_ortools)
+}
+
+def resolver_instancia(funcao_resolver, m, n, semente, parametros, fator_demanda=1.0):
+    """Gera a instância e a resolve; retorna (custo, iteracoes)
+
+    É o que roda no processo isolado da medição de memória.
+    """
+    oferta, demanda, custos = obter_problema(m, n, semente=semente, **parametros)
+    if fator_demanda != 1.0:
+        demanda = np.rint(np.asarray(demanda) * fator_demanda)
+    return funcao_resolver(oferta, demanda, custos)[:2]
+
+def resumir_biblioteca(dados, num_repeticoes):
+    """Calcula e imprime as estatísticas das execuções de uma biblioteca (gravadas em dados)"""
+    execucoes_sucesso = [e for e in dados['execucoes'] if e['sucesso']]
+    status = [e.get('status') for e in dados['execucoes']]
+    dados['interrupcoes'] = {
+        'tempo_esgotado': status.count('tempo_esgotado'),
+        'memoria_esgotada': status.count('memoria_esgotada'),
+        'pulada': status.count('pulada'),
+    }
+    
+    if execucoes_sucesso:
+        tempos = [e['tempo_total'] for e in execucoes_sucesso]
+        memorias = [e['memoria_mb'] for e in execucoes_sucesso]
+        iteracoes_list = [e['iteracoes'] for e in execucoes_sucesso]
+        
+        dados['estatisticas'] = {
+            'tempo_medio': statistics.mean(tempos),
+            'tempo_mediano': statistics.median(tempos),
+            'tempo_desvio': statistics.stdev(tempos) if len(tempos) > 1 else 0,
+            'tempo_min': min(tempos),
+            'tempo_max': max(tempos),
+            'memoria_media': statistics.mean(memorias),
+            'iteracoes_media': statistics.mean(iteracoes_list) if iteracoes_list else 0,
+            'taxa_sucesso': len(execucoes_sucesso) / num_repeticoes * 100,
+            'certificados_verificados': sum(e['certificado'] is not None for e in execucoes_sucesso),
+            'certificados_validos': sum(bool(e['certificado'] and e['certificado']['valido'])
+                                        for e in execucoes_sucesso)
+        }
+        com_fases = [e['fases'] for e in execucoes_sucesso if e.get('fases')]
+        if com_fases:
+            dados['estatisticas']['fases_media'] = {
+                nome: statistics.mean(f.get(nome, 0.0) for f in com_fases) for nome in FASES_RESOLVEDOR}
+        isoladas = [e['memoria_isolada'] for e in execucoes_sucesso if e['memoria_isolada']]
+        if isoladas:
+            dados['estatisticas'].update({
+                'pico_rss_medio': statistics.mean(e['pico_rss_mb'] for e in isoladas),
+                'incremento_rss_medio': statistics.mean(e['incremento_rss_mb'] for e in isoladas),
+                'incremento_rss_max': max(e['incremento_rss_mb'] for e in isoladas),
+                'pico_heap_medio': statistics.mean(e['pico_heap_mb'] for e in isoladas),
+                'pico_heap_max': max(e['pico_heap_mb'] for e in isoladas),
+            })
+        
+        print(f"\nEstatísticas {dados['nome']}:")
+        print(f"  Tempo médio: {dados['estatisticas']['tempo_medio']:.4f}s")
+        if 'fases_media' in dados['estatisticas']:
+            print("    por fase: " + ", ".join(f"{nome} {dados['estatisticas']['fases_media'][nome]:.4f}s"
+                                             for nome in FASES_RESOLVEDOR))
+        print(f"  Memória média: {dados['estatisticas']['memoria_media']:.2f} MB")
+        print(f"  Taxa de sucesso: {dados['estatisticas']['taxa_sucesso']:.0f}%")
+        estatisticas = dados['estatisticas']
+        if 'pico_rss_medio' in estatisticas:
+            print(f"  Pico RSS (processo isolado): {estatisticas['pico_rss_medio']:.2f} MB "
+                  f"(+{estatisticas['incremento_rss_medio']:.2f} MB sobre o interpretador)")
+            print(f"  Pico heap Python (tracemalloc): {estatisticas['pico_heap_medio']:.2f} MB")
+        if estatisticas['certificados_verificados']:
+            print(f"  Certificados válidos: {estatisticas['certificados_validos']}/{estatisticas['certificados_verificados']}")
+
+def executar_benchmark(m, n, num_repeticoes=10, familia=None, usar_cache=False, densidade=None, blocos=None,
+                       capacidade=None, fator_demanda=1.0, rastreador=None, metricas=None,
+                       isolar_memoria=False, varredura=None, tempo_limite=None, limite_memoria_mb=None):
+    """Executa benchmark comparando todas as bibliotecas
+
+    Com rastreador (rastreamento.criar_rastreador), cada execução vira um
+    trecho '<biblioteca>' da linha do tempo, com a montagem do modelo e a
+    resolução ('<biblioteca>.modelo', '<biblioteca>.resolucao') dentro dele.
+    Com metricas (metricas.criar_registro), cada execução alimenta os
+    histogramas do Prometheus, rotulados por biblioteca e tamanho.
+    Com isolar_memoria, cada execução bem-sucedida é repetida num processo
+    isolado (medicao_memoria) para medir o pico de RSS e o pico do heap
+    Python, gravados em 'memoria_isolada'.
+    Com varredura (varredura.abrir_varredura), cada execução é gravada no
+    JSONL assim que termina, e as já gravadas são reaproveitadas sem rodar.
+    Com tempo_limite (segundos) ou limite_memoria_mb, cada execução roda num
+    processo de trabalho (execucao_limitada), com tempo e memória medidos
+    nele; estouros são gravados com status 'tempo_esgotado' ou
+    'memoria_esgotada' e as repetições seguintes da biblioteca nesse
+    tamanho são puladas (status 'pulada', não gravadas na varredura).
+    """
+    global rastreador_ativo
+    rastreador_ativo = rastreador
     print(f"\n{'='*80}")
     print(f"BENCHMARK: {m}×{n} - {num_repeticoes} repetições")
     print(f"{'='*80}")
@@ -375,19 +858,15 @@ def executar_benchmark(m, n, num_repeticoes=10):
         'm': m,
         'n': n,
         'num_repeticoes': num_repeticoes,
+        'familia': familia or 'original',
+        'densidade': densidade,
+        'blocos': blocos,
+        'capacidade': capacidade,
+        'fator_demanda': fator_demanda,
         'bibliotecas': {}
     }
     
-    # Lista de bibliotecas a testar
-    bibliotecas = {
-        'manual': ('Implementação Manual', resolver_manual),
-        'scipy': ('SciPy (linprog)', resolver_scipy),
-        'pulp': ('PuLP', resolver_pulp),
-        'cvxpy': ('CVXPY', resolver_cvxpy),
-        'ortools': ('OR-Tools', resolver_ortools)
-    }
-    
-    for nome_bib, (descricao, funcao_resolver) in bibliotecas.items():
+    for nome_bib, (descricao, funcao_resolver) in BIBLIOTECAS.items():
         if not bibliotecas_disponiveis[nome_bib]:
             continue
         
@@ -396,10 +875,32 @@ def executar_benchmark(m, n, num_repeticoes=10):
             'nome': descricao,
             'execucoes': []
         }
+        interrompida = None
         
         for i in range(num_repeticoes):
             print(f"Execução {i+1}/{num_repeticoes}...", end=" ")
             
+            anterior = execucao_concluida(varredura, resultados['tamanho'], 42 + i, nome_bib)
+            if anterior is not None:
+                resultados['bibliotecas'][nome_bib]['execucoes'].append(anterior)
+                print("já concluída")
+                if anterior.get('status') in ('tempo_esgotado', 'memoria_esgotada'):
+                    interrompida = anterior['status']
+                continue
+            
+            if interrompida is not None:
+                resultados['bibliotecas'][nome_bib]['execucoes'].append({
+                    'execucao': i + 1,
+                    'tempo_total': 0,
+                    'memoria_mb': 0,
+                    'iteracoes': 0,
+                    'custo_total': 0,
+                    'sucesso': False,
+                    'status': 'pulada'
+                })
+                print(f"pulada ({interrompida} numa execução anterior)")
+                continue
+            
             # Coleta de lixo
             gc.collect()
             
@@ -412,12 +913,26 @@ def executar_benchmark(m, n, num_repeticoes=10):
                 mem_antes = processo.memory_info().rss / (1024 * 1024)
             
             # Gerar problema
-            oferta, demanda, custos = gerar_problema_transporte(m, n, semente=42+i)
+            oferta, demanda, custos = obter_problema(m, n, semente=42+i, familia=familia, usar_cache=usar_cache,
+                                                     densidade=densidade, blocos=blocos, capacidade=capacidade)
+            if fator_demanda != 1.0:
+                # Instância desbalanceada: os resolvedores completam com o nó fictício
+                demanda = np.rint(np.asarray(demanda) * fator_demanda)
             
             # Resolver
+            tempo_inicio = time.time()
             try:
-                tempo_inicio = time.time()
-                custo, iteracoes = funcao_resolver(oferta, demanda, custos)
+                if tempo_limite is not None or limite_memoria_mb is not None:
+                    # Processo de trabalho: tempo e memória vêm do filho
+                    retorno, medidas = executar_com_limites(funcao_resolver, (oferta, demanda, custos),
+                                                            tempo_limite, limite_memoria_mb)
+                else:
+                    medidas = None
+                    with trecho(rastreador, nome_bib):
+                        retorno = funcao_resolver(oferta, demanda, custos)
+                custo, iteracoes = retorno[:2]
+                extras = dict(retorno[2]) if len(retorno) > 2 else {}
+                solucao = extras.pop('solucao', None)
                 tempo_total = time.time() - tempo_inicio
                 
                 # Memória depois
@@ -427,17 +942,43 @@ def executar_benchmark(m, n, num_repeticoes=10):
                     mem_depois = processo.memory_info().rss / (1024 * 1024)
                 
                 memoria_usada = max(0.1, mem_depois - mem_antes)
+                if medidas is not None:
+                    tempo_total = medidas['tempo']
+                    memoria_usada = max(0.1, medidas['memoria_mb'])
                 
                 if custo is not None:
+                    # Certificado de otimalidade, fora do tempo medido (None se o
+                    # resolvedor não devolve solução e duais)
+                    certificado = None
+                    marca = ""
+                    if solucao is not None:
+                        tempo_inicio_verificacao = time.time()
+                        with trecho(rastreador, 'verificacao'):
+                            certificado = verificar_solucao(oferta, demanda, custos, *solucao)
+                        certificado['tempo_verificacao'] = time.time() - tempo_inicio_verificacao
+                        marca = " - certificado ✓" if certificado['valido'] else " - certificado ✗"
+                    # Pico de RSS e de heap num processo novo (fora do tempo medido)
+                    memoria_isolada = None
+                    if isolar_memoria:
+                        parametros = {'familia': familia, 'usar_cache': usar_cache, 'densidade': densidade,
+                                      'blocos': blocos, 'capacidade': capacidade}
+                        _, memoria_isolada = medir_memoria_isolada(
+                            resolver_instancia, (funcao_resolver, m, n, 42 + i, parametros, fator_demanda))
                     exec_resultado = {
                         'execucao': i + 1,
                         'tempo_total': tempo_total,
                         'memoria_mb': memoria_usada,
+                        'memoria_isolada': memoria_isolada,
                         'iteracoes': iteracoes if iteracoes else 0,
                         'custo_total': custo,
-                        'sucesso': True
+                        'sucesso': True,
+                        'status': 'ok',
+                        'certificado': certificado,
+                        **extras
                     }
-                    print(f"OK - {tempo_total:.4f}s - Custo: {custo:.2f}")
+                    print(f"OK - {tempo_total:.4f}s - Custo: {custo:.2f}{marca}")
+                    registrar_execucao(metricas, nome_bib, resultados['tamanho'], tempo_total,
+                                       iteracoes, memoria_usada, pico_memoria_mb=pico_memoria(memoria_isolada))
                 else:
                     exec_resultado = {
                         'execucao': i + 1,
@@ -445,14 +986,33 @@ def executar_benchmark(m, n, num_repeticoes=10):
                         'memoria_mb': 0,
                         'iteracoes': 0,
                         'custo_total': 0,
-                        'sucesso': False
+                        'sucesso': False,
+                        'status': 'falha'
                     }
                     print("FALHOU")
+                    registrar_execucao(metricas, nome_bib, resultados['tamanho'], tempo_total, status='falha')
                 
                 resultados['bibliotecas'][nome_bib]['execucoes'].append(exec_resultado)
                 
+            except (TimeoutError, MemoryError) as e:
+                interrompida = 'tempo_esgotado' if isinstance(e, TimeoutError) else 'memoria_esgotada'
+                tempo_total = time.time() - tempo_inicio
+                print(f"{'TEMPO ESGOTADO' if isinstance(e, TimeoutError) else 'MEMÓRIA ESGOTADA'}: {str(e)}")
+                registrar_execucao(metricas, nome_bib, resultados['tamanho'], tempo_total, status=interrompida)
+                resultados['bibliotecas'][nome_bib]['execucoes'].append({
+                    'execucao': i + 1,
+                    'tempo_total': tempo_total,
+                    'memoria_mb': 0,
+                    'iteracoes': 0,
+                    'custo_total': 0,
+                    'sucesso': False,
+                    'status': interrompida,
+                    'erro': str(e)
+                })
+                
             except Exception as e:
                 print(f"ERRO: {str(e)}")
+                registrar_execucao(metricas, nome_bib, resultados['tamanho'], 0.0, status='erro')
                 resultados['bibliotecas'][nome_bib]['execucoes'].append({
                     'execucao': i + 1,
                     'tempo_total': 0,
@@ -460,36 +1020,20 @@ def executar_benchmark(m, n, num_repeticoes=10):
                     'iteracoes': 0,
                     'custo_total': 0,
                     'sucesso': False,
+                    'status': 'erro',
                     'erro': str(e)
                 })
             
+            gravar_execucao(varredura, resultados['tamanho'], 42 + i, nome_bib,
+                            resultados['bibliotecas'][nome_bib]['execucoes'][-1])
+            
             # Limpar memória
             del oferta, demanda, custos
             gc.collect()
         
-        # Calcular estatísticas
-        execucoes_sucesso = [e for e in resultados['bibliotecas'][nome_bib]['execucoes'] if e['sucesso']]
-        
-        if execucoes_sucesso:
-            tempos = [e['tempo_total'] for e in execucoes_sucesso]
-            memorias = [e['memoria_mb'] for e in execucoes_sucesso]
-            iteracoes_list = [e['iteracoes'] for e in execucoes_sucesso]
-            
-            resultados['bibliotecas'][nome_bib]['estatisticas'] = {
-                'tempo_medio': statistics.mean(tempos),
-                'tempo_mediano': statistics.median(tempos),
-                'tempo_desvio': statistics.stdev(tempos) if len(tempos) > 1 else 0,
-                'tempo_min': min(tempos),
-                'tempo_max': max(tempos),
-                'memoria_media': statistics.mean(memorias),
-                'iteracoes_media': statistics.mean(iteracoes_list) if iteracoes_list else 0,
-                'taxa_sucesso': len(execucoes_sucesso) / num_repeticoes * 100
-            }
-            
-            print(f"\nEstatísticas {descricao}:")
-            print(f"  Tempo médio: {resultados['bibliotecas'][nome_bib]['estatisticas']['tempo_medio']:.4f}s")
-            print(f"  Memória média: {resultados['bibliotecas'][nome_bib]['estatisticas']['memoria_media']:.2f} MB")
-            print(f"  Taxa de sucesso: {resultados['bibliotecas'][nome_bib]['estatisticas']['taxa_sucesso']:.0f}%")
+        if interrompida is not None:
+            print(f"\n{descricao}: {interrompida} - repetições restantes puladas")
+        resumir_biblioteca(resultados['bibliotecas'][nome_bib], num_repeticoes)
     
     return resultados
 
@@ -497,7 +1041,225 @@ def executar_benchmark(m, n, num_repeticoes=10):
 # MAIN
 # ========================================
 
+def executar_repeticao_paralela(nome_bib, m, n, semente, parametros, fator_demanda=1.0):
+    """Uma repetição de uma biblioteca, no trabalhador do modo paralelo; retorna o registro da execução"""
+    funcao_resolver = BIBLIOTECAS[nome_bib][1]
+    oferta, demanda, custos = obter_problema(m, n, semente=semente, **parametros)
+    if fator_demanda != 1.0:
+        demanda = np.rint(np.asarray(demanda) * fator_demanda)
+    
+    gc.collect()
+    processo = psutil.Process(os.getpid())
+    mem_antes = processo.memory_info().rss / (1024 * 1024)
+    try:
+        tempo_inicio = time.time()
+        retorno = funcao_resolver(oferta, demanda, custos)
+        tempo_total = time.time() - tempo_inicio
+    except Exception as e:
+        return {'tempo_total': 0, 'memoria_mb': 0, 'iteracoes': 0, 'custo_total': 0,
+                'sucesso': False, 'status': 'erro', 'erro': str(e)}
+    memoria_usada = max(0.1, processo.memory_info().rss / (1024 * 1024) - mem_antes)
+    
+    custo, iteracoes = retorno[:2]
+    if custo is None:
+        return {'tempo_total': tempo_total, 'memoria_mb': 0, 'iteracoes': 0, 'custo_total': 0,
+                'sucesso': False, 'status': 'falha'}
+    extras = dict(retorno[2]) if len(retorno) > 2 else {}
+    solucao = extras.pop('solucao', None)
+    certificado = None
+    if solucao is not None:
+        tempo_inicio_verificacao = time.time()
+        certificado = verificar_solucao(oferta, demanda, custos, *solucao)
+        certificado['tempo_verificacao'] = time.time() - tempo_inicio_verificacao
+    return {
+        'tempo_total': tempo_total,
+        'memoria_mb': memoria_usada,
+        'memoria_isolada': None,
+        'iteracoes': iteracoes if iteracoes else 0,
+        'custo_total': custo,
+        'sucesso': True,
+        'status': 'ok',
+        'certificado': certificado,
+        'nucleo': nucleo_atual(),
+        **extras
+    }
+
+def executar_benchmark_paralelo(tamanhos, num_repeticoes=10, num_trabalhadores=None, threads_blas=1,
+                                familia=None, usar_cache=False, densidade=None, blocos=None, capacidade=None,
+                                fator_demanda=1.0, metricas=None, varredura=None, tempo_limite=None,
+                                limite_memoria_mb=None):
+    """Benchmark de todas as bibliotecas e tamanhos com as repetições distribuídas num pool
+
+    Cada repetição (tamanho, semente, biblioteca) é uma tarefa independente
+    de execucao_paralela: os trabalhadores ficam fixados cada um num núcleo,
+    com threads_blas threads de BLAS, para os tempos serem comparáveis aos
+    da execução serial. Com varredura, cada execução é gravada assim que
+    termina e as já gravadas não rodam de novo. Retorna a lista de
+    resultados por tamanho, no formato de executar_benchmark.
+
+    tempo_limite e limite_memoria_mb não são suportados aqui: os
+    trabalhadores do pool são processos daemon e não podem criar o processo
+    de execucao_limitada. Com algum deles, levanta ValueError em vez de
+    rodar sem os limites.
+    """
+    if tempo_limite is not None or limite_memoria_mb is not None:
+        raise ValueError("tempo_limite/limite_memoria_mb não são aplicados no modo paralelo; "
+                         "use a execução serial para limitar cada execução")
+    
+    print(f"\n{'='*80}")
+    print(f"BENCHMARK PARALELO: {len(tamanhos)} tamanhos - {num_repeticoes} repetições")
+    print(f"{'='*80}")
+    
+    parametros = {'familia': familia, 'usar_cache': usar_cache, 'densidade': densidade,
+                  'blocos': blocos, 'capacidade': capacidade}
+    todos_resultados = []
+    tarefas = []
+    for m, n in tamanhos:
+        resultado = {
+            'tamanho': f"{m}x{n}",
+            'm': m,
+            'n': n,
+            'num_repeticoes': num_repeticoes,
+            'familia': familia or 'original',
+            'densidade': densidade,
+            'blocos': blocos,
+            'capacidade': capacidade,
+            'fator_demanda': fator_demanda,
+            'bibliotecas': {}
+        }
+        for nome_bib, (descricao, _) in BIBLIOTECAS.items():
+            if not bibliotecas_disponiveis[nome_bib]:
+                continue
+            resultado['bibliotecas'][nome_bib] = {'nome': descricao, 'execucoes': [None] * num_repeticoes}
+            for i in range(num_repeticoes):
+                anterior = execucao_concluida(varredura, resultado['tamanho'], 42 + i, nome_bib)
+                if anterior is not None:
+                    resultado['bibliotecas'][nome_bib]['execucoes'][i] = anterior
+                else:
+                    tarefas.append((resultado, nome_bib, i))
+        todos_resultados.append(resultado)
+    
+    def concluir(indice, exec_resultado):
+        resultado, nome_bib, i = tarefas[indice]
+        exec_resultado = {'execucao': i + 1, **exec_resultado}
+        resultado['bibliotecas'][nome_bib]['execucoes'][i] = exec_resultado
+        gravar_execucao(varredura, resultado['tamanho'], 42 + i, nome_bib, exec_resultado)
+        registrar_execucao(metricas, nome_bib, resultado['tamanho'], exec_resultado['tempo_total'],
+                           exec_resultado['iteracoes'], exec_resultado['memoria_mb'],
+                           status=exec_resultado['status'],
+                           pico_memoria_mb=pico_memoria(exec_resultado.get('memoria_isolada')))
+        print(f"{nome_bib} {resultado['tamanho']} execução {i+1}: "
+              f"{exec_resultado['status']} - {exec_resultado['tempo_total']:.4f}s")
+    
+    print(f"{len(tarefas)} repetições a executar")
+    mapear_paralelo(executar_repeticao_paralela,
+                    [(nome_bib, resultado['m'], resultado['n'], 42 + i, parametros, fator_demanda)
+                     for resultado, nome_bib, i in tarefas],
+                    num_trabalhadores, threads_blas, concluir)
+    
+    for resultado in todos_resultados:
+        print(f"\n--- {resultado['tamanho']} ---")
+        for dados in resultado['bibliotecas'].values():
+            resumir_biblioteca(dados, num_repeticoes)
+    return todos_resultados
+
+def executar_benchmark_robusto(tamanhos, num_repeticoes=10, aquecimentos=2, familia=None, usar_cache=False,
+                               densidade=None, blocos=None, capacidade=None, fator_demanda=1.0, semente=0):
+    """Benchmark de todas as bibliotecas com a metodologia de medicao_robusta
+
+    As repetições de todas as bibliotecas e tamanhos são intercaladas em
+    ordem aleatória (semente), depois de `aquecimentos` execuções
+    descartadas de cada par. O tempo medido é o da chamada ao resolvedor,
+    com a instância já gerada. Retorna uma lista com um resultado por
+    tamanho, no formato de executar_benchmark, sem as medidas de memória.
+    """
+    print(f"\n{'='*80}")
+    print(f"BENCHMARK ROBUSTO: {len(tamanhos)} tamanhos - {num_repeticoes} repetições intercaladas, "
+          f"{aquecimentos} aquecimentos")
+    print(f"{'='*80}")
+    
+    def preparador(m, n):
+        def preparar(repeticao):
+            oferta, demanda, custos = obter_problema(m, n, semente=42+repeticao, familia=familia,
+                                                     usar_cache=usar_cache, densidade=densidade, blocos=blocos,
+                                                     capacidade=capacidade)
+            if fator_demanda != 1.0:
+                demanda = np.rint(np.asarray(demanda) * fator_demanda)
+            return oferta, demanda, custos
+        return preparar
+    
+    tarefas = {(nome_bib, m, n): (preparador(m, n), funcao_resolver)
+               for m, n in tamanhos
+               for nome_bib, (_, funcao_resolver) in BIBLIOTECAS.items()
+               if bibliotecas_disponiveis[nome_bib]}
+    
+    def progresso(chave, medicao):
+        nome_bib, m, n = chave
+        custo = None if medicao['erro'] is not None else medicao['resultado'][0]
+        if custo is None:
+            print(f"{nome_bib} {m}×{n} repetição {medicao['repeticao']+1}: "
+                  f"{'FALHOU' if medicao['erro'] is None else 'ERRO ' + medicao['erro']}")
+        else:
+            print(f"{nome_bib} {m}×{n} repetição {medicao['repeticao']+1}: {medicao['parede_ns'] / 1e9:.4f}s")
+    
+    medicoes = executar_intercalado(tarefas, num_repeticoes, aquecimentos, semente, progresso)
+    
+    todos_resultados = []
+    for m, n in tamanhos:
+        resultado = {
+            'tamanho': f"{m}x{n}",
+            'm': m,
+            'n': n,
+            'num_repeticoes': num_repeticoes,
+            'familia': familia or 'original',
+            'densidade': densidade,
+            'blocos': blocos,
+            'capacidade': capacidade,
+            'fator_demanda': fator_demanda,
+            'metodologia': {'relogio': 'perf_counter_ns', 'aquecimentos': aquecimentos,
+                            'intercalado': True, 'semente': semente},
+            'bibliotecas': {}
+        }
+        for nome_bib, (descricao, _) in BIBLIOTECAS.items():
+            if (nome_bib, m, n) not in medicoes:
+                continue
+            lista = medicoes[nome_bib, m, n]
+            # Resolvedor que devolve custo None falhou, mesmo sem exceção
+            for medicao in lista:
+                if medicao['erro'] is None and medicao['resultado'][0] is None:
+                    medicao['erro'] = 'sem solução'
+            execucoes = [{
+                'execucao': medicao['repeticao'] + 1,
+                'tempo_total': medicao['parede_ns'] / 1e9 if medicao['erro'] is None else None,
+                'tempo_cpu': medicao['cpu_ns'] / 1e9 if medicao['erro'] is None else None,
+                'iteracoes': (medicao['resultado'][1] or 0) if medicao['erro'] is None else 0,
+                'custo_total': medicao['resultado'][0] if medicao['erro'] is None else None,
+                'sucesso': medicao['erro'] is None,
+                'erro': medicao['erro'],
+            } for medicao in lista]
+            sucesso = [e for e in execucoes if e['sucesso']]
+            estatisticas = estatisticas_tempo(lista, semente=semente)
+            estatisticas['iteracoes_media'] = statistics.mean(e['iteracoes'] for e in sucesso) if sucesso else 0
+            estatisticas['taxa_sucesso'] = len(sucesso) / num_repeticoes * 100
+            resultado['bibliotecas'][nome_bib] = {'nome': descricao, 'execucoes': execucoes,
+                                                  'estatisticas': estatisticas}
+        todos_resultados.append(resultado)
+    
+    for resultado in todos_resultados:
+        print(f"\n{resultado['tamanho']}:")
+        print(f"{'Biblioteca':<24} {'Mediana (s)':<14} {'IC 95% (s)':<24} {'Outliers'}")
+        print("-"*80)
+        for dados in resultado['bibliotecas'].values():
+            est = dados['estatisticas']
+            if est['amostras']:
+                print(f"{dados['nome']:<24} {est['tempo_mediano']:<14.4f} "
+                      f"[{est['tempo_ic_inferior']:.4f}, {est['tempo_ic_superior']:.4f}]{'':<6} "
+                      f"{est['outliers_removidos']}")
+    return todos_resultados
+
 if __name__ == "__main__":
+    relatar_bibliotecas()
+    
     print("="*80)
     print("BENCHMARK COMPARATIVO: BIBLIOTECAS PYTHON PARA SIMPLEX")
     print("="*80)
@@ -521,11 +1283,100 @@ if __name__ == "__main__":
     
     num_repeticoes = 10
     
+    # None = gerador original; ou 'uniforme', 'euclidiana', 'agrupada', 'degenerada'
+    familia = None
+    
+    # Reutiliza instâncias do cache binário em disco (cache_instancias/).
+    # Desligado por padrão: ler do cache muda o tempo_total em relação aos
+    # resultados guardados em analise/, que geravam a instância a cada execução
+    usar_cache = False
+    
+    # None = todas as m·n rotas; ou fração de rotas permitidas (ex.: 0.05)
+    densidade = None
+    
+    # None = rede única; ou número de blocos independentes (rede separável)
+    blocos = None
+    
+    # None = rotas sem limite; ou capacidade média por rota (apenas redes esparsas)
+    capacidade = None
+    
+    # 1.0 = balanceado; ex.: 1.1 = demanda 10% maior que a oferta (nó fictício)
+    fator_demanda = 1.0
+    
+    # Mede pico de RSS e de heap de cada execução num processo isolado (mais lento)
+    isolar_memoria = False
+    
+    # None = sem limite; com algum limite, cada execução roda num processo de
+    # trabalho (execucao_limitada) que é morto ao esgotar o tempo (segundos) ou
+    # recebe MemoryError ao passar do limite de memória (MB, via setrlimit)
+    tempo_limite = None
+    limite_memoria_mb = None
+    
+    # Modo paralelo (execucao_paralela): repetições distribuídas num pool com um
+    # trabalhador por núcleo (None = todos os núcleos disponíveis), cada um fixado
+    # no seu núcleo e com threads_blas threads de BLAS. Não aceita os limites acima
+    modo_paralelo = False
+    num_trabalhadores = None
+    threads_blas = 1
+    
+    # Metodologia robusta (medicao_robusta): aquecimentos, repetições de todas as
+    # bibliotecas e tamanhos intercaladas em ordem aleatória, outliers removidos e IC bootstrap
+    modo_robusto = False
+    aquecimentos = 2
+    
+    # Linha do tempo no formato Chrome trace (chrome://tracing ou ui.perfetto.dev)
+    rastrear = False
+    rastreador = criar_rastreador() if rastrear else None
+    
+    # None = sem métricas; ou porta do endpoint Prometheus (ex.: 9464 → http://127.0.0.1:9464/metrics)
+    porta_metricas = None
+    metricas = None
+    if porta_metricas is not None:
+        metricas = criar_registro()
+        servir_metricas(metricas, porta=porta_metricas)
+        print(f"Métricas em http://127.0.0.1:{porta_metricas}/metrics")
+    
+    # Cada execução é acrescentada a um JSONL assim que termina;
+    # --retomar=arquivo.jsonl continua uma varredura interrompida, pulando
+    # as combinações (tamanho, semente, biblioteca) já gravadas; os parâmetros
+    # da instância vão em cada linha e precisam bater com os atuais
+    arquivo_retomar = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--retomar=')), None)
+    arquivo_varredura = arquivo_retomar or f"benchmark_bibliotecas_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    
+    parametros_instancia = {'familia': familia or 'original', 'densidade': densidade, 'blocos': blocos,
+                            'capacidade': capacidade, 'fator_demanda': fator_demanda}
+    
     todos_resultados = []
     
-    for m, n in tamanhos:
-        resultado = executar_benchmark(m, n, num_repeticoes)
-        todos_resultados.append(resultado)
+    if modo_robusto:
+        todos_resultados = executar_benchmark_robusto(tamanhos, num_repeticoes, aquecimentos, familia=familia,
+                                                      usar_cache=usar_cache, densidade=densidade, blocos=blocos,
+                                                      capacidade=capacidade, fator_demanda=fator_demanda)
+    elif modo_paralelo:
+        varredura = abrir_varredura(arquivo_varredura, retomar=arquivo_retomar is not None,
+                                    parametros=parametros_instancia)
+        print(f"Execuções gravadas em: {arquivo_varredura}")
+        todos_resultados = executar_benchmark_paralelo(tamanhos, num_repeticoes, num_trabalhadores, threads_blas,
+                                                       familia=familia, usar_cache=usar_cache,
+                                                       densidade=densidade, blocos=blocos, capacidade=capacidade,
+                                                       fator_demanda=fator_demanda, metricas=metricas,
+                                                       varredura=varredura, tempo_limite=tempo_limite,
+                                                       limite_memoria_mb=limite_memoria_mb)
+        fechar_varredura(varredura)
+    else:
+        varredura = abrir_varredura(arquivo_varredura, retomar=arquivo_retomar is not None,
+                                    parametros=parametros_instancia)
+        print(f"Execuções gravadas em: {arquivo_varredura}")
+        for m, n in tamanhos:
+            with trecho(rastreador, f"benchmark.{m}x{n}"):
+                resultado = executar_benchmark(m, n, num_repeticoes, familia=familia, usar_cache=usar_cache,
+                                               densidade=densidade, blocos=blocos, capacidade=capacidade,
+                                               fator_demanda=fator_demanda, rastreador=rastreador,
+                                               metricas=metricas, isolar_memoria=isolar_memoria,
+                                               varredura=varredura, tempo_limite=tempo_limite,
+                                               limite_memoria_mb=limite_memoria_mb)
+            todos_resultados.append(resultado)
+        fechar_varredura(varredura)
     
     # Salvar resultados em JSON
     timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -534,6 +1385,10 @@ if __name__ == "__main__":
     with open(nome_arquivo, 'w', encoding='utf-8') as f:
         json.dump(todos_resultados, f, indent=2, ensure_ascii=False)
     
+    if rastreador is not None:
+        exportar_chrome(rastreador, f"benchmark_bibliotecas_{timestamp}_trace.json", 'bibliotecas')
+        print(f"Linha do tempo salva em: benchmark_bibliotecas_{timestamp}_trace.json")
+    
     print(f"\n{'='*80}")
     print(f"Resultados salvos em: {nome_arquivo}")
     print(f"{'='*80}")
@@ -549,10 +1404,11 @@ if __name__ == "__main__":
         print("-"*80)
         
         for nome_bib, dados in resultado['bibliotecas'].items():
-            if 'estatisticas' in dados:
+            if 'estatisticas' in dados and 'tempo_medio' in dados['estatisticas']:
                 est = dados['estatisticas']
+                memoria = f"{est['memoria_media']:.2f}" if 'memoria_media' in est else '-'
                 print(f"{dados['nome']:<20} {est['tempo_medio']:<15.4f} "
-                      f"{est['memoria_media']:<15.2f} {est['taxa_sucesso']:.0f}%")
+                      f"{memoria:<15} {est['taxa_sucesso']:.0f}%")
     
     print("\n" + "="*80)
     print("BENCHMARK COMPLETO!")
@@ -0,0 +1,116 @@
+"""
+Benchmark da construção da tabela de transporte
+Compara: listas Python (original), NumPy pré-alocado e restrições CSR com o
+vetor de custos (o modelo de um solver de PL, sem a tabela densa)
+Mede tempo de construção e pico de memória (tracemalloc) por tamanho.
+
+O 500×500 (tabela densa de ~2 GB por repetição) só roda com --grande.
+"""
+
+import sys
+import time
+import json
+import gc
+import tracemalloc
+import statistics
+
+import numpy as np
+
+from simplex import construir_tabela_transporte
+from benchmark_simplex import gerar_problema_transporte
+from tabela_vetorizada import (
+    construir_tabela_transporte_numpy,
+    construir_restricoes_transporte_csr,
+)
+
+def construir_listas(oferta, demanda, custos):
+    return construir_tabela_transporte(oferta, demanda, custos)
+
+def construir_numpy(oferta, demanda, custos):
+    return construir_tabela_transporte_numpy(oferta, demanda, custos)
+
+def construir_csr(oferta, demanda, custos):
+    # Restrições e custos: o que a tabela densa guarda, menos as folgas e os zeros
+    custo = np.asarray(custos, dtype=np.float64).ravel()
+    return construir_restricoes_transporte_csr(len(oferta), len(demanda)), custo
+
+construtores = {
+    'listas': ('Listas Python (original)', construir_listas),
+    'numpy': ('NumPy pré-alocado', construir_numpy),
+    'csr': ('Restrições CSR + custos', construir_csr),
+}
+
+def medir_construtor(funcao, oferta, demanda, custos):
+    """Mede tempo e pico de memória de uma construção"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    tabela = funcao(oferta, demanda, custos)
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tabela
+    gc.collect()
+    return tempo, pico / (1024 * 1024)
+
+def executar_benchmark(m, n, num_repeticoes=3):
+    """Executa o benchmark de construção para um tamanho específico"""
+    print(f"\n{'='*60}")
+    print(f"CONSTRUÇÃO: {m}×{n} - {num_repeticoes} repetições")
+    print(f"{'='*60}")
+
+    oferta, demanda, custos = gerar_problema_transporte(m, n)
+
+    resultados = {
+        'tamanho': f"{m}x{n}",
+        'm': m,
+        'n': n,
+        'num_repeticoes': num_repeticoes,
+        'construtores': {}
+    }
+
+    for nome, (descricao, funcao) in construtores.items():
+        tempos = []
+        picos = []
+        for _ in range(num_repeticoes):
+            tempo, pico = medir_construtor(funcao, oferta, demanda, custos)
+            tempos.append(tempo)
+            picos.append(pico)
+
+        resultados['construtores'][nome] = {
+            'nome': descricao,
+            'tempo_mediano': statistics.median(tempos),
+            'tempo_min': min(tempos),
+            'memoria_pico_mb': max(picos)
+        }
+        print(f"{descricao:<28} {statistics.median(tempos):>10.4f}s {max(picos):>12.2f} MB")
+
+    return resultados
+
+# ======================
+# EXECUÇÃO PRINCIPAL
+# ======================
+
+if __name__ == "__main__":
+    print("="*60)
+    print("BENCHMARK DE CONSTRUÇÃO DA TABELA - PYTHON")
+    print("="*60)
+
+    tamanhos = [
+        (100, 100),
+        (200, 200),
+    ]
+
+    # A tabela densa de 500×500 ocupa ~2 GB por repetição (listas ou NumPy)
+    if '--grande' in sys.argv[1:]:
+        tamanhos.append((500, 500))
+
+    todos_resultados = [executar_benchmark(m, n) for m, n in tamanhos]
+
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    nome_arquivo = f"benchmark_construcao_{timestamp}.json"
+
+    with open(nome_arquivo, 'w', encoding='utf-8') as f:
+        json.dump(todos_resultados, f, indent=2, ensure_ascii=False)
+
+    print(f"\nResultados salvos em: {nome_arquivo}")
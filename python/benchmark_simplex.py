@@ -1,3 +1,4 @@
+import sys
 import random
 import time
 import psutil
@@ -6,6 +7,18 @@ import json
 import statistics
 import gc
 
+from gerador_instancias import gerar_instancia
+from formato_instancia import obter_instancia_cache
+from balanceamento import penalidades
+from certificado import verificar_solucao
+from simplex import extrair_duais
+from instrumentacao import criar_instrumentacao, registrar, resumo_fases, FASES
+from rastreamento import criar_rastreador, exportar_chrome, trecho
+from metricas import criar_registro, registrar_execucao, servir_metricas, pico_memoria
+from medicao_memoria import medir_memoria_isolada
+from medicao_robusta import executar_intercalado, estatisticas_tempo
+from varredura import abrir_varredura, execucao_concluida, gravar_execucao, fechar_varredura
+
 def mostrar_tabela(tabela):
     print("\nTabela Simplex:")
     for i, linha in enumerate(tabela):
@@ -56,38 +69,62 @@ def pivotear(tabela, linha_pivo, coluna_pivo):
             for j in range(num_colunas):
                 tabela[i][j] -= multiplicador * tabela[linha_pivo][j]
 
-def simplex(tabela, verbose=False, max_iteracoes=1000000):
-    """Algoritmo Simplex padrão - retorna número de iterações"""
+def simplex(tabela, verbose=False, max_iteracoes=1000000, instrumentacao=None, callback=None,
+            rastreador=None):
+    """Algoritmo Simplex padrão - retorna número de iterações
+
+    instrumentacao, callback e rastreador como em simplex.simplex.
+    """
     iteracao = 0
+    medir = instrumentacao is not None or rastreador is not None
     
     while iteracao < max_iteracoes:
         iteracao += 1
         
+        if medir:
+            marca = time.perf_counter()
+        
         coluna_pivo = encontrar_coluna_pivo(tabela)
+        if medir:
+            marca = registrar(instrumentacao, 'precificacao', marca, rastreador)
         if coluna_pivo == -1:
             return iteracao  # Retorna número de iterações
         
         linha_pivo = encontrar_linha_pivo(tabela, coluna_pivo)
+        if medir:
+            marca = registrar(instrumentacao, 'razao', marca, rastreador)
         if linha_pivo == -1:
             print("Problema ilimitado")
             return -1
         
+        if callback is not None:
+            passo = tabela[linha_pivo][-1] / tabela[linha_pivo][coluna_pivo]
+        
         pivotear(tabela, linha_pivo, coluna_pivo)
+        if medir:
+            registrar(instrumentacao, 'pivoteamento', marca, rastreador)
+        if callback is not None:
+            callback(iteracao, coluna_pivo, linha_pivo, -tabela[-1][-1], passo)
     
     print(f"ATENÇÃO: Limite de {max_iteracoes} iterações atingido!")
     return iteracao
 
-def construir_tabela_transporte(oferta, demanda, custos):
-    """Constrói a tabela simplex para o problema de transporte"""
+def construir_tabela_transporte(oferta, demanda, custos, custo_ficticio=0.0):
+    """Constrói a tabela simplex para o problema de transporte
+
+    Problemas desbalanceados ganham uma coluna fictícia por origem (sobra)
+    ou por destino (falta) com custo custo_ficticio.
+    """
     m = len(oferta)
     n = len(demanda)
     num_vars = m * n
     
     total_oferta = sum(oferta)
     total_demanda = sum(demanda)
-    if abs(total_oferta - total_demanda) > 1e-6:
-        print(f"ERRO: Problema desbalanceado!")
-        return None
+    excesso = total_oferta - total_demanda
+    num_ficticias = 0
+    if abs(excesso) > 1e-6:
+        num_ficticias = m if excesso > 0 else n
     
     tabela = []
     
@@ -97,11 +134,15 @@ def construir_tabela_transporte(oferta, demanda, custos):
         for j in range(n):
             linha[i * n + j] = 1.0
         
+        ficticias = [0.0] * num_ficticias
+        if num_ficticias and excesso > 0:
+            ficticias[i] = 1.0
+        
         folgas_oferta = [0.0] * m
         folgas_oferta[i] = 1.0
         folgas_demanda = [0.0] * n
         
-        linha += folgas_oferta + folgas_demanda
+        linha += ficticias + folgas_oferta + folgas_demanda
         linha.append(float(oferta[i]))
         tabela.append(linha)
     
@@ -115,7 +156,11 @@ def construir_tabela_transporte(oferta, demanda, custos):
         folgas_demanda = [0.0] * n
         folgas_demanda[j] = 1.0
         
-        linha += folgas_oferta + folgas_demanda
+        ficticias = [0.0] * num_ficticias
+        if num_ficticias and excesso < 0:
+            ficticias[j] = 1.0
+        
+        linha += ficticias + folgas_oferta + folgas_demanda
         linha.append(float(demanda[j]))
         tabela.append(linha)
     
@@ -125,6 +170,10 @@ def construir_tabela_transporte(oferta, demanda, custos):
         for j in range(n):
             linha_obj.append(-float(custos[i][j]))
     
+    # Penalidade por unidade nas variáveis fictícias: escalar ou um valor por variável
+    if num_ficticias:
+        linha_obj += (-penalidades(custo_ficticio, num_ficticias)).tolist()
+    
     linha_obj += [0.0] * (m + n)
     linha_obj.append(0.0)
     tabela.append(linha_obj)
@@ -168,8 +217,53 @@ def gerar_problema_transporte(m, n, total=100000, semente=42):
     
     return oferta, demanda, custos
 
-def executar_benchmark(m, n, num_repeticoes=10):
-    """Executa benchmark para um tamanho específico"""
+def obter_problema(m, n, semente=42, familia=None, usar_cache=False):
+    """Gera a instância: gerador original (familia=None) ou família vetorizada
+
+    Com usar_cache=True a instância é lida do cache binário em disco
+    (gerada e gravada apenas na primeira vez); a do gerador original volta
+    como listas, como sai do gerador, para os construtores de tabela
+    baseados em listas medirem o mesmo que sem cache.
+    """
+    if familia is None:
+        gerador, parametros = gerar_problema_transporte, {'m': m, 'n': n, 'total': 100000, 'semente': semente}
+    else:
+        gerador, parametros = gerar_instancia, {'m': m, 'n': n, 'familia': familia, 'total': 100000, 'semente': semente}
+    
+    if usar_cache:
+        oferta, demanda, custos = obter_instancia_cache(gerador, **parametros)
+        if familia is None:
+            return oferta.tolist(), demanda.tolist(), custos.tolist()
+        return oferta, demanda, custos
+    return gerador(**parametros)
+
+def resolver_tabela(oferta, demanda, custos):
+    """Tabela, simplex e extração; retorna (iteracoes, custo_total)"""
+    tabela = construir_tabela_transporte(oferta, demanda, custos)
+    iteracoes = simplex(tabela, verbose=False)
+    _, custo_total = extrair_solucao(tabela, len(oferta), len(demanda))
+    return iteracoes, custo_total
+
+def executar_repeticao(m, n, semente=42, familia=None, usar_cache=False):
+    """Uma repetição completa (instância, tabela, simplex, extração); retorna (iteracoes, custo_total)"""
+    oferta, demanda, custos = obter_problema(m, n, semente=semente, familia=familia, usar_cache=usar_cache)
+    return resolver_tabela(oferta, demanda, custos)
+
+def executar_benchmark(m, n, num_repeticoes=10, familia=None, usar_cache=False, rastreador=None,
+                       metricas=None, isolar_memoria=False, varredura=None):
+    """Executa benchmark para um tamanho específico
+
+    Com rastreador (rastreamento.criar_rastreador), a construção, cada fase
+    de cada pivô, a extração e a verificação viram trechos da linha do tempo.
+    Com metricas (metricas.criar_registro), cada execução alimenta os
+    histogramas do Prometheus (motor 'simplex').
+    Com isolar_memoria, cada repetição é executada de novo num processo
+    isolado (medicao_memoria) para medir o pico de RSS e o pico do heap
+    Python, gravados em 'memoria_isolada'; os tempos continuam vindo da
+    execução normal.
+    Com varredura (varredura.abrir_varredura), cada repetição é gravada no
+    JSONL assim que termina, e as já gravadas são reaproveitadas sem rodar.
+    """
     print(f"\n{'='*60}")
     print(f"BENCHMARK: {m}×{n} - {num_repeticoes} repetições")
     print(f"{'='*60}")
@@ -179,12 +273,19 @@ def executar_benchmark(m, n, num_repeticoes=10):
         'm': m,
         'n': n,
         'num_repeticoes': num_repeticoes,
+        'familia': familia or 'original',
         'execucoes': []
     }
     
     for i in range(num_repeticoes):
         print(f"\nExecução {i+1}/{num_repeticoes}...", end=" ")
         
+        anterior = execucao_concluida(varredura, resultados['tamanho'], 42 + i, 'simplex')
+        if anterior is not None:
+            resultados['execucoes'].append(anterior)
+            print(f"já concluída - {anterior['tempo_total']:.4f}s")
+            continue
+        
         # Forçar coleta de lixo antes de medir memória
         gc.collect()
         
@@ -200,20 +301,25 @@ def executar_benchmark(m, n, num_repeticoes=10):
         
         # Gerar problema
         tempo_inicio_total = time.time()
-        oferta, demanda, custos = gerar_problema_transporte(m, n, semente=42+i)
+        with trecho(rastreador, 'instancia'):
+            oferta, demanda, custos = obter_problema(m, n, semente=42+i, familia=familia, usar_cache=usar_cache)
         
         # Construir tabela
         tempo_inicio_construcao = time.time()
-        tabela = construir_tabela_transporte(oferta, demanda, custos)
+        with trecho(rastreador, 'construcao'):
+            tabela = construir_tabela_transporte(oferta, demanda, custos)
         tempo_construcao = time.time() - tempo_inicio_construcao
         
-        # Resolver
+        # Resolver (com o tempo de cada fase)
+        fases = criar_instrumentacao()
         tempo_inicio_simplex = time.time()
-        iteracoes = simplex(tabela, verbose=False)
+        iteracoes = simplex(tabela, verbose=False, instrumentacao=fases, rastreador=rastreador)
         tempo_simplex = time.time() - tempo_inicio_simplex
         
         # Extrair solução
+        marca = time.perf_counter()
         valores, custo_total = extrair_solucao(tabela, m, n)
+        registrar(fases, 'extracao', marca, rastreador)
         
         tempo_total = time.time() - tempo_inicio_total
         
@@ -225,6 +331,12 @@ def executar_benchmark(m, n, num_repeticoes=10):
             # Linux/Mac: usa RSS
             mem_depois = processo.memory_info().rss / (1024 * 1024)
         
+        # Certificado de otimalidade (fora do tempo medido)
+        tempo_inicio_verificacao = time.time()
+        with trecho(rastreador, 'verificacao'):
+            certificado = verificar_solucao(oferta, demanda, custos, valores, *extrair_duais(tabela, m, n))
+        certificado['tempo_verificacao'] = time.time() - tempo_inicio_verificacao
+        
         # Calcular diferença - garantir que seja positiva ou zero
         memoria_usada = max(0, mem_depois - mem_antes)
         
@@ -236,20 +348,32 @@ def executar_benchmark(m, n, num_repeticoes=10):
             except AttributeError:
                 memoria_usada = processo.memory_info().rss / (1024 * 1024)
         
+        # Pico de RSS e de heap num processo novo (fora do tempo medido)
+        memoria_isolada = None
+        if isolar_memoria:
+            _, memoria_isolada = medir_memoria_isolada(executar_repeticao, (m, n, 42 + i, familia, usar_cache))
+        
         exec_resultado = {
             'execucao': i + 1,
             'tempo_total': tempo_total,
             'tempo_construcao': tempo_construcao,
             'tempo_simplex': tempo_simplex,
+            'fases': fases,
             'memoria_mb': memoria_usada,
             'memoria_antes_mb': mem_antes,
             'memoria_depois_mb': mem_depois,
             'iteracoes': iteracoes,
-            'custo_total': custo_total
+            'custo_total': custo_total,
+            'certificado': certificado,
+            'memoria_isolada': memoria_isolada
         }
         
         resultados['execucoes'].append(exec_resultado)
-        print(f"OK - {tempo_total:.4f}s - {iteracoes} iterações - {memoria_usada:.2f} MB")
+        gravar_execucao(varredura, resultados['tamanho'], 42 + i, 'simplex', exec_resultado)
+        registrar_execucao(metricas, 'simplex', resultados['tamanho'], tempo_total, iteracoes, memoria_usada,
+                           status='ok' if iteracoes > 0 else 'falha', pico_memoria_mb=pico_memoria(memoria_isolada))
+        print(f"OK - {tempo_total:.4f}s - {iteracoes} iterações - {memoria_usada:.2f} MB - "
+              f"certificado {'✓' if certificado['valido'] else '✗'}")
         
         # Limpar memória após cada execução
         del tabela, valores, oferta, demanda, custos
@@ -270,6 +394,7 @@ def executar_benchmark(m, n, num_repeticoes=10):
         
         'tempo_simplex_medio': statistics.mean(tempos_simplex),
         'tempo_simplex_mediano': statistics.median(tempos_simplex),
+        'fases_media': resumo_fases([e['fases'] for e in resultados['execucoes']]),
         
         'memoria_media': statistics.mean(memorias),
         'memoria_mediana': statistics.median(memorias),
@@ -278,17 +403,37 @@ def executar_benchmark(m, n, num_repeticoes=10):
         
         'iteracoes_media': statistics.mean(iteracoes_list),
         'iteracoes_min': min(iteracoes_list),
-        'iteracoes_max': max(iteracoes_list)
+        'iteracoes_max': max(iteracoes_list),
+        
+        'certificados_validos': sum(e['certificado']['valido'] for e in resultados['execucoes'])
     }
     
+    isoladas = [e['memoria_isolada'] for e in resultados['execucoes'] if e['memoria_isolada']]
+    if isoladas:
+        resultados['estatisticas'].update({
+            'pico_rss_medio': statistics.mean(e['pico_rss_mb'] for e in isoladas),
+            'incremento_rss_medio': statistics.mean(e['incremento_rss_mb'] for e in isoladas),
+            'incremento_rss_max': max(e['incremento_rss_mb'] for e in isoladas),
+            'pico_heap_medio': statistics.mean(e['pico_heap_mb'] for e in isoladas),
+            'pico_heap_max': max(e['pico_heap_mb'] for e in isoladas),
+            'tempo_isolado_medio': statistics.mean(e['tempo_isolado'] for e in isoladas),
+        })
+    
     # Mostrar resumo
     print(f"\n{'='*60}")
     print("ESTATÍSTICAS:")
     print(f"Tempo médio: {resultados['estatisticas']['tempo_medio']:.4f}s ± {resultados['estatisticas']['tempo_desvio']:.4f}s")
     print(f"Tempo Simplex médio: {resultados['estatisticas']['tempo_simplex_medio']:.4f}s")
+    print("  por fase: " + ", ".join(f"{fase} {resultados['estatisticas']['fases_media'][fase]:.4f}s"
+                                     for fase in FASES))
     print(f"Memória média: {resultados['estatisticas']['memoria_media']:.2f} MB")
     print(f"Memória mediana: {resultados['estatisticas']['memoria_mediana']:.2f} MB")
+    if isoladas:
+        print(f"Pico RSS (processo isolado): {resultados['estatisticas']['pico_rss_medio']:.2f} MB "
+              f"(+{resultados['estatisticas']['incremento_rss_medio']:.2f} MB sobre o interpretador)")
+        print(f"Pico heap Python (tracemalloc): {resultados['estatisticas']['pico_heap_medio']:.2f} MB")
     print(f"Iterações médias: {resultados['estatisticas']['iteracoes_media']:.0f}")
+    print(f"Certificados válidos: {resultados['estatisticas']['certificados_validos']}/{num_repeticoes}")
     print(f"{'='*60}")
     
     return resultados
@@ -297,6 +442,70 @@ def executar_benchmark(m, n, num_repeticoes=10):
 # EXECUÇÃO PRINCIPAL
 # ======================
 
+def executar_benchmark_robusto(tamanhos, num_repeticoes=10, aquecimentos=2, familia=None, usar_cache=False,
+                               semente=0):
+    """Benchmark com a metodologia de medicao_robusta
+
+    As repetições de todos os tamanhos são intercaladas em ordem aleatória
+    (semente), depois de `aquecimentos` execuções descartadas de cada um.
+    O tempo medido vai da instância pronta à solução extraída (tabela,
+    simplex e extração). Retorna uma lista com um resultado por tamanho,
+    no formato de executar_benchmark, sem as medidas de memória.
+    """
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK ROBUSTO: {len(tamanhos)} tamanhos - {num_repeticoes} repetições intercaladas, "
+          f"{aquecimentos} aquecimentos")
+    print(f"{'='*60}")
+    
+    def preparador(m, n):
+        return lambda repeticao: obter_problema(m, n, semente=42+repeticao, familia=familia, usar_cache=usar_cache)
+    
+    tarefas = {(m, n): (preparador(m, n), resolver_tabela) for m, n in tamanhos}
+    
+    def progresso(chave, medicao):
+        m, n = chave
+        if medicao['erro'] is None:
+            print(f"{m}×{n} repetição {medicao['repeticao']+1}: {medicao['parede_ns'] / 1e9:.4f}s")
+        else:
+            print(f"{m}×{n} repetição {medicao['repeticao']+1}: ERRO {medicao['erro']}")
+    
+    medicoes = executar_intercalado(tarefas, num_repeticoes, aquecimentos, semente, progresso)
+    
+    todos_resultados = []
+    for (m, n), lista in medicoes.items():
+        execucoes = [{
+            'execucao': medicao['repeticao'] + 1,
+            'tempo_total': medicao['parede_ns'] / 1e9 if medicao['erro'] is None else None,
+            'tempo_cpu': medicao['cpu_ns'] / 1e9 if medicao['erro'] is None else None,
+            'iteracoes': medicao['resultado'][0] if medicao['erro'] is None else None,
+            'custo_total': medicao['resultado'][1] if medicao['erro'] is None else None,
+            'erro': medicao['erro'],
+        } for medicao in lista]
+        estatisticas = estatisticas_tempo(lista, semente=semente)
+        iteracoes_list = [e['iteracoes'] for e in execucoes if e['iteracoes'] is not None]
+        estatisticas['iteracoes_media'] = statistics.mean(iteracoes_list) if iteracoes_list else 0
+        todos_resultados.append({
+            'tamanho': f"{m}x{n}",
+            'm': m,
+            'n': n,
+            'num_repeticoes': num_repeticoes,
+            'familia': familia or 'original',
+            'metodologia': {'relogio': 'perf_counter_ns', 'aquecimentos': aquecimentos,
+                            'intercalado': True, 'semente': semente},
+            'execucoes': execucoes,
+            'estatisticas': estatisticas,
+        })
+    
+    print(f"\n{'Tamanho':<12} {'Mediana (s)':<14} {'IC 95% (s)':<24} {'Outliers'}")
+    print("-"*60)
+    for r in todos_resultados:
+        est = r['estatisticas']
+        if est['amostras']:
+            print(f"{r['tamanho']:<12} {est['tempo_mediano']:<14.4f} "
+                  f"[{est['tempo_ic_inferior']:.4f}, {est['tempo_ic_superior']:.4f}]{'':<6} "
+                  f"{est['outliers_removidos']}")
+    return todos_resultados
+
 if __name__ == "__main__":
     print("="*60)
     print("BENCHMARK SIMPLEX - PYTHON (Versão Corrigida)")
@@ -320,11 +529,56 @@ if __name__ == "__main__":
     
     num_repeticoes = 10
     
+    # None = gerador original; ou 'uniforme', 'euclidiana', 'agrupada', 'degenerada'
+    familia = None
+    
+    # Reutiliza instâncias do cache binário em disco (cache_instancias/).
+    # Desligado por padrão: ler do cache muda o tempo_total em relação aos
+    # resultados guardados em analise/, que geravam a instância a cada execução
+    usar_cache = False
+    
+    # Mede pico de RSS e de heap de cada repetição num processo isolado (mais lento)
+    isolar_memoria = False
+    
+    # Metodologia robusta (medicao_robusta): aquecimentos, repetições de todos os
+    # tamanhos intercaladas em ordem aleatória, outliers removidos e IC bootstrap
+    modo_robusto = False
+    aquecimentos = 2
+    
+    # Linha do tempo no formato Chrome trace (chrome://tracing ou ui.perfetto.dev)
+    rastrear = False
+    rastreador = criar_rastreador() if rastrear else None
+    
+    # None = sem métricas; ou porta do endpoint Prometheus (ex.: 9464 → http://127.0.0.1:9464/metrics)
+    porta_metricas = None
+    metricas = None
+    if porta_metricas is not None:
+        metricas = criar_registro()
+        servir_metricas(metricas, porta=porta_metricas)
+        print(f"Métricas em http://127.0.0.1:{porta_metricas}/metrics")
+    
+    # Cada repetição é acrescentada a um JSONL assim que termina;
+    # --retomar=arquivo.jsonl continua uma varredura interrompida, pulando
+    # as combinações (tamanho, semente) já gravadas, desde que com a mesma família
+    arquivo_retomar = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--retomar=')), None)
+    arquivo_varredura = arquivo_retomar or f"benchmark_python_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    
     todos_resultados = []
     
-    for m, n in tamanhos:
-        resultado = executar_benchmark(m, n, num_repeticoes)
-        todos_resultados.append(resultado)
+    if modo_robusto:
+        todos_resultados = executar_benchmark_robusto(tamanhos, num_repeticoes, aquecimentos,
+                                                      familia=familia, usar_cache=usar_cache)
+    else:
+        varredura = abrir_varredura(arquivo_varredura, retomar=arquivo_retomar is not None,
+                                    parametros={'familia': familia or 'original'})
+        print(f"Execuções gravadas em: {arquivo_varredura}")
+        for m, n in tamanhos:
+            with trecho(rastreador, f"benchmark.{m}x{n}"):
+                resultado = executar_benchmark(m, n, num_repeticoes, familia=familia, usar_cache=usar_cache,
+                                               rastreador=rastreador, metricas=metricas,
+                                               isolar_memoria=isolar_memoria, varredura=varredura)
+            todos_resultados.append(resultado)
+        fechar_varredura(varredura)
     
     # Salvar resultados em JSON
     timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -333,6 +587,10 @@ if __name__ == "__main__":
     with open(nome_arquivo, 'w', encoding='utf-8') as f:
         json.dump(todos_resultados, f, indent=2, ensure_ascii=False)
     
+    if rastreador is not None:
+        exportar_chrome(rastreador, f"benchmark_python_{timestamp}_trace.json", 'simplex')
+        print(f"Linha do tempo salva em: benchmark_python_{timestamp}_trace.json")
+    
     print(f"\n{'='*60}")
     print(f"Resultados salvos em: {nome_arquivo}")
     print(f"{'='*60}")
@@ -344,7 +602,10 @@ if __name__ == "__main__":
     print(f"{'Tamanho':<12} {'Tempo Médio':<15} {'Iterações':<12} {'Memória (MB)'}")
     print("-"*60)
     for r in todos_resultados:
+        if 'tempo_medio' not in r['estatisticas']:
+            continue
+        memoria = r['estatisticas'].get('memoria_media')
         print(f"{r['tamanho']:<12} {r['estatisticas']['tempo_medio']:<15.4f} "
               f"{r['estatisticas']['iteracoes_media']:<12.0f} "
-              f"{r['estatisticas']['memoria_media']:.2f}")
+              f"{'-' if memoria is None else f'{memoria:.2f}'}")
     print("="*60)
\ No newline at end of file
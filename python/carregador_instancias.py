@@ -0,0 +1,243 @@
+"""
+Carregamento em fluxo (streaming) de instâncias do Problema de Transporte
+Lê matrizes de custos de CSV/JSON Lines em blocos de linhas, direto para
+um array pré-alocado ou para o formato binário (formato_instancia),
+com memória limitada ao tamanho do bloco.
+
+Formatos aceitos:
+    CSV denso:    uma linha por origem com os n custos (cabeçalho opcional)
+    CSV de arcos: origem,destino,custo (rede esparsa, índices a partir de 0)
+    JSON Lines:   1ª linha {"oferta": [...], "demanda": [...]}; demais linhas
+                  uma lista de custos por origem, ou {"origem", "destino", "custo"}
+    Vetores:      oferta/demanda como lista, array ou CSV de uma coluna/linha
+"""
+
+import io
+import os
+import csv
+import json
+import itertools
+import contextlib
+
+import numpy as np
+
+from formato_instancia import criar_arquivo_instancia, _para_int32
+
+LINHAS_POR_BLOCO = 256
+
+# ========================================
+# AUXILIARES
+# ========================================
+
+def _abrir(origem):
+    """Aceita caminho ou objeto de arquivo já aberto (que não é fechado aqui)"""
+    if isinstance(origem, (str, bytes)) or hasattr(origem, '__fspath__'):
+        return open(origem, 'r', encoding='utf-8', newline='')
+    return contextlib.nullcontext(origem)
+
+def _linhas_de_dados(arquivo):
+    """Itera as linhas não vazias, pulando o cabeçalho se não for numérico"""
+    primeira = True
+    for linha in arquivo:
+        if not linha.strip():
+            continue
+        if primeira:
+            primeira = False
+            try:
+                float(linha.split(',', 1)[0])
+            except ValueError:
+                continue
+        yield linha
+
+def _ler_bloco(linhas, tamanho_bloco, dtype):
+    """Converte até tamanho_bloco linhas CSV em um array 2D"""
+    bloco = list(itertools.islice(linhas, tamanho_bloco))
+    if not bloco:
+        return None
+    return np.loadtxt(io.StringIO(''.join(bloco)), delimiter=',', dtype=dtype, ndmin=2)
+
+def carregar_vetor(origem, dtype=np.int64):
+    """Lê oferta/demanda de lista, array ou CSV (uma coluna ou uma linha)"""
+    if not isinstance(origem, (str, bytes)) and not hasattr(origem, '__fspath__'):
+        return np.asarray(origem, dtype=dtype)
+    with _abrir(origem) as f:
+        texto = ''.join(_linhas_de_dados(f))
+    return np.loadtxt(io.StringIO(texto), delimiter=',', dtype=dtype, ndmin=2).ravel()
+
+def _linha_irregular(bloco, n):
+    """Índice (no bloco) e número de colunas da primeira linha sem n colunas, ou None"""
+    for k, linha in enumerate(bloco):
+        colunas = linha.count(',') + 1
+        if colunas != n:
+            return k, colunas
+    return None
+
+def _indices(valores, nome):
+    """Índices lidos como float convertidos para int64; recusa fracionários e negativos"""
+    if valores.size and (valores.min() < 0 or not np.all(valores == np.round(valores))):
+        raise ValueError(f"{nome} deve ter índices inteiros não negativos")
+    return valores.astype(np.int64)
+
+def _preencher_custos(linhas, destino, tamanho_bloco):
+    """Copia blocos de linhas CSV para as linhas consecutivas de destino
+
+    Os custos são lidos como float64 ("1.0" é aceito); um destino int32 (o
+    formato binário) recebe-os por _para_int32, que recusa valores
+    fracionários ou fora do intervalo.
+    """
+    m, n = destino.shape
+    i = 0
+    while True:
+        texto = list(itertools.islice(linhas, tamanho_bloco))
+        if not texto:
+            break
+        # Só no erro procura a linha culpada: o loadtxt indica a posição dentro do bloco
+        try:
+            bloco = np.loadtxt(io.StringIO(''.join(texto)), delimiter=',', dtype=np.float64, ndmin=2)
+        except ValueError:
+            if _linha_irregular(texto, n) is None:
+                raise
+            bloco = None
+        if bloco is None or bloco.shape[1] != n:
+            k, colunas = _linha_irregular(texto, n)
+            raise ValueError(f"Linha {i + k + 1} da matriz de custos tem {colunas} colunas (esperado {n})")
+        if i + len(bloco) > m:
+            raise ValueError(f"Matriz de custos tem mais de {m} linhas")
+        if destino.dtype.kind == 'i':
+            bloco = _para_int32(bloco, 'matriz de custos')
+        destino[i:i + len(bloco)] = bloco
+        i += len(bloco)
+    if i != m:
+        raise ValueError(f"Matriz de custos tem {i} linhas (esperado {m})")
+
+# ========================================
+# CSV DENSO
+# ========================================
+
+def carregar_csv(caminho_custos, oferta, demanda, dtype=np.float64,
+                 tamanho_bloco=LINHAS_POR_BLOCO):
+    """Lê a matriz de custos CSV em blocos para um array pré-alocado m × n"""
+    oferta = carregar_vetor(oferta)
+    demanda = carregar_vetor(demanda)
+    custos = np.empty((len(oferta), len(demanda)), dtype=dtype)
+
+    with _abrir(caminho_custos) as f:
+        _preencher_custos(_linhas_de_dados(f), custos, tamanho_bloco)
+
+    return oferta, demanda, custos
+
+def converter_csv_para_binario(caminho_custos, oferta, demanda, caminho_saida,
+                               dtype=np.int32, tamanho_bloco=LINHAS_POR_BLOCO):
+    """Converte o CSV direto para o formato binário, sem materializar a matriz em memória
+
+    Grava num arquivo temporário renomeado só no fim: um erro de leitura
+    não deixa um .bin parcial em caminho_saida.
+    """
+    # Lidos como float: _para_int32 recusa valores fracionários em vez de truncá-los
+    oferta = _para_int32(carregar_vetor(oferta, np.float64), 'oferta')
+    demanda = _para_int32(carregar_vetor(demanda, np.float64), 'demanda')
+    temporario = f"{caminho_saida}.{os.getpid()}.tmp"
+    try:
+        destino_oferta, destino_demanda, destino_custos = criar_arquivo_instancia(
+            temporario, len(oferta), len(demanda), dtype
+        )
+        destino_oferta[:] = oferta
+        destino_demanda[:] = demanda
+
+        with _abrir(caminho_custos) as f:
+            _preencher_custos(_linhas_de_dados(f), destino_custos, tamanho_bloco)
+
+        destino_custos.flush()
+        del destino_oferta, destino_demanda, destino_custos  # Fecha o memory-map antes de renomear
+        os.replace(temporario, caminho_saida)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporario)
+        raise
+
+# ========================================
+# CSV DE ARCOS (REDE ESPARSA)
+# ========================================
+
+def carregar_arcos_csv(caminho_arcos, tamanho_bloco=65536):
+    """Lê um edge-list origem,destino,custo em blocos; retorna arrays (origem, destino, custo)"""
+    blocos_origem, blocos_destino, blocos_custo = [], [], []
+
+    with _abrir(caminho_arcos) as f:
+        linhas = _linhas_de_dados(f)
+        while True:
+            bloco = _ler_bloco(linhas, tamanho_bloco, np.float64)
+            if bloco is None:
+                break
+            if bloco.shape[1] != 3:
+                raise ValueError("CSV de arcos deve ter as colunas origem,destino,custo")
+            blocos_origem.append(_indices(bloco[:, 0], 'origem'))
+            blocos_destino.append(_indices(bloco[:, 1], 'destino'))
+            blocos_custo.append(bloco[:, 2])
+
+    if not blocos_origem:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio.copy(), np.empty(0)
+
+    return (np.concatenate(blocos_origem),
+            np.concatenate(blocos_destino),
+            np.concatenate(blocos_custo))
+
+# ========================================
+# JSON LINES
+# ========================================
+
+def carregar_jsonl(caminho, dtype=np.float64, tamanho_bloco=65536):
+    """Lê uma instância JSON Lines (densa ou de arcos)
+
+    Retorna (oferta, demanda, custos) com custos m × n para o formato denso,
+    ou (oferta, demanda, (origem, destino, custo)) para o formato de arcos.
+    """
+    with _abrir(caminho) as f:
+        linhas = (linha for linha in f if linha.strip())
+        try:
+            cabecalho = json.loads(next(linhas))
+        except StopIteration:
+            raise ValueError(f"{caminho}: arquivo vazio")
+        oferta = np.asarray(cabecalho['oferta'], dtype=np.int64)
+        demanda = np.asarray(cabecalho['demanda'], dtype=np.int64)
+        m, n = len(oferta), len(demanda)
+
+        primeira = next(linhas, None)
+        if primeira is None:
+            raise ValueError(f"{caminho}: instância sem custos")
+        registro = json.loads(primeira)
+
+        registros = itertools.chain([registro], map(json.loads, linhas))
+
+        if isinstance(registro, dict):
+            # Arcos convertidos em blocos: memória Python limitada ao bloco
+            blocos = []
+            while True:
+                bloco = list(itertools.islice(registros, tamanho_bloco))
+                if not bloco:
+                    break
+                blocos.append(np.array([(r['origem'], r['destino'], r['custo']) for r in bloco],
+                                       dtype=np.float64))
+            arcos = np.concatenate(blocos)
+            return oferta, demanda, (_indices(arcos[:, 0], 'origem'),
+                                     _indices(arcos[:, 1], 'destino'),
+                                     arcos[:, 2].copy())
+
+        custos = np.empty((m, n), dtype=dtype)
+        for i, registro in enumerate(registros):
+            if i >= m:
+                raise ValueError(f"Matriz de custos tem mais de {m} linhas")
+            if len(registro) != n:
+                raise ValueError(f"Linha {i + 1} da matriz de custos tem {len(registro)} colunas (esperado {n})")
+            custos[i] = registro
+        if i + 1 != m:
+            raise ValueError(f"Matriz de custos tem {i + 1} linhas (esperado {m})")
+        return oferta, demanda, custos
+
+def escrever_csv(caminho, custos):
+    """Grava a matriz de custos em CSV, uma origem por linha"""
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        for linha in custos:
+            escritor.writerow(np.asarray(linha).tolist())
@@ -0,0 +1,153 @@
+"""
+Verificação do certificado de otimalidade de uma solução de transporte
+Dada a instância, a solução (valores) e os duais (u, v), confere com
+operações vetorizadas:
+
+- viabilidade primal: ofertas e demandas atendidas, 0 <= x <= capacidade;
+- viabilidade dual: custos reduzidos c_ij - u_i - v_j >= -tol (ou <= tol em
+  rotas na capacidade);
+- folgas complementares: rota com fluxo tem custo reduzido nulo;
+
+e devolve um relatório estruturado, sem imprimir nada. Substitui as somas
+em laço Python por origem e destino.
+"""
+
+import numpy as np
+
+from rede_esparsa import RedeEsparsa
+from balanceamento import CUSTO_FICTICIO, excesso_oferta, penalidades
+
+def _maximo(valores):
+    return float(np.max(valores, initial=0.0)) + 0.0  # sem -0.0 no relatório
+
+def _complementar(fluxo, reduzido, limite):
+    """Maior min(fluxo, custo reduzido) em rotas com os dois positivos (e o análogo no limite superior)"""
+    violacao = np.minimum(fluxo, reduzido)
+    if limite is not None:
+        violacao = np.maximum(violacao, np.minimum(limite - fluxo, -reduzido))
+    return _maximo(violacao)
+
+def verificar_solucao(oferta, demanda, custos, valores, u=None, v=None,
+                      custo_ficticio=CUSTO_FICTICIO, tolerancia=1e-6):
+    """Relatório de viabilidade primal, viabilidade dual e folgas complementares
+
+    custos é a matriz m × n (valores no layout i*n + j) ou uma RedeEsparsa
+    (um valor por arco, capacidades respeitadas). Num problema desbalanceado
+    a diferença vai para o nó fictício ao custo custo_ficticio, como nos
+    resolvedores. Os duais podem vir deslocados (u + s, v - s, como os
+    potenciais do Simplex de Rede): o deslocamento é fixado aqui pelo nó
+    fictício. Sem u e v, só a parte primal é verificada ('otimo' = None).
+
+    As tolerâncias são relativas: tolerancia × (1 + maior oferta/demanda)
+    para o primal e tolerancia × (1 + maior |custo|) para o dual.
+    """
+    oferta = np.asarray(oferta, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    valores = np.asarray(valores, dtype=np.float64)
+    m, n = len(oferta), len(demanda)
+
+    if isinstance(custos, RedeEsparsa):
+        custo = custos.custo
+        limite = None if custos.capacidade is None else np.asarray(custos.capacidade, dtype=np.float64)
+        enviado = np.bincount(custos.origem, weights=valores, minlength=m)
+        recebido = np.bincount(custos.destino, weights=valores, minlength=n)
+    else:
+        custo = np.asarray(custos, dtype=np.float64).ravel()
+        limite = None
+        matriz = valores.reshape(m, n)
+        enviado = matriz.sum(axis=1)
+        recebido = matriz.sum(axis=0)
+
+    escala_primal = 1.0 + max(_maximo(np.abs(oferta)), _maximo(np.abs(demanda)))
+    escala_dual = 1.0 + _maximo(np.abs(custo))
+    tol_primal = tolerancia * escala_primal
+    tol_dual = tolerancia * escala_dual
+
+    # Oferta não enviada ou demanda não atendida vai para o nó fictício
+    excesso = excesso_oferta(oferta, demanda)
+    folga_oferta = oferta - enviado
+    folga_demanda = demanda - recebido
+    if excesso > 0:
+        folga = folga_oferta
+        penalidade = penalidades(custo_ficticio, m)
+        violacao_oferta = _maximo(-folga_oferta)
+        violacao_demanda = _maximo(np.abs(folga_demanda))
+    elif excesso < 0:
+        folga = folga_demanda
+        penalidade = penalidades(custo_ficticio, n)
+        violacao_oferta = _maximo(np.abs(folga_oferta))
+        violacao_demanda = _maximo(-folga_demanda)
+    else:
+        folga = np.zeros(0)
+        penalidade = np.zeros(0)
+        violacao_oferta = _maximo(np.abs(folga_oferta))
+        violacao_demanda = _maximo(np.abs(folga_demanda))
+
+    violacao_limites = _maximo(-valores)
+    if limite is not None:
+        violacao_limites = max(violacao_limites, _maximo(valores - limite))
+
+    folga_positiva = np.maximum(folga, 0.0)
+    custo_primal = float(custo @ valores + penalidade @ folga_positiva)
+    viavel_primal = max(violacao_oferta, violacao_demanda, violacao_limites) <= tol_primal
+
+    relatorio = {
+        'valido': viavel_primal,
+        'viavel_primal': viavel_primal,
+        'otimo': None,
+        'custo_primal': custo_primal,
+        'custo_dual': None,
+        'gap': None,
+        'violacao_oferta': violacao_oferta,
+        'violacao_demanda': violacao_demanda,
+        'violacao_limites': violacao_limites,
+        'violacao_dual': None,
+        'violacao_complementar': None,
+    }
+    if u is None or v is None:
+        return relatorio
+
+    u = np.asarray(u, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+
+    # Deslocamento dos duais: o maior que mantém viáveis os arcos do nó fictício
+    if excesso > 0:
+        deslocamento = float(np.min(penalidade - u))
+        u, v = u + deslocamento, v - deslocamento
+        reduzido_folga = penalidade - u
+    elif excesso < 0:
+        deslocamento = float(np.min(penalidade - v))
+        u, v = u - deslocamento, v + deslocamento
+        reduzido_folga = penalidade - v
+    else:
+        reduzido_folga = np.zeros(0)
+
+    if isinstance(custos, RedeEsparsa):
+        reduzido = custo - u[custos.origem] - v[custos.destino]
+    else:
+        reduzido = (custo.reshape(m, n) - u[:, None] - v[None, :]).ravel()
+
+    # Rotas na capacidade podem ter custo reduzido negativo
+    negativo = -reduzido
+    if limite is not None:
+        negativo = np.where(valores >= limite - tol_primal, 0.0, negativo)
+    violacao_dual = max(_maximo(negativo), _maximo(-reduzido_folga))
+    violacao_complementar = max(_complementar(valores, reduzido, limite),
+                                _complementar(folga_positiva, reduzido_folga, None))
+
+    custo_dual = float(oferta @ u + demanda @ v)
+    if limite is not None:
+        finitos = np.isfinite(limite)
+        custo_dual += float(limite[finitos] @ np.minimum(reduzido[finitos], 0.0))
+    gap = custo_primal - custo_dual
+
+    otimo = violacao_dual <= tol_dual and violacao_complementar <= tol_dual * escala_primal
+    relatorio.update({
+        'valido': viavel_primal and otimo,
+        'otimo': otimo,
+        'custo_dual': custo_dual,
+        'gap': gap,
+        'violacao_dual': violacao_dual,
+        'violacao_complementar': violacao_complementar,
+    })
+    return relatorio
@@ -0,0 +1,175 @@
+"""
+Detecção de regressões entre duas execuções de benchmark
+Compara um JSON de referência (baseline) com um JSON novo, no formato de
+benchmark_simplex.py, benchmark_bibliotecas_python.py ou do benchmark em C,
+casando os resultados por tamanho e motor. Para tempo e memória de cada par:
+
+- variação relativa da mediana das execuções (novo / referência - 1);
+- teste de Mann-Whitney unilateral (scipy) nas execuções individuais:
+  p pequeno indica que o novo é de fato maior, e não ruído.
+
+Um par é regressão quando a variação passa do limiar E o teste é
+significativo. Sem execuções individuais (JSON só com estatísticas), só
+o limiar é aplicado. Uso:
+
+    python comparar_benchmarks.py referencia.json novo.json [--limiar=0.10]
+        [--limiar-memoria=0.10] [--alfa=0.05]
+
+Código de saída: 0 sem regressões, 1 com regressões, 2 erro de uso.
+"""
+
+import sys
+import json
+import statistics
+
+from scipy.stats import mannwhitneyu
+
+LIMIAR_TEMPO = 0.10
+LIMIAR_MEMORIA = 0.10
+ALFA = 0.05
+
+# Métrica → (campo de cada execução, campo das estatísticas)
+METRICAS = {
+    'tempo': ('tempo_total', 'tempo_mediano'),
+    'memoria': ('memoria_mb', 'memoria_media'),
+}
+
+# ========================================
+# CARREGAMENTO
+# ========================================
+
+def carregar_resultados(caminho):
+    """Lê o JSON de um benchmark; retorna {(tamanho, motor): resultado} ou None"""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError) as erro:
+        print(f"Erro ao ler {caminho}: {erro}")
+        return None
+
+    resultados = {}
+    for resultado in dados:
+        if 'bibliotecas' in resultado:
+            for motor, dados_motor in resultado['bibliotecas'].items():
+                resultados[resultado['tamanho'], motor] = dados_motor
+        else:
+            # benchmark_simplex.py e o benchmark em C: um único motor
+            resultados[resultado['tamanho'], 'simplex'] = resultado
+    return resultados
+
+def amostras(resultado, metrica):
+    """Valores da métrica nas execuções bem-sucedidas (lista possivelmente vazia)"""
+    campo = METRICAS[metrica][0]
+    return [e[campo] for e in resultado.get('execucoes', [])
+            if e.get('sucesso', True) and e.get(campo) is not None]
+
+def valor_central(resultado, metrica):
+    """Mediana das execuções ou, sem elas, o valor das estatísticas (None se ausente)"""
+    valores = amostras(resultado, metrica)
+    if valores:
+        return statistics.median(valores)
+    estatisticas = resultado.get('estatisticas', {})
+    campo = METRICAS[metrica][1]
+    return estatisticas.get(campo, estatisticas.get(campo.replace('mediano', 'medio')))
+
+# ========================================
+# COMPARAÇÃO
+# ========================================
+
+def comparar_metrica(referencia, novo, metrica, limiar, alfa):
+    """Compara uma métrica de um par; retorna dict ou None se faltar em algum lado"""
+    base, atual = valor_central(referencia, metrica), valor_central(novo, metrica)
+    if base is None or atual is None:
+        return None
+    variacao = atual / base - 1 if base > 0 else (0.0 if atual == base else float('inf'))
+
+    amostras_base, amostras_novo = amostras(referencia, metrica), amostras(novo, metrica)
+    valor_p = None
+    if len(amostras_base) >= 2 and len(amostras_novo) >= 2:
+        if len(set(amostras_base + amostras_novo)) > 1:
+            valor_p = float(mannwhitneyu(amostras_novo, amostras_base, alternative='greater').pvalue)
+        else:
+            valor_p = 1.0
+    significativo = valor_p is None or valor_p < alfa
+    return {
+        'referencia': base,
+        'novo': atual,
+        'variacao': variacao,
+        'valor_p': valor_p,
+        'regressao': variacao > limiar and significativo,
+        'melhora': variacao < -limiar and (valor_p is None or valor_p > 1 - alfa),
+    }
+
+def comparar_resultados(referencia, novo, limiar_tempo=LIMIAR_TEMPO, limiar_memoria=LIMIAR_MEMORIA, alfa=ALFA):
+    """Compara os pares (tamanho, motor) presentes nos dois lados
+
+    Retorna (linhas, ausentes): uma linha por par com a comparação de cada
+    métrica, e as chaves que só existem em um dos lados.
+    """
+    limiares = {'tempo': limiar_tempo, 'memoria': limiar_memoria}
+    linhas = []
+    for chave in referencia:
+        if chave not in novo:
+            continue
+        linha = {'tamanho': chave[0], 'motor': chave[1]}
+        for metrica, limiar in limiares.items():
+            linha[metrica] = comparar_metrica(referencia[chave], novo[chave], metrica, limiar, alfa)
+        linhas.append(linha)
+    ausentes = sorted(set(referencia) ^ set(novo))
+    return linhas, ausentes
+
+def contar_regressoes(linhas):
+    """Número de métricas com regressão em todas as linhas"""
+    return sum(linha[metrica] is not None and linha[metrica]['regressao']
+               for linha in linhas for metrica in METRICAS)
+
+# ========================================
+# RELATÓRIO
+# ========================================
+
+def _celula(comparacao, unidade):
+    if comparacao is None:
+        return '-'
+    marca = ' ✗' if comparacao['regressao'] else (' ✓' if comparacao['melhora'] else '')
+    p = '' if comparacao['valor_p'] is None else f" p={comparacao['valor_p']:.3f}"
+    return (f"{comparacao['referencia']:.4g}→{comparacao['novo']:.4g}{unidade} "
+            f"({comparacao['variacao']:+.1%}{p}){marca}")
+
+def imprimir_tabela(linhas, ausentes):
+    print(f"{'Tamanho':<10} {'Motor':<14} {'Tempo (mediana)':<38} {'Memória'}")
+    print("-"*100)
+    for linha in linhas:
+        print(f"{linha['tamanho']:<10} {linha['motor']:<14} "
+              f"{_celula(linha['tempo'], 's'):<38} {_celula(linha['memoria'], 'MB')}")
+    for tamanho, motor in ausentes:
+        print(f"{tamanho:<10} {motor:<14} presente em apenas um dos arquivos")
+
+if __name__ == "__main__":
+    argumentos = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    opcoes = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    if len(argumentos) != 2:
+        print(__doc__)
+        sys.exit(2)
+
+    referencia = carregar_resultados(argumentos[0])
+    novo = carregar_resultados(argumentos[1])
+    if referencia is None or novo is None:
+        sys.exit(2)
+
+    limiar_tempo = float(opcoes.get('limiar', LIMIAR_TEMPO))
+    limiar_memoria = float(opcoes.get('limiar-memoria', LIMIAR_MEMORIA))
+    alfa = float(opcoes.get('alfa', ALFA))
+
+    linhas, ausentes = comparar_resultados(referencia, novo, limiar_tempo, limiar_memoria, alfa)
+    if not linhas:
+        print("Nenhum par (tamanho, motor) em comum entre os arquivos")
+        sys.exit(2)
+
+    print(f"Referência: {argumentos[0]}")
+    print(f"Novo:       {argumentos[1]}")
+    print(f"Limiares: tempo {limiar_tempo:+.0%}, memória {limiar_memoria:+.0%}; α = {alfa}\n")
+    imprimir_tabela(linhas, ausentes)
+
+    regressoes = contar_regressoes(linhas)
+    print(f"\n{regressoes} regressão(ões) em {len(linhas)} pares comparados")
+    sys.exit(1 if regressoes else 0)
@@ -0,0 +1,250 @@
+"""
+Decomposição do Problema de Transporte em componentes conexas
+Com rotas restritas a rede costuma se partir em grupos independentes de
+origens e destinos. Cada componente (balanceada) é resolvida isoladamente
+pelo Simplex de Rede, em paralelo num pool de processos, e as soluções são
+reunidas no layout global de 'valores'.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:
+    connected_components = None
+
+from rede_esparsa import arcos_do_problema, nos_sem_arcos
+from simplex_rede import simplex_rede
+from balanceamento import CUSTO_FICTICIO, excesso_oferta, arcos_ficticios, folgas_do_fluxo, penalidades
+
+# Componentes com menos arcos que isso são resolvidas no processo principal
+MIN_ARCOS_PARALELO = 20000
+
+# ========================================
+# COMPONENTES CONEXAS
+# ========================================
+
+def _rotular_componentes(num_nos, u, v):
+    """Rótulo de componente por propagação do menor índice com salto de ponteiros"""
+    rotulo = np.arange(num_nos)
+    while True:
+        menor = np.minimum(rotulo[u], rotulo[v])
+        novo = rotulo.copy()
+        np.minimum.at(novo, u, menor)
+        np.minimum.at(novo, v, menor)
+        novo = novo[novo]
+        if np.array_equal(novo, rotulo):
+            break
+        rotulo = novo
+    return np.unique(rotulo, return_inverse=True)[1]
+
+def componentes_conexas(rede):
+    """Rótulo (0..k-1) de cada nó: origens em [0, m), destinos em [m, m + n)"""
+    num_nos = rede.m + rede.n
+    u = rede.origem
+    v = rede.m + rede.destino
+
+    if connected_components is not None:
+        grafo = coo_matrix((np.ones(len(u), dtype=np.int8), (u, v)), shape=(num_nos, num_nos))
+        return connected_components(grafo, directed=False)[1]
+    return _rotular_componentes(num_nos, u, v)
+
+def decompor_problema(oferta, demanda, rede, tolerancia=1e-6):
+    """Separa o problema em componentes conexas
+
+    Retorna (componentes, desbalanceadas): cada componente é um dict com os
+    índices globais de origens, destinos e arcos e o saldo (oferta - demanda);
+    desbalanceadas lista as componentes que o nó fictício não consegue
+    equilibrar (saldo de sinal oposto ao excesso global: problema inviável).
+    Nós isolados sem oferta nem demanda são descartados.
+    """
+    m = rede.m
+    suprimento = np.concatenate([np.asarray(oferta, dtype=np.float64),
+                                 -np.asarray(demanda, dtype=np.float64)])
+    rotulo = componentes_conexas(rede)
+    num_componentes = int(rotulo.max()) + 1 if len(rotulo) else 0
+
+    # Agrupa nós e arcos por componente com uma única ordenação de cada
+    ordem_nos = np.argsort(rotulo, kind='stable')
+    cortes_nos = np.searchsorted(rotulo[ordem_nos], np.arange(1, num_componentes))
+    rotulo_arco = rotulo[rede.origem]
+    ordem_arcos = np.argsort(rotulo_arco, kind='stable')
+    cortes_arcos = np.searchsorted(rotulo_arco[ordem_arcos], np.arange(1, num_componentes))
+
+    saldo = np.bincount(rotulo, weights=suprimento, minlength=num_componentes)
+    saldo[np.abs(saldo) <= tolerancia] = 0.0
+
+    # O nó fictício absorve sobras (excesso > 0) ou cobre faltas (excesso < 0), nunca os dois
+    excesso = excesso_oferta(oferta, demanda, tolerancia)
+
+    componentes = []
+    desbalanceadas = []
+    for c, (nos, arcos) in enumerate(zip(np.split(ordem_nos, cortes_nos),
+                                         np.split(ordem_arcos, cortes_arcos))):
+        if len(arcos) == 0 and not np.any(suprimento[nos]):
+            continue
+        componente = {
+            'origens': nos[nos < m],
+            'destinos': nos[nos >= m] - m,
+            'arcos': arcos,
+            'saldo': float(saldo[c]),
+        }
+        if saldo[c] * excesso < 0 or (saldo[c] and not excesso):
+            desbalanceadas.append(componente)
+        else:
+            componentes.append(componente)
+
+    return componentes, desbalanceadas
+
+# ========================================
+# RESOLUÇÃO POR COMPONENTE
+# ========================================
+
+def _resolver_componente(oferta, demanda, origem, destino, custo, capacidade, custo_ficticio, opcoes):
+    """Resolve uma componente já reindexada localmente (executa nos processos do pool)
+
+    Uma componente desbalanceada recebe seu próprio nó fictício; o fluxo dos
+    arcos fictícios vem depois do fluxo dos arcos reais.
+    """
+    m, n = len(oferta), len(demanda)
+    suprimento = np.concatenate([oferta, -demanda])
+    destino = m + destino
+    excesso = excesso_oferta(oferta, demanda)
+    if excesso:
+        suprimento_ficticio, cauda_ficticia, cabeca_ficticia, custo_extra = \
+            arcos_ficticios(m, n, excesso, custo_ficticio)
+        suprimento = np.append(suprimento, suprimento_ficticio)
+        origem = np.concatenate([origem, cauda_ficticia])
+        destino = np.concatenate([destino, cabeca_ficticia])
+        custo = np.concatenate([custo, custo_extra])
+        if capacidade is not None:
+            capacidade = np.concatenate([capacidade, np.full(len(cauda_ficticia), np.inf)])
+    return simplex_rede(suprimento, origem, destino, custo, capacidade=capacidade, **opcoes)
+
+def _subproblema(componente, oferta, demanda, rede, custo_ficticio, excesso):
+    """Argumentos de _resolver_componente com origens/destinos renumerados a partir de 0"""
+    origens, destinos, arcos = componente['origens'], componente['destinos'], componente['arcos']
+    local_origem = np.searchsorted(origens, rede.origem[arcos])
+    local_destino = np.searchsorted(destinos, rede.destino[arcos])
+    capacidade = None if rede.capacidade is None else rede.capacidade[arcos]
+    penalidade = custo_ficticio[origens] if excesso > 0 else custo_ficticio[destinos]
+    return (oferta[origens], demanda[destinos], local_origem, local_destino, rede.custo[arcos],
+            capacidade, penalidade)
+
+def _potenciais_globais(componente, potenciais, excesso, custo_ficticio):
+    """Potenciais da componente na escala global, com o nó fictício em zero
+
+    Cada componente é resolvida com seu próprio deslocamento de potenciais.
+    Nas desbalanceadas, o nó fictício local passa a zero; nas balanceadas,
+    que não usam o fictício, o deslocamento é o que deixa os arcos até ele
+    com custo reduzido >= 0. Assim os potenciais reunidos são duais do
+    problema inteiro.
+    """
+    num_origens = len(componente['origens'])
+    num_nos = num_origens + len(componente['destinos'])
+    local = potenciais[:num_nos]
+    if componente['saldo']:
+        return local - potenciais[num_nos]
+    if excesso > 0 and num_origens:
+        return local + np.max(-custo_ficticio[componente['origens']] - local[:num_origens])
+    if excesso < 0 and num_nos > num_origens:
+        return local + np.min(custo_ficticio[componente['destinos']] - local[num_origens:])
+    return local
+
+def resolver_decomposto(oferta, demanda, custos, processos=None,
+                        min_arcos_paralelo=MIN_ARCOS_PARALELO, custo_ficticio=CUSTO_FICTICIO, **opcoes):
+    """Resolve o problema de transporte componente a componente
+
+    custos pode ser a matriz m × n ou uma RedeEsparsa; 'valores' (e as folgas
+    de um problema desbalanceado) seguem o mesmo layout de
+    resolver_transporte_rede. Componentes com pelo menos min_arcos_paralelo
+    arcos vão para um pool de processos (processos=1 resolve tudo no processo
+    principal).
+    """
+    oferta = np.asarray(oferta, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    m, n = len(oferta), len(demanda)
+
+    rede = arcos_do_problema(oferta, demanda, custos)
+    excesso = excesso_oferta(oferta, demanda)
+    custo_ficticio = penalidades(custo_ficticio, m if excesso > 0 else n)
+
+    # Nós sem arcos só são aceitos se o nó fictício puder atendê-los
+    origens, destinos = nos_sem_arcos(rede, oferta, demanda)
+    if excesso > 0:
+        origens = origens[:0]
+    elif excesso < 0:
+        destinos = destinos[:0]
+    componentes, desbalanceadas = decompor_problema(oferta, demanda, rede)
+    if len(origens) or len(destinos) or desbalanceadas:
+        return {
+            'status': 'inviavel',
+            'origens_sem_arcos': origens.tolist(),
+            'destinos_sem_arcos': destinos.tolist(),
+            'componentes_desbalanceadas': [{'origens': c['origens'].tolist(),
+                                            'destinos': c['destinos'].tolist(),
+                                            'saldo': c['saldo']} for c in desbalanceadas],
+            'valores': None,
+            'custo_total': None,
+            'iteracoes': 0,
+        }
+
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    # Blocos de pricing do tamanho usado no problema inteiro: com o padrão
+    # sqrt(arcos da componente) os blocos ficam pequenos e o total de pivôs cresce
+    opcoes.setdefault('tamanho_bloco', max(int(math.sqrt(rede.num_arcos)), 10))
+
+    grandes = [c for c in componentes if len(c['arcos']) >= min_arcos_paralelo]
+    pequenas = [c for c in componentes if len(c['arcos']) < min_arcos_paralelo]
+
+    def argumentos(componente):
+        return _subproblema(componente, oferta, demanda, rede, custo_ficticio, excesso) + (opcoes,)
+
+    resultados = []
+    if processos > 1 and len(grandes) > 1:
+        with ProcessPoolExecutor(max_workers=min(processos, len(grandes))) as pool:
+            futuros = [pool.submit(_resolver_componente, *argumentos(c)) for c in grandes]
+            # As componentes pequenas são resolvidas enquanto o pool trabalha
+            resultados_pequenas = [_resolver_componente(*argumentos(c)) for c in pequenas]
+            resultados = [f.result() for f in futuros] + resultados_pequenas
+        componentes = grandes + pequenas
+    else:
+        resultados = [_resolver_componente(*argumentos(c)) for c in componentes]
+
+    # Junta as soluções no layout global
+    valores = np.zeros(rede.num_arcos)
+    potenciais = np.zeros(m + n)
+    folgas = np.zeros(m if excesso > 0 else n)
+    status = 'otimo'
+    iteracoes = 0
+    for componente, resultado in zip(componentes, resultados):
+        arcos = componente['arcos']
+        valores[arcos] = resultado['fluxo'][:len(arcos)]
+        if componente['saldo']:
+            nos_ficticios = componente['origens'] if excesso > 0 else componente['destinos']
+            folgas[nos_ficticios] = resultado['fluxo'][len(arcos):]
+        nos = np.concatenate([componente['origens'], m + componente['destinos']])
+        potenciais[nos] = _potenciais_globais(componente, resultado['potenciais'], excesso,
+                                             custo_ficticio)
+        iteracoes += resultado['iteracoes']
+        if resultado['status'] != 'otimo' and status == 'otimo':
+            status = resultado['status']
+
+    resultado = {
+        'status': status,
+        'valores': valores,
+        'custo_total': float(rede.custo @ valores + custo_ficticio @ folgas),
+        'potenciais': potenciais,
+        'iteracoes': iteracoes,
+        'componentes': len(componentes),
+    }
+    if excesso:
+        resultado.update(folgas_do_fluxo(excesso, folgas))
+    return resultado
@@ -0,0 +1,121 @@
+"""
+Execução com limite de tempo e de memória num processo de trabalho
+Cada chamada roda num processo novo (multiprocessing 'spawn'), que pode ser
+morto ao estourar o tempo sem travar a varredura, e cujo espaço de
+endereçamento é limitado com resource.setrlimit(RLIMIT_AS): uma explosão de
+memória vira MemoryError no filho em vez de derrubar a máquina.
+
+O limite de memória é somado ao espaço já ocupado pelo interpretador e
+pelos imports no filho, para valer só para o que a função aloca. No
+Windows (sem o módulo resource) só o limite de tempo é aplicado; no macOS
+o RLIMIT_AS não é respeitado pelo sistema.
+
+executar_com_limites levanta exceções distintas, para que o chamador
+registre cada desfecho com seu status:
+
+- TimeoutError: tempo esgotado (o processo é morto);
+- MemoryError: limite de memória atingido, ou filho morto por SIGKILL
+  (o OOM killer do Linux);
+- RuntimeError: exceção na função ou término anormal do filho.
+"""
+
+import os
+import sys
+import time
+import signal
+import multiprocessing
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: sem limite de memória
+
+import psutil
+
+# ========================================
+# PROCESSO FILHO
+# ========================================
+
+def _limitar_memoria(limite_mb):
+    """Limita o espaço de endereçamento ao atual + limite_mb; False se não for possível
+
+    Só o limite flexível muda: _liberar_memoria pode devolvê-lo ao rígido.
+    """
+    if resource is None:
+        return False
+    atual = psutil.Process(os.getpid()).memory_info().vms
+    _, maximo = resource.getrlimit(resource.RLIMIT_AS)
+    limite = atual + int(limite_mb * 1024 * 1024)
+    if maximo != resource.RLIM_INFINITY:
+        limite = min(limite, maximo)
+    resource.setrlimit(resource.RLIMIT_AS, (limite, maximo))
+    return True
+
+def _liberar_memoria():
+    """Remove o limite flexível, para o filho conseguir responder depois de um MemoryError"""
+    if resource is not None:
+        _, maximo = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (maximo, maximo))
+
+def _filho(conexao):
+    """Recebe (funcao, argumentos, limite_mb), avisa que começou e devolve (status, resultado, medidas)"""
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        funcao, argumentos, limite_mb = conexao.recv()
+        if limite_mb is not None:
+            _limitar_memoria(limite_mb)
+        processo = psutil.Process(os.getpid())
+        rss_antes = processo.memory_info().rss
+        conexao.send('iniciado')
+        inicio = time.perf_counter()
+        resultado = funcao(*argumentos)
+        tempo = time.perf_counter() - inicio
+        memoria = max(0, processo.memory_info().rss - rss_antes) / (1024 * 1024)
+        conexao.send(('ok', resultado, {'tempo': tempo, 'memoria_mb': memoria}))
+    except MemoryError:
+        _liberar_memoria()
+        conexao.send(('memoria', 'MemoryError', None))
+    except Exception as erro:
+        conexao.send(('erro', repr(erro), None))
+    finally:
+        conexao.close()
+
+# ========================================
+# COORDENADOR
+# ========================================
+
+def executar_com_limites(funcao, argumentos=(), tempo_limite=None, limite_memoria_mb=None):
+    """Executa funcao(*argumentos) num processo novo; retorna (resultado, medidas)
+
+    funcao deve ser de nível de módulo (é enviada por pickle). O tempo
+    limite (segundos) conta a partir do início da função, depois de o
+    filho importar os módulos e receber os argumentos. medidas tem tempo
+    (segundos, medido no filho) e memoria_mb (aumento do RSS do filho).
+    """
+    contexto = multiprocessing.get_context('spawn')
+    local, remoto = contexto.Pipe()
+    processo = contexto.Process(target=_filho, args=(remoto,), daemon=True)
+    processo.start()
+    remoto.close()
+    try:
+        local.send((funcao, argumentos, limite_memoria_mb))
+        mensagem = local.recv()
+        if mensagem == 'iniciado':
+            if not local.poll(tempo_limite):
+                processo.kill()
+                raise TimeoutError(f"tempo limite de {tempo_limite}s esgotado")
+            mensagem = local.recv()
+        status, resultado, medidas = mensagem
+    except EOFError:
+        processo.join()
+        if processo.exitcode == -getattr(signal, 'SIGKILL', 9):
+            raise MemoryError("processo morto por SIGKILL (falta de memória)") from None
+        raise RuntimeError(f"processo terminou com código {processo.exitcode}") from None
+    finally:
+        local.close()
+        processo.join()
+    if status == 'memoria':
+        raise MemoryError(f"limite de memória de {limite_memoria_mb} MB atingido")
+    if status == 'erro':
+        raise RuntimeError(resultado)
+    return resultado, medidas
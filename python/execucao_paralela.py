@@ -0,0 +1,126 @@
+"""
+Execução paralela de repetições independentes com um núcleo por processo
+Um pool de processos (multiprocessing 'spawn') em que cada trabalhador é
+fixado num núcleo próprio (os.sched_setaffinity no Linux, psutil nos
+demais sistemas que o suportam) e usa um número limitado de threads de
+BLAS/OpenMP (1 por padrão). Assim uma repetição não disputa núcleo nem
+threads com as outras, e os tempos continuam comparáveis aos de uma
+execução serial, enquanto a varredura termina N vezes mais rápido.
+
+As variáveis de ambiente de BLAS precisam estar definidas antes de o
+NumPy ser importado: por isso são postas no ambiente herdado pelos
+trabalhadores ao criar o pool. Com threadpoolctl instalado, o limite é
+reaplicado também em tempo de execução.
+"""
+
+import os
+import itertools
+import multiprocessing
+
+import psutil
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+VARIAVEIS_BLAS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                  'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+_limite_threads = None  # Mantém o threadpool_limits do trabalhador ativo
+_nucleo = None
+
+# ========================================
+# NÚCLEOS
+# ========================================
+
+def nucleos_disponiveis():
+    """Núcleos em que este processo pode rodar, em ordem"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    try:
+        return sorted(psutil.Process(os.getpid()).cpu_affinity())
+    except (AttributeError, psutil.Error):
+        return list(range(os.cpu_count() or 1))
+
+def _fixar_nucleo(nucleo):
+    """Fixa o processo atual em um núcleo; False se o sistema não permite"""
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, {nucleo})
+        else:
+            psutil.Process(os.getpid()).cpu_affinity([nucleo])
+        return True
+    except (AttributeError, OSError, psutil.Error):
+        return False
+
+# ========================================
+# TRABALHADORES
+# ========================================
+
+def nucleo_atual():
+    """Núcleo em que o trabalhador foi fixado (None fora do pool ou se não foi possível fixar)"""
+    return _nucleo
+
+def _inicializar_trabalhador(fila_nucleos, threads_blas):
+    global _limite_threads, _nucleo
+    nucleo = fila_nucleos.get()
+    if _fixar_nucleo(nucleo):
+        _nucleo = nucleo
+    if threadpool_limits is not None:
+        _limite_threads = threadpool_limits(limits=threads_blas)
+
+def _executar_indexado(tarefa):
+    indice, funcao, argumentos = tarefa
+    return indice, funcao(*argumentos)
+
+def criar_pool(num_trabalhadores=None, threads_blas=1):
+    """Pool com um trabalhador por núcleo (ou num_trabalhadores), cada um fixado no seu
+
+    Com mais trabalhadores que núcleos, os núcleos são repetidos em rodízio
+    (e as repetições passam a disputar CPU).
+    """
+    nucleos = nucleos_disponiveis()
+    num_trabalhadores = num_trabalhadores or len(nucleos)
+    if num_trabalhadores > len(nucleos):
+        print(f"Aviso: {num_trabalhadores} trabalhadores para {len(nucleos)} núcleos; tempos não comparáveis")
+
+    contexto = multiprocessing.get_context('spawn')
+    fila_nucleos = contexto.Queue()
+    for nucleo in itertools.islice(itertools.cycle(nucleos), num_trabalhadores):
+        fila_nucleos.put(nucleo)
+
+    # Os trabalhadores herdam o ambiente na criação, antes de importar o NumPy
+    anteriores = {variavel: os.environ.get(variavel) for variavel in VARIAVEIS_BLAS}
+    os.environ.update({variavel: str(threads_blas) for variavel in VARIAVEIS_BLAS})
+    try:
+        return contexto.Pool(num_trabalhadores, _inicializar_trabalhador, (fila_nucleos, threads_blas))
+    finally:
+        for variavel, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(variavel, None)
+            else:
+                os.environ[variavel] = valor
+
+def mapear_paralelo(funcao, lista_argumentos, num_trabalhadores=None, threads_blas=1, callback=None):
+    """Executa funcao(*argumentos) para cada item no pool; resultados na ordem de lista_argumentos
+
+    funcao deve ser de nível de módulo (é enviada por pickle).
+    callback(indice, resultado), se dado, é chamado no processo principal
+    à medida que cada tarefa termina (em qualquer ordem).
+    """
+    lista_argumentos = list(lista_argumentos)
+    resultados = [None] * len(lista_argumentos)
+    if not lista_argumentos:
+        return resultados
+    pool = criar_pool(min(num_trabalhadores or len(nucleos_disponiveis()), len(lista_argumentos)), threads_blas)
+    try:
+        tarefas = ((indice, funcao, argumentos) for indice, argumentos in enumerate(lista_argumentos))
+        for indice, resultado in pool.imap_unordered(_executar_indexado, tarefas):
+            resultados[indice] = resultado
+            if callback is not None:
+                callback(indice, resultado)
+    finally:
+        pool.close()
+        pool.join()
+    return resultados
@@ -0,0 +1,172 @@
+"""
+Formato binário compacto para instâncias do Problema de Transporte
+e cache em disco endereçado pelo conteúdo dos parâmetros do gerador.
+
+Layout do arquivo (little-endian):
+    cabeçalho (32 bytes): magic 'TRNS', versão (uint16), tipo dos custos (uint16),
+                          m (uint64), n (uint64), reservado (8 bytes)
+    oferta:  int32[m]
+    demanda: int32[n]
+    (preenchimento até múltiplo de 8 bytes)
+    custos:  tipo[m × n], ordem por linhas (origem i, destino j)
+
+A leitura usa memory-map: oferta, demanda e custos são views NumPy sobre
+o arquivo, sem cópia.
+
+A chave do cache inclui um hash do arquivo-fonte do gerador: mudar o
+gerador invalida as instâncias antigas em vez de continuar servindo-as.
+"""
+
+import os
+import json
+import struct
+import hashlib
+
+import numpy as np
+
+MAGIC = b'TRNS'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sHHQQ8x')
+
+TIPOS_CUSTO = {
+    1: np.dtype('<i4'),
+    2: np.dtype('<f4'),
+    3: np.dtype('<f8'),
+}
+CODIGOS_CUSTO = {tipo: codigo for codigo, tipo in TIPOS_CUSTO.items()}
+
+DIRETORIO_CACHE = os.environ.get('CACHE_INSTANCIAS', 'cache_instancias')
+
+# ========================================
+# LAYOUT
+# ========================================
+
+def _deslocamentos(m, n, tipo_custo):
+    """Retorna (offset_oferta, offset_demanda, offset_custos, tamanho_total)"""
+    offset_oferta = CABECALHO.size
+    offset_demanda = offset_oferta + 4 * m
+    offset_custos = offset_demanda + 4 * n
+    offset_custos += -offset_custos % 8  # Alinhamento dos custos
+    tamanho = offset_custos + m * n * tipo_custo.itemsize
+    return offset_oferta, offset_demanda, offset_custos, tamanho
+
+def _tipo_custo(custos):
+    """Escolhe int32 para custos inteiros que cabem, senão float64"""
+    custos = np.asarray(custos)
+    if custos.dtype.kind in 'iub':
+        info = np.iinfo(np.int32)
+        if custos.size == 0 or (custos.min() >= info.min and custos.max() <= info.max):
+            return TIPOS_CUSTO[1]
+    if custos.dtype == np.float32:
+        return TIPOS_CUSTO[2]
+    return TIPOS_CUSTO[3]
+
+def _para_int32(valores, nome):
+    valores = np.asarray(valores)
+    info = np.iinfo(np.int32)
+    if valores.size and (valores.min() < info.min or valores.max() > info.max):
+        raise ValueError(f"{nome} não cabe em int32")
+    if valores.dtype.kind == 'f' and not np.all(valores == np.round(valores)):
+        raise ValueError(f"{nome} deve ser inteira no formato binário")
+    return valores.astype('<i4')
+
+# ========================================
+# ESCRITA E LEITURA
+# ========================================
+
+def criar_arquivo_instancia(caminho, m, n, tipo_custo=np.int32):
+    """Cria o arquivo e retorna views graváveis (oferta, demanda, custos) para preenchimento"""
+    tipo_custo = np.dtype(tipo_custo).newbyteorder('<')
+    if tipo_custo not in CODIGOS_CUSTO:
+        raise ValueError(f"Tipo de custo não suportado: {tipo_custo}")
+
+    off_oferta, off_demanda, off_custos, tamanho = _deslocamentos(m, n, tipo_custo)
+
+    with open(caminho, 'wb') as f:
+        f.write(CABECALHO.pack(MAGIC, VERSAO, CODIGOS_CUSTO[tipo_custo], m, n))
+        f.truncate(tamanho)
+
+    dados = np.memmap(caminho, dtype=np.uint8, mode='r+')
+    oferta = dados[off_oferta:off_demanda].view('<i4')
+    demanda = dados[off_demanda:off_demanda + 4 * n].view('<i4')
+    custos = dados[off_custos:tamanho].view(tipo_custo).reshape(m, n)
+    return oferta, demanda, custos
+
+def salvar_instancia(caminho, oferta, demanda, custos):
+    """Grava uma instância completa no formato binário"""
+    m, n = len(oferta), len(demanda)
+    custos = np.asarray(custos)
+    destino_oferta, destino_demanda, destino_custos = criar_arquivo_instancia(
+        caminho, m, n, _tipo_custo(custos)
+    )
+    destino_oferta[:] = _para_int32(oferta, 'oferta')
+    destino_demanda[:] = _para_int32(demanda, 'demanda')
+    destino_custos[:] = custos.reshape(m, n)
+    destino_custos.flush()
+
+def carregar_instancia(caminho):
+    """Abre a instância via memory-map e retorna views (oferta, demanda, custos) sem cópia"""
+    dados = np.memmap(caminho, dtype=np.uint8, mode='r')
+
+    magic, versao, codigo, m, n = CABECALHO.unpack(dados[:CABECALHO.size].tobytes())
+    if magic != MAGIC:
+        raise ValueError(f"{caminho}: não é um arquivo de instância de transporte")
+    if versao != VERSAO:
+        raise ValueError(f"{caminho}: versão {versao} não suportada")
+    tipo_custo = TIPOS_CUSTO[codigo]
+
+    off_oferta, off_demanda, off_custos, tamanho = _deslocamentos(m, n, tipo_custo)
+    if len(dados) < tamanho:
+        raise ValueError(f"{caminho}: arquivo truncado")
+
+    oferta = dados[off_oferta:off_demanda].view('<i4')
+    demanda = dados[off_demanda:off_demanda + 4 * n].view('<i4')
+    custos = dados[off_custos:tamanho].view(tipo_custo).reshape(m, n)
+    return oferta, demanda, custos
+
+# ========================================
+# CACHE EM DISCO
+# ========================================
+
+def chave_cache(nome_gerador, parametros, versao_gerador=None):
+    """Hash SHA-256 do gerador, da sua versão e dos seus parâmetros (independe da ordem)"""
+    conteudo = json.dumps({'gerador': nome_gerador, 'versao': VERSAO, 'versao_gerador': versao_gerador,
+                           **parametros}, sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+def nome_gerador(gerador):
+    """'modulo.funcao' do gerador: homônimos de módulos diferentes não dividem o cache
+
+    Um script executado diretamente tem __module__ == '__main__' (ou
+    '__mp_main__' num processo filho); usa-se então o nome do arquivo.
+    """
+    modulo = gerador.__module__
+    if modulo in ('__main__', '__mp_main__'):
+        modulo = os.path.splitext(os.path.basename(gerador.__code__.co_filename))[0]
+    return f"{modulo}.{gerador.__name__}"
+
+def versao_gerador(gerador):
+    """Hash do código-fonte do arquivo do gerador
+
+    O arquivo inteiro, e não só a função: o gerador costuma delegar a
+    auxiliares do mesmo módulo (ex.: FAMILIAS em gerador_instancias).
+    """
+    with open(gerador.__code__.co_filename, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def obter_instancia_cache(gerador, diretorio=None, **parametros):
+    """Carrega a instância do cache ou gera, grava e carrega na primeira vez"""
+    diretorio = diretorio or DIRETORIO_CACHE
+    os.makedirs(diretorio, exist_ok=True)
+
+    chave = chave_cache(nome_gerador(gerador), parametros, versao_gerador(gerador))
+    caminho = os.path.join(diretorio, f"{chave}.trn")
+
+    if not os.path.exists(caminho):
+        oferta, demanda, custos = gerador(**parametros)
+        # Grava em arquivo temporário e renomeia: leitores nunca veem arquivo parcial
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        salvar_instancia(temporario, oferta, demanda, custos)
+        os.replace(temporario, caminho)
+
+    return carregar_instancia(caminho)
@@ -0,0 +1,158 @@
+"""
+Geração de colunas atrasada (delayed column generation) para o Problema de Transporte
+Começa com um subconjunto restrito de rotas (as k mais baratas de cada origem),
+resolve o problema restrito com o Simplex de Rede e precifica as rotas
+excluídas em lotes vetorizados com os potenciais (duais) obtidos. Rotas com
+custo reduzido negativo entram no conjunto e o processo se repete até que
+nenhuma rota viole a otimalidade.
+"""
+
+import numpy as np
+
+from simplex_rede import simplex_rede
+from balanceamento import CUSTO_FICTICIO, excesso_oferta, arcos_ficticios, folgas_do_fluxo
+
+LINHAS_POR_LOTE = 256
+
+# ========================================
+# ACESSO AOS CUSTOS EM LOTES DE LINHAS
+# ========================================
+
+def _lotes_de_linhas(m, n, custos, linhas_por_lote):
+    """Itera (i0, i1, bloco de custos (i1 - i0) × n) para matriz densa ou oráculo"""
+    colunas = np.arange(n)
+    for i0 in range(0, m, linhas_por_lote):
+        i1 = min(i0 + linhas_por_lote, m)
+        if callable(custos):
+            origens = np.repeat(np.arange(i0, i1), n)
+            destinos = np.tile(colunas, i1 - i0)
+            bloco = np.asarray(custos(origens, destinos), dtype=np.float64).reshape(i1 - i0, n)
+        else:
+            bloco = np.asarray(custos[i0:i1], dtype=np.float64)
+        yield i0, i1, bloco
+
+def _custos_dos_arcos(custos, origens, destinos):
+    if callable(custos):
+        return np.asarray(custos(origens, destinos), dtype=np.float64)
+    return np.asarray(custos, dtype=np.float64)[origens, destinos]
+
+def rotas_iniciais(m, n, custos, k=5, linhas_por_lote=LINHAS_POR_LOTE):
+    """Índices lineares (i*n + j) das k rotas mais baratas de cada origem e o maior |custo|"""
+    k = min(k, n)
+    selecionadas = []
+    custo_max = 0.0
+    for i0, i1, bloco in _lotes_de_linhas(m, n, custos, linhas_por_lote):
+        custo_max = max(custo_max, float(np.abs(bloco).max()))
+        mais_baratas = np.argpartition(bloco, k - 1, axis=1)[:, :k]
+        selecionadas.append((np.arange(i0, i1)[:, None] * n + mais_baratas).ravel())
+    return np.unique(np.concatenate(selecionadas)), custo_max
+
+# ========================================
+# PRICING DAS ROTAS EXCLUÍDAS
+# ========================================
+
+def precificar_rotas(m, n, custos, potenciais, tolerancia=1e-9,
+                     linhas_por_lote=LINHAS_POR_LOTE):
+    """Retorna (índices lineares, custos reduzidos) de todas as rotas com custo reduzido negativo
+
+    Rotas já ativas estão na otimalidade do problema restrito e nunca aparecem aqui.
+    """
+    pi_origem = potenciais[:m]
+    pi_destino = potenciais[m:m + n]
+    indices = []
+    reduzidos = []
+    for i0, i1, bloco in _lotes_de_linhas(m, n, custos, linhas_por_lote):
+        rc = bloco + pi_origem[i0:i1, None] - pi_destino[None, :]
+        linhas, colunas = np.nonzero(rc < -tolerancia)
+        indices.append((i0 + linhas) * n + colunas)
+        reduzidos.append(rc[linhas, colunas])
+    return np.concatenate(indices), np.concatenate(reduzidos)
+
+# ========================================
+# LAÇO DE GERAÇÃO DE COLUNAS
+# ========================================
+
+def resolver_geracao_colunas(oferta, demanda, custos, k=5, max_por_rodada=None,
+                             max_rodadas=1000, tolerancia=1e-9, custo_ficticio=CUSTO_FICTICIO):
+    """Resolve o problema de transporte por geração de colunas sobre o Simplex de Rede
+
+    custos pode ser a matriz m × n ou um oráculo custo_bloco(origens, destinos).
+    Retorna dict com status, custo_total, a solução esparsa (origem, destino,
+    fluxo), iteracoes (pivôs somados), rodadas e arcos_ativos. Se oferta ≠
+    demanda, os arcos do nó fictício ficam sempre ativos.
+    """
+    oferta = np.asarray(oferta, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    m, n = len(oferta), len(demanda)
+
+    if max_por_rodada is None:
+        max_por_rodada = 2 * (m + n)
+
+    ativas, custo_max = rotas_iniciais(m, n, custos, k)
+    suprimento = np.concatenate([oferta, -demanda])
+
+    excesso = excesso_oferta(oferta, demanda)
+    cauda_ficticia = cabeca_ficticia = custo_extra = np.zeros(0, dtype=np.int64)
+    if excesso:
+        suprimento_ficticio, cauda_ficticia, cabeca_ficticia, custo_extra = \
+            arcos_ficticios(m, n, excesso, custo_ficticio)
+        suprimento = np.append(suprimento, suprimento_ficticio)
+        custo_max = max(custo_max, float(np.abs(custo_extra).max()))
+    tolerancia_rc = tolerancia * (1.0 + custo_max)
+
+    iteracoes = 0
+    rodada = 0
+    convergiu = False
+    while True:
+        rodada += 1
+        origens = ativas // n
+        destinos = ativas % n
+        custo_ativas = _custos_dos_arcos(custos, origens, destinos)
+
+        # O custo artificial usa o maior custo do problema completo: se o restrito
+        # for inviável, os potenciais ainda apontam as rotas que reduzem a inviabilidade
+        resultado = simplex_rede(suprimento,
+                                 np.concatenate([origens, cauda_ficticia]),
+                                 np.concatenate([m + destinos, cabeca_ficticia]),
+                                 np.concatenate([custo_ativas, custo_extra]),
+                                 tolerancia=tolerancia, custo_max=custo_max)
+        iteracoes += resultado['iteracoes']
+
+        if resultado['status'] not in ('otimo', 'inviavel'):
+            break
+
+        novas, reduzidos = precificar_rotas(m, n, custos, resultado['potenciais'], tolerancia_rc)
+        if len(novas) == 0:
+            convergiu = True
+            break
+        if rodada >= max_rodadas:
+            break
+
+        # Entram as rotas com custos reduzidos mais negativos
+        if len(novas) > max_por_rodada:
+            melhores = np.argpartition(reduzidos, max_por_rodada - 1)[:max_por_rodada]
+            novas = novas[melhores]
+        ativas = np.union1d(ativas, novas)
+
+    # Sem rotas violadas, um problema restrito inviável prova que o completo também é
+    status = resultado['status']
+    if status in ('otimo', 'inviavel') and not convergiu:
+        status = 'limite_iteracoes'
+
+    fluxo = resultado['fluxo'][:len(ativas)]
+    usadas = fluxo > 0
+    saida = {
+        'status': status,
+        'custo_total': resultado['custo_total'],
+        'origem': origens[usadas],
+        'destino': destinos[usadas],
+        'fluxo': fluxo[usadas],
+        'potenciais': resultado['potenciais'][:m + n],
+        'iteracoes': iteracoes,
+        'rodadas': rodada,
+        'arcos_ativos': len(ativas),
+        'fracao_ativa': len(ativas) / (m * n),
+    }
+    if excesso:
+        saida.update(folgas_do_fluxo(excesso, resultado['fluxo'][len(ativas):]))
+    return saida
@@ -0,0 +1,88 @@
+"""
+Gerador vetorizado de instâncias do Problema de Transporte
+Usa numpy.random.Generator (semente reprodutível) e oferece famílias
+estruturadas: uniforme, euclidiana, agrupada e degenerada.
+"""
+
+import numpy as np
+
+# ========================================
+# OFERTA E DEMANDA
+# ========================================
+
+def _gerar_vetor_balanceado(rng, tamanho, total):
+    """Sorteia valores em [1000, 4000] e escala para somar exatamente total"""
+    valores = rng.integers(1000, 4001, size=tamanho)
+    valores = (valores * (total / valores.sum())).astype(np.int64)
+    valores[-1] += total - valores.sum()  # Ajuste para balanceamento exato
+    return valores
+
+def gerar_oferta_demanda(rng, m, n, total):
+    """Vetores de oferta e demanda balanceados (ambos somam total)"""
+    oferta = _gerar_vetor_balanceado(rng, m, total)
+    demanda = _gerar_vetor_balanceado(rng, n, total)
+    return oferta, demanda
+
+def _distancias(origens, destinos):
+    """Matriz m × n de distâncias euclidianas entre coordenadas (float32, em memória única)"""
+    origens = origens.astype(np.float32)
+    destinos = destinos.astype(np.float32)
+    dx = origens[:, 0, None] - destinos[None, :, 0]
+    dy = origens[:, 1, None] - destinos[None, :, 1]
+    dx *= dx
+    dy *= dy
+    dx += dy
+    return np.sqrt(dx, out=dx)
+
+# ========================================
+# FAMÍLIAS DE INSTÂNCIAS
+# ========================================
+
+def gerar_uniforme(rng, m, n, total):
+    """Custos inteiros uniformes em [1, 100] (mesma distribuição do gerador original)"""
+    oferta, demanda = gerar_oferta_demanda(rng, m, n, total)
+    custos = rng.integers(1, 101, size=(m, n), dtype=np.int32)
+    return oferta, demanda, custos
+
+def gerar_euclidiana(rng, m, n, total, lado=100.0):
+    """Custos = distância euclidiana (arredondada) entre coordenadas aleatórias"""
+    oferta, demanda = gerar_oferta_demanda(rng, m, n, total)
+    origens = rng.uniform(0, lado, size=(m, 2))
+    destinos = rng.uniform(0, lado, size=(n, 2))
+    custos = np.rint(_distancias(origens, destinos)).astype(np.int32) + 1
+    return oferta, demanda, custos
+
+def gerar_agrupada(rng, m, n, total, lado=100.0, num_grupos=8, dispersao=4.0):
+    """Origens e destinos concentrados em grupos - rotas internas baratas"""
+    oferta, demanda = gerar_oferta_demanda(rng, m, n, total)
+    centros = rng.uniform(0, lado, size=(num_grupos, 2))
+    origens = centros[rng.integers(0, num_grupos, size=m)] + rng.normal(0, dispersao, size=(m, 2))
+    destinos = centros[rng.integers(0, num_grupos, size=n)] + rng.normal(0, dispersao, size=(n, 2))
+    custos = np.rint(_distancias(origens, destinos)).astype(np.int32) + 1
+    return oferta, demanda, custos
+
+def gerar_degenerada(rng, m, n, total, num_custos=3):
+    """Ofertas e demandas iguais e poucos custos distintos - muitas bases degeneradas
+
+    O total é arredondado para um múltiplo de m·n para que todas as ofertas
+    (n·q) e todas as demandas (m·q) sejam idênticas.
+    """
+    q = max(1, total // (m * n))
+    oferta = np.full(m, n * q, dtype=np.int64)
+    demanda = np.full(n, m * q, dtype=np.int64)
+    custos = rng.integers(1, num_custos + 1, size=(m, n), dtype=np.int32)
+    return oferta, demanda, custos
+
+FAMILIAS = {
+    'uniforme': gerar_uniforme,
+    'euclidiana': gerar_euclidiana,
+    'agrupada': gerar_agrupada,
+    'degenerada': gerar_degenerada,
+}
+
+def gerar_instancia(m, n, familia='uniforme', total=100000, semente=42, **opcoes):
+    """Gera (oferta, demanda, custos) como arrays NumPy para a família escolhida"""
+    if familia not in FAMILIAS:
+        raise ValueError(f"Família desconhecida: {familia} (disponíveis: {', '.join(FAMILIAS)})")
+    rng = np.random.default_rng(semente)
+    return FAMILIAS[familia](rng, m, n, total, **opcoes)
@@ -0,0 +1,48 @@
+"""
+Instrumentação por fase dos resolvedores Simplex
+Acumula tempo (time.perf_counter) e número de chamadas de cada fase de uma
+iteração: precificação (escolha da coluna que entra), teste da razão
+(linha que sai), atualização do pivô e extração da solução.
+
+Os resolvedores recebem instrumentacao=None por padrão e então só fazem um
+teste booleano por fase; com um dict de criar_instrumentacao, os tempos
+são somados nele. O dict é serializável em JSON tal como está.
+
+Com um rastreador (rastreamento.criar_rastreador), cada fase de cada
+iteração vira também um trecho da linha do tempo ('simplex.<fase>').
+
+O callback por iteração recebe (iteracao, entrando, saindo, objetivo,
+passo): índices da coluna que entra e da linha que sai, custo atual da
+solução e passo (razão mínima) do pivô.
+"""
+
+import time
+
+from rastreamento import registrar_trecho
+
+FASES = ('precificacao', 'razao', 'pivoteamento', 'extracao')
+TRECHOS = {fase: f'simplex.{fase}' for fase in FASES}
+
+def criar_instrumentacao():
+    """Contadores zerados: {fase: {'tempo': segundos, 'chamadas': n}}"""
+    return {fase: {'tempo': 0.0, 'chamadas': 0} for fase in FASES}
+
+def registrar(instrumentacao, fase, inicio, rastreador=None):
+    """Soma à fase o tempo decorrido desde inicio e retorna o instante atual
+
+    instrumentacao pode ser None quando só o rastreador está ativo.
+    """
+    agora = time.perf_counter()
+    if instrumentacao is not None:
+        contador = instrumentacao[fase]
+        contador['tempo'] += agora - inicio
+        contador['chamadas'] += 1
+    if rastreador is not None:
+        registrar_trecho(rastreador, TRECHOS[fase], inicio, agora)
+    return agora
+
+def resumo_fases(execucoes):
+    """Tempo médio por fase de uma lista de instrumentações (uma por execução)"""
+    if not execucoes:
+        return {}
+    return {fase: sum(e[fase]['tempo'] for e in execucoes) / len(execucoes) for fase in FASES}
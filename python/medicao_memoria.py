@@ -0,0 +1,133 @@
+"""
+Medição de memória por execução em processo isolado
+Cada medição roda num processo novo (multiprocessing 'spawn': interpretador
+limpo, sem a memória acumulada pelas execuções anteriores) e devolve, em
+separado:
+
+- pico de RSS do processo, absoluto e acima do RSS já ocupado pelo
+  interpretador e pelos imports (VmHWM do /proc no Linux, zerado antes da
+  execução; resource.getrusage ou psutil nos demais sistemas);
+- pico do heap Python (tracemalloc), o que a resolução alocou em objetos
+  Python e buffers NumPy.
+
+O tracemalloc deixa a execução bem mais lenta (cada float de uma lista
+Python é uma alocação rastreada) e ocupa memória própria: por isso o pico
+de RSS vem de uma primeira execução sem ele, e o pico do heap de uma
+segunda, opcional, com ele. Os tempos do benchmark devem continuar vindo
+da execução normal, fora deste modo.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import multiprocessing
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: pico via psutil (peak_wset)
+
+import psutil
+
+PROC_STATUS = '/proc/self/status'
+PROC_CLEAR_REFS = '/proc/self/clear_refs'
+
+# ========================================
+# PROCESSO FILHO
+# ========================================
+
+def _zerar_pico_rss():
+    """No Linux, zera o pico de RSS (VmHWM) para o RSS atual; False se não for possível
+
+    O ru_maxrss do getrusage não serve para isso: não pode ser zerado e,
+    no Linux, sobrevive ao exec, trazendo para o filho o RSS que o pai
+    tinha no fork.
+    """
+    try:
+        with open(PROC_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def _pico_rss_mb(zerado):
+    """Maior RSS do processo (desde _zerar_pico_rss, se zerado), em MB"""
+    if zerado:
+        with open(PROC_STATUS) as f:
+            for linha in f:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) / 1024
+    if resource is None:
+        return psutil.Process(os.getpid()).memory_info().peak_wset / (1024 * 1024)
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+def _filho(conexao):
+    """Recebe (funcao, argumentos, medir_heap) já com o stdout silenciado e devolve (ok, resultado, medidas)"""
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        funcao, argumentos, medir_heap = conexao.recv()
+        zerado = _zerar_pico_rss()
+        rss_base = _pico_rss_mb(zerado)
+        inicio = time.perf_counter()
+        resultado = funcao(*argumentos)
+        tempo = time.perf_counter() - inicio
+        pico_rss = _pico_rss_mb(zerado)
+
+        pico_heap = None
+        if medir_heap:
+            tracemalloc.start()
+            funcao(*argumentos)
+            pico_heap = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+        conexao.send((True, resultado, {
+            'pico_rss_mb': pico_rss,
+            'rss_base_mb': rss_base,
+            'incremento_rss_mb': pico_rss - rss_base,
+            'pico_heap_mb': pico_heap,
+            'tempo_isolado': tempo,
+        }))
+    except Exception as erro:
+        conexao.send((False, repr(erro), None))
+    finally:
+        conexao.close()
+
+# ========================================
+# COORDENADOR
+# ========================================
+
+def medir_memoria_isolada(funcao, argumentos=(), medir_heap=True, tempo_limite=None):
+    """Executa funcao(*argumentos) num processo novo; retorna (resultado, medidas)
+
+    funcao deve ser de nível de módulo (é enviada por pickle). medidas tem
+    pico_rss_mb, rss_base_mb, incremento_rss_mb, tempo_isolado (tempo da
+    execução sem tracemalloc) e pico_heap_mb (None sem medir_heap, que
+    executa a função uma segunda vez). Em caso de erro ou tempo esgotado
+    retorna (None, None) e imprime o motivo.
+    """
+    contexto = multiprocessing.get_context('spawn')
+    local, remoto = contexto.Pipe()
+    processo = contexto.Process(target=_filho, args=(remoto,), daemon=True)
+    processo.start()
+    remoto.close()
+    try:
+        local.send((funcao, argumentos, medir_heap))
+        if not local.poll(tempo_limite):
+            print("Medição de memória: tempo esgotado", end=" ")
+            processo.kill()
+            return None, None
+        ok, resultado, medidas = local.recv()
+    except EOFError:
+        processo.join()
+        print(f"Medição de memória: processo terminou com código {processo.exitcode}", end=" ")
+        return None, None
+    finally:
+        local.close()
+        processo.join()
+    if not ok:
+        print(f"Medição de memória: {resultado}", end=" ")
+        return None, None
+    return resultado, medidas
@@ -0,0 +1,139 @@
+"""
+Medição de tempo estatisticamente robusta para os benchmarks
+Mesma metodologia para todos os motores (inclusive o Simplex manual):
+
+- relógios de alta resolução: time.perf_counter_ns (parede) e
+  time.process_time_ns (CPU do processo);
+- aquecimentos descartados antes das medições (imports tardios, caches,
+  alocador), para não contaminar a primeira repetição;
+- intercalação aleatória: as repetições de todas as tarefas (motor ×
+  tamanho) são embaralhadas, para que ruído de fundo, aquecimento da
+  máquina e ordem de execução não favoreçam nenhum motor;
+- coleta de lixo antes de cada medição e desligada durante ela;
+- outliers removidos pela regra de Tukey (fora de [Q1 - k·IQR, Q3 + k·IQR]);
+- intervalo de confiança da mediana por bootstrap (percentis).
+"""
+
+import gc
+import time
+import random
+
+import numpy as np
+
+K_OUTLIERS = 1.5
+NIVEL_CONFIANCA = 0.95
+REAMOSTRAS = 2000
+
+# ========================================
+# CRONOMETRAGEM
+# ========================================
+
+def cronometrar(executar, argumentos):
+    """Executa executar(*argumentos); retorna (resultado, tempo de parede ns, tempo de CPU ns)"""
+    gc.collect()
+    gc.disable()
+    try:
+        inicio_cpu = time.process_time_ns()
+        inicio = time.perf_counter_ns()
+        resultado = executar(*argumentos)
+        parede = time.perf_counter_ns() - inicio
+        cpu = time.process_time_ns() - inicio_cpu
+    finally:
+        gc.enable()
+    return resultado, parede, cpu
+
+def executar_intercalado(tarefas, num_repeticoes, aquecimentos=1, semente=0, callback=None):
+    """Mede todas as tarefas com as repetições embaralhadas entre si
+
+    tarefas: {chave: (preparar, executar)}. preparar(repeticao) monta os
+    argumentos fora do tempo medido (ex.: gera a instância da semente da
+    repetição); executar(*argumentos) é cronometrado. Cada tarefa é
+    executada `aquecimentos` vezes antes (sem registro, também em ordem
+    aleatória). callback(chave, medicao), se dado, é chamado após cada
+    medição.
+
+    Retorna {chave: [medicao por repetição]}, com medicao = dict de
+    repeticao, parede_ns, cpu_ns, resultado e erro (repr da exceção ou None).
+    """
+    rng = random.Random(semente)
+    chaves = list(tarefas)
+
+    ordem_aquecimento = [chave for chave in chaves for _ in range(aquecimentos)]
+    rng.shuffle(ordem_aquecimento)
+    for chave in ordem_aquecimento:
+        preparar, executar = tarefas[chave]
+        try:
+            executar(*preparar(0))
+        except Exception:
+            pass  # O erro aparece de novo (e é registrado) nas medições
+
+    ordem = [(chave, repeticao) for chave in chaves for repeticao in range(num_repeticoes)]
+    rng.shuffle(ordem)
+    medicoes = {chave: [None] * num_repeticoes for chave in chaves}
+    for chave, repeticao in ordem:
+        preparar, executar = tarefas[chave]
+        medicao = {'repeticao': repeticao, 'parede_ns': None, 'cpu_ns': None, 'resultado': None, 'erro': None}
+        try:
+            medicao['resultado'], medicao['parede_ns'], medicao['cpu_ns'] = cronometrar(
+                executar, preparar(repeticao))
+        except Exception as erro:
+            medicao['erro'] = repr(erro)
+        medicoes[chave][repeticao] = medicao
+        if callback is not None:
+            callback(chave, medicao)
+    return medicoes
+
+# ========================================
+# ESTATÍSTICAS
+# ========================================
+
+def mascara_outliers(amostras, k=K_OUTLIERS):
+    """True nas amostras dentro das cercas de Tukey [Q1 - k·IQR, Q3 + k·IQR]"""
+    amostras = np.asarray(amostras, dtype=np.float64)
+    if len(amostras) < 4:
+        return np.ones(len(amostras), dtype=bool)
+    q1, q3 = np.percentile(amostras, [25, 75])
+    iqr = q3 - q1
+    return (amostras >= q1 - k * iqr) & (amostras <= q3 + k * iqr)
+
+def intervalo_bootstrap(amostras, nivel=NIVEL_CONFIANCA, reamostras=REAMOSTRAS, semente=0):
+    """Intervalo de confiança percentil da mediana por bootstrap; retorna (inferior, superior)"""
+    amostras = np.asarray(amostras, dtype=np.float64)
+    if len(amostras) < 2:
+        valor = float(amostras[0]) if len(amostras) else float('nan')
+        return valor, valor
+    rng = np.random.default_rng(semente)
+    indices = rng.integers(0, len(amostras), size=(reamostras, len(amostras)))
+    medianas = np.median(amostras[indices], axis=1)
+    alfa = (1.0 - nivel) / 2
+    inferior, superior = np.quantile(medianas, [alfa, 1.0 - alfa])
+    return float(inferior), float(superior)
+
+def estatisticas_tempo(medicoes, k=K_OUTLIERS, nivel=NIVEL_CONFIANCA, reamostras=REAMOSTRAS, semente=0):
+    """Resumo (em segundos) das medições bem-sucedidas de uma tarefa, sem os outliers
+
+    Chaves compatíveis com as estatísticas dos benchmarks (tempo_medio,
+    tempo_mediano, tempo_desvio, tempo_min, tempo_max), mais o intervalo
+    de confiança da mediana, o tempo de CPU e o número de outliers.
+    """
+    validas = [m for m in medicoes if m['erro'] is None]
+    if not validas:
+        return {'amostras': 0, 'outliers_removidos': 0}
+    parede = np.array([m['parede_ns'] for m in validas], dtype=np.float64) / 1e9
+    cpu = np.array([m['cpu_ns'] for m in validas], dtype=np.float64) / 1e9
+    mantidas = mascara_outliers(parede, k)
+    parede, cpu = parede[mantidas], cpu[mantidas]
+    inferior, superior = intervalo_bootstrap(parede, nivel, reamostras, semente)
+    return {
+        'amostras': int(len(parede)),
+        'outliers_removidos': int((~mantidas).sum()),
+        'tempo_medio': float(parede.mean()),
+        'tempo_mediano': float(np.median(parede)),
+        'tempo_desvio': float(parede.std(ddof=1)) if len(parede) > 1 else 0.0,
+        'tempo_min': float(parede.min()),
+        'tempo_max': float(parede.max()),
+        'tempo_ic_inferior': inferior,
+        'tempo_ic_superior': superior,
+        'nivel_confianca': nivel,
+        'tempo_cpu_mediano': float(np.median(cpu)),
+    }
@@ -0,0 +1,163 @@
+"""
+Métricas das resoluções no formato de texto do Prometheus
+Histogramas de latência, iterações, pivôs por segundo e memória (variação
+de RSS e, com a memória isolada, o pico) de cada execução, rotulados por
+motor e tamanho do problema, servidos por HTTP em /metrics para o
+Prometheus (e daí para o Grafana). Só usa a
+biblioteca padrão: o endpoint pode ser testado com um scrape local, ex.:
+
+    curl http://127.0.0.1:9464/metrics
+"""
+
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORTA_PADRAO = 9464
+TIPO_CONTEUDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+HISTOGRAMAS = {
+    'transporte_resolucao_segundos': (
+        'Tempo de resolução (construção + simplex + extração)',
+        (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)),
+    'transporte_iteracoes': (
+        'Iterações (pivôs) do simplex',
+        (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)),
+    'transporte_pivos_por_segundo': (
+        'Taxa de pivôs por segundo',
+        (10, 100, 1000, 10000, 100000, 1000000)),
+    'transporte_memoria_pico_bytes': (
+        'Pico de memória da execução (incremento do pico de RSS num processo isolado)',
+        tuple(2.0 ** k for k in range(20, 34, 2))),
+    'transporte_memoria_rss_delta_bytes': (
+        'Variação do RSS no processo do benchmark (ruidosa, não é o pico)',
+        tuple(2.0 ** k for k in range(20, 34, 2))),
+}
+
+CONTADOR_EXECUCOES = 'transporte_execucoes_total'
+
+# ========================================
+# REGISTRO
+# ========================================
+
+def criar_registro():
+    """Registro vazio: séries por (nome, rótulos) e uma trava para o servidor HTTP"""
+    return {
+        'histogramas': {nome: {} for nome in HISTOGRAMAS},
+        'execucoes': {},
+        'trava': threading.Lock(),
+    }
+
+def observar(registro, nome, valor, rotulos):
+    """Acrescenta uma observação ao histograma `nome` na série de `rotulos` (tupla de pares)"""
+    baldes = HISTOGRAMAS[nome][1]
+    with registro['trava']:
+        serie = registro['histogramas'][nome].get(rotulos)
+        if serie is None:
+            serie = registro['histogramas'][nome][rotulos] = {
+                'contagens': [0] * len(baldes), 'soma': 0.0, 'total': 0}
+        for k, limite in enumerate(baldes):
+            if valor <= limite:
+                serie['contagens'][k] += 1
+        serie['soma'] += valor
+        serie['total'] += 1
+
+def registrar_execucao(registro, motor, tamanho, tempo, iteracoes=None, memoria_mb=None, status='ok',
+                       pico_memoria_mb=None):
+    """Registra uma execução: latência, iterações, pivôs/s e memória (os ausentes são pulados)
+
+    memoria_mb é a variação de RSS medida no próprio processo do benchmark;
+    pico_memoria_mb, o incremento_rss_mb de medicao_memoria (só com a
+    memória isolada). Sem registro (None) não faz nada, para uso direto nos
+    benchmarks.
+    """
+    if registro is None:
+        return
+    rotulos = (('motor', motor), ('tamanho', tamanho))
+    chave = rotulos + (('status', status),)
+    with registro['trava']:
+        registro['execucoes'][chave] = registro['execucoes'].get(chave, 0) + 1
+    if status != 'ok':
+        return
+
+    observar(registro, 'transporte_resolucao_segundos', tempo, rotulos)
+    if iteracoes:
+        observar(registro, 'transporte_iteracoes', iteracoes, rotulos)
+        if tempo > 0:
+            observar(registro, 'transporte_pivos_por_segundo', iteracoes / tempo, rotulos)
+    if memoria_mb is not None:
+        observar(registro, 'transporte_memoria_rss_delta_bytes', memoria_mb * 1024 * 1024, rotulos)
+    if pico_memoria_mb is not None:
+        observar(registro, 'transporte_memoria_pico_bytes', pico_memoria_mb * 1024 * 1024, rotulos)
+
+def pico_memoria(memoria_isolada):
+    """incremento_rss_mb das medidas de medicao_memoria, ou None sem elas"""
+    return None if memoria_isolada is None else memoria_isolada['incremento_rss_mb']
+
+# ========================================
+# FORMATO DE TEXTO
+# ========================================
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _rotulos(pares):
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{chave}="{_escapar(valor)}"' for chave, valor in pares) + '}'
+
+def _numero(valor):
+    if math.isinf(valor):
+        return '+Inf' if valor > 0 else '-Inf'
+    return repr(float(valor))
+
+def texto_prometheus(registro):
+    """Exposição de todas as séries no formato de texto 0.0.4"""
+    linhas = []
+    with registro['trava']:
+        for nome, (ajuda, baldes) in HISTOGRAMAS.items():
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} histogram")
+            for rotulos, serie in sorted(registro['histogramas'][nome].items()):
+                for limite, contagem in zip(baldes, serie['contagens']):
+                    linhas.append(f"{nome}_bucket{_rotulos(rotulos + (('le', _numero(limite)),))} {contagem}")
+                linhas.append(f"{nome}_bucket{_rotulos(rotulos + (('le', '+Inf'),))} {serie['total']}")
+                linhas.append(f"{nome}_sum{_rotulos(rotulos)} {_numero(serie['soma'])}")
+                linhas.append(f"{nome}_count{_rotulos(rotulos)} {serie['total']}")
+
+        linhas.append(f"# HELP {CONTADOR_EXECUCOES} Execuções por motor, tamanho e status")
+        linhas.append(f"# TYPE {CONTADOR_EXECUCOES} counter")
+        for rotulos, total in sorted(registro['execucoes'].items()):
+            linhas.append(f"{CONTADOR_EXECUCOES}{_rotulos(rotulos)} {total}")
+    return '\n'.join(linhas) + '\n'
+
+# ========================================
+# ENDPOINT HTTP
+# ========================================
+
+def servir_metricas(registro, host='127.0.0.1', porta=PORTA_PADRAO):
+    """Serve /metrics numa thread em segundo plano; retorna o servidor (porta=0 escolhe uma livre)"""
+    class Manipulador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            corpo = texto_prometheus(registro).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', TIPO_CONTEUDO)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *argumentos):
+            pass  # Sem uma linha no stderr a cada scrape
+
+    servidor = ThreadingHTTPServer((host, porta), Manipulador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+def encerrar_metricas(servidor):
+    """Para o servidor HTTP e libera a porta"""
+    servidor.shutdown()
+    servidor.server_close()
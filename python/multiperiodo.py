@@ -0,0 +1,251 @@
+"""
+Problema de Transporte multiperíodo com estoque nas origens
+Cada período tem sua oferta e sua demanda; o que uma origem não envia num
+período pode ficar em estoque para o seguinte, a um custo por unidade e por
+período. O modelo é uma rede expandida no tempo: uma cópia das origens e
+destinos por período, ligadas pelos arcos de estoque (i, p) → (i, p + 1),
+resolvida pelo Simplex de Rede.
+
+O horizonte rolante resolve janelas curtas, fixa os primeiros períodos de
+cada uma e reaproveita a base da janela anterior (deslocada no tempo) como
+partida a quente da seguinte: o tempo total cresce com o número de janelas,
+e não com o tamanho da rede expandida completa.
+"""
+
+import numpy as np
+
+from rede_esparsa import RedeEsparsa, rede_de_matriz
+from simplex_rede import simplex_rede
+
+# ========================================
+# REDE EXPANDIDA NO TEMPO
+# ========================================
+
+def _rotas_por_periodo(custos, num_periodos, m, n):
+    """Retorna (origem, destino, custo por período (T × arcos), capacidade ou None)
+
+    custos pode ser a matriz m × n (a mesma em todos os períodos), um array
+    T × m × n ou uma RedeEsparsa (mesmos arcos e custos em todos os períodos).
+    """
+    if isinstance(custos, RedeEsparsa):
+        rede = custos
+    else:
+        custos = np.asarray(custos, dtype=np.float64)
+        if custos.ndim == 3:
+            rede = rede_de_matriz(custos[0])
+            return (rede.origem, rede.destino,
+                    custos.reshape(num_periodos, m * n)[:, rede.origem * n + rede.destino], None)
+        rede = rede_de_matriz(custos.reshape(m, n))
+    return rede.origem, rede.destino, np.tile(rede.custo, (num_periodos, 1)), rede.capacidade
+
+def _rede_janela(oferta, demanda, origem, destino, custo, capacidade, custo_estoque,
+                 capacidade_estoque, custo_falta, estoque_inicial):
+    """Monta a rede expandida de uma janela de W períodos
+
+    Nós: (i, p) = p*(m+n) + i, (j, p) = p*(m+n) + m + j e o nó de fechamento
+    F = W*(m+n), que recebe o estoque final e cobre a demanda não atendida.
+    Arcos do período p (P por período): os arcos de transporte, m arcos de
+    estoque ((i, W-1) → F no último período) e, se custo_falta não for None,
+    n arcos de falta F → (j, p).
+
+    Retorna (suprimento, cauda, cabeca, custo, capacidade ou None, P).
+    """
+    num_periodos, m = oferta.shape
+    n = demanda.shape[1]
+    num_nos = m + n
+    fechamento = num_periodos * num_nos
+    num_rotas = len(origem)
+    com_falta = custo_falta is not None
+    por_periodo = num_rotas + m + (n if com_falta else 0)
+
+    suprimento = np.concatenate([oferta, -demanda], axis=1)
+    suprimento[0, :m] += estoque_inicial
+    suprimento = np.append(suprimento.ravel(), -suprimento.sum())
+
+    base = (np.arange(num_periodos) * num_nos)[:, None]
+    origens = np.arange(m)
+    ultimo = (np.arange(num_periodos) == num_periodos - 1)[:, None]
+
+    cauda = [base + origem, base + origens]
+    cabeca = [base + m + destino, np.where(ultimo, fechamento, base + num_nos + origens)]
+    custos = [custo, np.broadcast_to(custo_estoque, (num_periodos, m))]
+    if com_falta:
+        cauda.append(np.full((num_periodos, n), fechamento))
+        cabeca.append(base + m + np.arange(n))
+        custos.append(np.broadcast_to(custo_falta, (num_periodos, n)))
+
+    cauda = np.concatenate(cauda, axis=1).ravel()
+    cabeca = np.concatenate(cabeca, axis=1).ravel()
+    custos = np.concatenate(custos, axis=1).ravel()
+
+    limites = None
+    if capacidade is not None or capacidade_estoque is not None:
+        limites = [np.broadcast_to(np.inf if capacidade is None else capacidade, (num_periodos, num_rotas)),
+                   np.broadcast_to(np.inf if capacidade_estoque is None else capacidade_estoque,
+                                   (num_periodos, m))]
+        if com_falta:
+            limites.append(np.full((num_periodos, n), np.inf))
+        limites = np.concatenate(limites, axis=1).ravel()
+
+    return suprimento, cauda, cabeca, custos, limites, por_periodo
+
+def _fluxos_por_periodo(fluxo, num_periodos, num_rotas, m, n, com_falta):
+    """Separa o fluxo da janela em (envios T × arcos, estoque T × m, falta T × n ou None)"""
+    fluxo = fluxo.reshape(num_periodos, -1)
+    envios = fluxo[:, :num_rotas]
+    estoque = fluxo[:, num_rotas:num_rotas + m]
+    falta = fluxo[:, num_rotas + m:] if com_falta else None
+    return envios, estoque, falta
+
+def _preparar(oferta, demanda, custos, custo_estoque, estoque_inicial, capacidade_estoque):
+    oferta = np.atleast_2d(np.asarray(oferta, dtype=np.float64))
+    demanda = np.atleast_2d(np.asarray(demanda, dtype=np.float64))
+    num_periodos, m = oferta.shape
+    n = demanda.shape[1]
+    if demanda.shape[0] != num_periodos:
+        print("Erro: oferta e demanda devem ter o mesmo número de períodos")
+        return None
+
+    origem, destino, custo, capacidade = _rotas_por_periodo(custos, num_periodos, m, n)
+    custo_estoque = np.broadcast_to(np.asarray(custo_estoque, dtype=np.float64), (m,))
+    estoque_inicial = np.broadcast_to(np.asarray(estoque_inicial, dtype=np.float64), (m,))
+    if capacidade_estoque is not None:
+        capacidade_estoque = np.broadcast_to(np.asarray(capacidade_estoque, dtype=np.float64), (m,))
+    return (oferta, demanda, origem, destino, custo, capacidade, custo_estoque,
+            estoque_inicial, capacidade_estoque)
+
+# ========================================
+# MODELO COMPLETO
+# ========================================
+
+def resolver_multiperiodo(oferta, demanda, custos, custo_estoque=0.0, estoque_inicial=0.0,
+                          custo_falta=None, capacidade_estoque=None, **opcoes):
+    """Resolve o horizonte inteiro numa única rede expandida
+
+    oferta (T × m) e demanda (T × n) por período; custos como em
+    _rotas_por_periodo; custo_estoque, estoque_inicial e capacidade_estoque
+    escalares ou por origem. Sem custo_falta, toda a demanda precisa ser
+    atendida (senão o status é 'inviavel'); com ele, a falta por destino e
+    período é permitida a esse custo.
+
+    Retorna dict com status, custo_total, envios (T × arcos de transporte,
+    na ordem de origem/destino), origem, destino, estoque (estoque ao fim de
+    cada período, T × m), falta (T × n, se custo_falta) e iteracoes.
+    """
+    preparado = _preparar(oferta, demanda, custos, custo_estoque, estoque_inicial, capacidade_estoque)
+    if preparado is None:
+        return None
+    (oferta, demanda, origem, destino, custo, capacidade, custo_estoque,
+     estoque_inicial, capacidade_estoque) = preparado
+    num_periodos, m = oferta.shape
+    n = demanda.shape[1]
+
+    suprimento, cauda, cabeca, custo_arcos, limites, _ = _rede_janela(
+        oferta, demanda, origem, destino, custo, capacidade, custo_estoque,
+        capacidade_estoque, custo_falta, estoque_inicial)
+    resultado = simplex_rede(suprimento, cauda, cabeca, custo_arcos, capacidade=limites, **opcoes)
+
+    envios, estoque, falta = _fluxos_por_periodo(resultado['fluxo'], num_periodos, len(origem),
+                                                 m, n, custo_falta is not None)
+    saida = {
+        'status': resultado['status'],
+        'custo_total': resultado['custo_total'],
+        'origem': origem,
+        'destino': destino,
+        'envios': envios,
+        'estoque': estoque,
+        'iteracoes': resultado['iteracoes'],
+    }
+    if falta is not None:
+        saida['falta'] = falta
+    return saida
+
+# ========================================
+# HORIZONTE ROLANTE
+# ========================================
+
+def _deslocar_base(arcos, passo, num_periodos, proxima, por_periodo):
+    """Arcos da base de uma janela de num_periodos na numeração da seguinte (proxima períodos)"""
+    periodo = arcos // por_periodo
+    deslocados = arcos[periodo >= passo] - passo * por_periodo
+    ultimo = arcos[periodo == num_periodos - 1] - (num_periodos - 1) * por_periodo
+    novos = [ultimo + p * por_periodo for p in range(num_periodos - passo, proxima)]
+    return np.concatenate([deslocados] + novos)
+
+def resolver_horizonte_rolante(oferta, demanda, custos, custo_estoque=0.0, estoque_inicial=0.0,
+                               custo_falta=None, capacidade_estoque=None, janela=4, passo=1,
+                               reaproveitar_base=True, **opcoes):
+    """Resolve o horizonte em janelas de `janela` períodos, fixando `passo` períodos por vez
+
+    O estoque ao fim dos períodos fixados vira o estoque inicial da janela
+    seguinte. Com reaproveitar_base, a árvore ótima da janela anterior,
+    deslocada `passo` períodos, é a base inicial da próxima (os períodos
+    novos no fim da janela partem da base artificial). O resultado tem o
+    mesmo formato de resolver_multiperiodo, mais 'janelas'.
+    """
+    preparado = _preparar(oferta, demanda, custos, custo_estoque, estoque_inicial, capacidade_estoque)
+    if preparado is None:
+        return None
+    (oferta, demanda, origem, destino, custo, capacidade, custo_estoque,
+     estoque_inicial, capacidade_estoque) = preparado
+    num_periodos, m = oferta.shape
+    n = demanda.shape[1]
+    com_falta = custo_falta is not None
+    if janela < 1 or not 1 <= passo <= janela:
+        print("Erro: a janela deve ter pelo menos 1 período e 1 <= passo <= janela")
+        return None
+
+    envios = np.zeros((num_periodos, len(origem)))
+    estoque = np.zeros((num_periodos, m))
+    falta = np.zeros((num_periodos, n)) if com_falta else None
+    status = 'otimo'
+    custo_total = 0.0
+    iteracoes = 0
+    janelas = 0
+    base = saturados = None
+
+    estoque_atual = np.array(estoque_inicial)
+    for inicio in range(0, num_periodos, passo):
+        fim = min(inicio + janela, num_periodos)
+        suprimento, cauda, cabeca, custo_arcos, limites, por_periodo = _rede_janela(
+            oferta[inicio:fim], demanda[inicio:fim], origem, destino, custo[inicio:fim],
+            capacidade, custo_estoque, capacidade_estoque, custo_falta, estoque_atual)
+        resultado = simplex_rede(suprimento, cauda, cabeca, custo_arcos, capacidade=limites,
+                                 arcos_iniciais=base, saturados_iniciais=saturados, **opcoes)
+        iteracoes += resultado['iteracoes']
+        janelas += 1
+        if resultado['status'] != 'otimo':
+            status = resultado['status']
+            break
+
+        # Fixa os primeiros períodos da janela
+        fixados = min(passo, fim - inicio)
+        janela_envios, janela_estoque, janela_falta = _fluxos_por_periodo(
+            resultado['fluxo'], fim - inicio, len(origem), m, n, com_falta)
+        envios[inicio:inicio + fixados] = janela_envios[:fixados]
+        estoque[inicio:inicio + fixados] = janela_estoque[:fixados]
+        custo_total += float(custo_arcos[:fixados * por_periodo] @ resultado['fluxo'][:fixados * por_periodo])
+        if com_falta:
+            falta[inicio:inicio + fixados] = janela_falta[:fixados]
+        estoque_atual = janela_estoque[fixados - 1]
+
+        # Base da próxima janela: os mesmos arcos, `passo` períodos antes; os
+        # períodos que entram no fim da janela repetem a base do último período
+        if reaproveitar_base:
+            proxima = min(janela, num_periodos - inicio - passo)
+            base = _deslocar_base(resultado['base'], passo, fim - inicio, proxima, por_periodo)
+            saturados = _deslocar_base(resultado['saturados'], passo, fim - inicio, proxima, por_periodo)
+
+    saida = {
+        'status': status,
+        'custo_total': custo_total,
+        'origem': origem,
+        'destino': destino,
+        'envios': envios,
+        'estoque': estoque,
+        'iteracoes': iteracoes,
+        'janelas': janelas,
+    }
+    if com_falta:
+        saida['falta'] = falta
+    return saida
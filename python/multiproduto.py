@@ -0,0 +1,240 @@
+"""
+Problema de Transporte multiproduto com capacidades compartilhadas
+K produtos usam as mesmas rotas, e a capacidade de cada rota limita a soma
+dos fluxos de todos eles. Em vez de um tableau K vezes mais largo, o
+problema é resolvido por decomposição de Dantzig–Wolfe:
+
+- o mestre é um LP pequeno (uma linha por rota capacitada e uma por
+  produto) sobre combinações convexas de soluções de cada produto;
+- cada subproblema é um problema de transporte simples de um produto, com
+  os custos acrescidos do preço dual das capacidades, resolvido pelo
+  Simplex de Rede (com partida a quente na base da rodada anterior).
+
+Os subproblemas de uma rodada são independentes e podem ir para um pool de
+processos ou para nós conectados por sockets (nos_locais).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from scipy.optimize import linprog
+    from scipy.sparse import csc_matrix, hstack, identity
+except ImportError:
+    linprog = None
+
+from rede_esparsa import RedeEsparsa, rede_de_matriz
+from simplex_rede import resolver_transporte_rede
+from balanceamento import CUSTO_FICTICIO
+from nos_locais import mapear_nos
+
+# ========================================
+# SUBPROBLEMA DE UM PRODUTO
+# ========================================
+
+def _resolver_produto(oferta, demanda, m, n, origem, destino, custo, custo_ficticio, base):
+    """Transporte de um produto (executa nos processos do pool ou nos nós)
+
+    Retorna (status, fluxo por arco, custo_total, base, iteracoes).
+    """
+    rede = RedeEsparsa(m, n, origem, destino, custo)
+    resultado = resolver_transporte_rede(oferta, demanda, rede, custo_ficticio=custo_ficticio,
+                                         arcos_iniciais=base)
+    return (resultado['status'], resultado['valores'], resultado['custo_total'],
+            resultado.get('base'), resultado['iteracoes'])
+
+def _rotas_compartilhadas(custos, num_produtos, m, n, capacidade):
+    """Retorna (origem, destino, custo K × arcos, capacidade por arco)
+
+    custos: matriz m × n (igual para todos os produtos), array K × m × n ou
+    RedeEsparsa; capacidade: matriz m × n, um valor por arco ou None para
+    usar rede.capacidade.
+    """
+    if isinstance(custos, RedeEsparsa):
+        rede = custos
+        custo = np.tile(rede.custo, (num_produtos, 1))
+    else:
+        custos = np.asarray(custos, dtype=np.float64)
+        rede = rede_de_matriz(custos[0] if custos.ndim == 3 else custos.reshape(m, n))
+        if custos.ndim == 3:
+            custo = custos.reshape(num_produtos, m * n)[:, rede.origem * n + rede.destino]
+        else:
+            custo = np.tile(rede.custo, (num_produtos, 1))
+
+    if capacidade is None:
+        capacidade = rede.capacidade
+    elif np.ndim(capacidade) == 2:
+        capacidade = np.asarray(capacidade, dtype=np.float64)[rede.origem, rede.destino]
+    if capacidade is None:
+        capacidade = np.full(rede.num_arcos, np.inf)
+    return rede.origem, rede.destino, custo, np.asarray(capacidade, dtype=np.float64)
+
+# ========================================
+# PROBLEMA MESTRE
+# ========================================
+
+def _resolver_mestre(custos_colunas, colunas, produto_coluna, num_produtos, capacidade, penalidade):
+    """LP mestre restrito: min Σ c λ + penalidade·Σ s
+
+    Σ fluxo·λ - s <= capacidade (uma linha por rota capacitada que alguma
+    coluna usa; as demais têm folga e dual zero) e Σ λ = 1 por produto. As
+    folgas s mantêm o mestre viável desde a primeira rodada.
+    Retorna (λ, valor, folga por rota, preço dual por rota, dual de cada produto).
+    """
+    num_colunas = len(custos_colunas)
+    arcos = np.concatenate([usados for usados, _ in colunas])
+    coluna = np.repeat(np.arange(num_colunas), [len(usados) for usados, _ in colunas])
+    fluxo = np.concatenate([valores for _, valores in colunas])
+    capacitado = np.isfinite(capacidade[arcos])
+    linhas, linha_arco = np.unique(arcos[capacitado], return_inverse=True)
+    num_linhas = len(linhas)
+
+    objetivo = np.concatenate([custos_colunas, np.full(num_linhas, penalidade)])
+    a_ub = hstack([csc_matrix((fluxo[capacitado], (linha_arco, coluna[capacitado])),
+                              shape=(num_linhas, num_colunas)),
+                   -identity(num_linhas, format='csc')])
+    a_eq = hstack([csc_matrix((np.ones(num_colunas), (produto_coluna, np.arange(num_colunas))),
+                              shape=(num_produtos, num_colunas)),
+                   csc_matrix((num_produtos, num_linhas))])
+
+    resultado = linprog(objetivo, A_ub=a_ub, b_ub=capacidade[linhas], A_eq=a_eq,
+                        b_eq=np.ones(num_produtos), bounds=(0, None), method='highs')
+    if resultado.status != 0:
+        return None
+    folgas = np.zeros(len(capacidade))
+    folgas[linhas] = resultado.x[num_colunas:]
+    preco = np.zeros(len(capacidade))
+    preco[linhas] = -resultado.ineqlin.marginals
+    return resultado.x[:num_colunas], resultado.fun, folgas, preco, resultado.eqlin.marginals
+
+# ========================================
+# DANTZIG–WOLFE
+# ========================================
+
+def resolver_multiproduto(ofertas, demandas, custos, capacidade=None, processos=1, nos=None,
+                          max_rodadas=200, tolerancia=1e-6, custo_ficticio=CUSTO_FICTICIO):
+    """Resolve o transporte multiproduto por Dantzig–Wolfe
+
+    ofertas (K × m) e demandas (K × n); custos e capacidade como em
+    _rotas_compartilhadas. Os subproblemas rodam no processo principal
+    (processos=1), num pool de processos ou, se nos for um dict de
+    nos_locais.iniciar_nos, nos nós conectados por socket.
+
+    Retorna dict com status, custo_total, limite_inferior (limite de
+    Lagrange da última rodada), origem, destino, fluxos (K × arcos), carga
+    por arco, precos_capacidade (dual de cada rota, >= 0), rodadas, colunas
+    e iteracoes (pivôs somados dos subproblemas).
+    """
+    if linprog is None:
+        print("Erro: o problema mestre precisa do scipy (scipy.optimize.linprog)")
+        return None
+
+    ofertas = np.atleast_2d(np.asarray(ofertas, dtype=np.float64))
+    demandas = np.atleast_2d(np.asarray(demandas, dtype=np.float64))
+    num_produtos, m = ofertas.shape
+    n = demandas.shape[1]
+    if demandas.shape[0] != num_produtos:
+        print("Erro: ofertas e demandas devem ter o mesmo número de produtos")
+        return None
+
+    origem, destino, custo, capacidade = _rotas_compartilhadas(custos, num_produtos, m, n, capacidade)
+    limites = np.where(np.isfinite(capacidade), capacidade, 0.0)
+
+    # Uma unidade acima da capacidade custa mais que qualquer desvio de rota
+    custo_max = max(float(np.abs(custo).max()), float(np.max(np.abs(custo_ficticio))))
+    penalidade = (custo_max + 1.0) * (m + n)
+
+    if nos is not None:
+        def mapear(lista_argumentos):
+            return mapear_nos(nos, _resolver_produto, lista_argumentos)
+        pool = None
+    elif processos > 1:
+        pool = ProcessPoolExecutor(max_workers=min(processos, num_produtos))
+        def mapear(lista_argumentos):
+            futuros = [pool.submit(_resolver_produto, *argumentos) for argumentos in lista_argumentos]
+            return [f.result() for f in futuros]
+    else:
+        pool = None
+        def mapear(lista_argumentos):
+            return [_resolver_produto(*argumentos) for argumentos in lista_argumentos]
+
+    # Colunas: fluxo esparso de uma solução de um produto e seu custo original
+    colunas = []
+    custos_colunas = []
+    produto_coluna = []
+    bases = [None] * num_produtos
+    preco = np.zeros(len(origem))
+    duais_produto = np.full(num_produtos, np.inf)
+
+    lambdas = folgas = valor_mestre = None
+    status = 'limite_iteracoes'
+    limite_inferior = -np.inf
+    iteracoes = 0
+    rodada = 0
+    try:
+        while rodada < max_rodadas:
+            rodada += 1
+            respostas = mapear([(ofertas[k], demandas[k], m, n, origem, destino, custo[k] + preco,
+                                 custo_ficticio, bases[k]) for k in range(num_produtos)])
+
+            novas = 0
+            valor_lagrange = 0.0
+            for k, (status_k, fluxo, custo_com_precos, base, pivos) in enumerate(respostas):
+                iteracoes += pivos
+                if status_k != 'otimo':
+                    status = status_k
+                    break
+                bases[k] = base
+                valor_lagrange += custo_com_precos
+                # Custo reduzido da coluna: custo com os preços - dual de convexidade do produto
+                if custo_com_precos - duais_produto[k] < -tolerancia * (1.0 + abs(custo_com_precos)):
+                    usados = np.flatnonzero(fluxo)
+                    colunas.append((usados, fluxo[usados]))
+                    custos_colunas.append(custo_com_precos - preco[usados] @ fluxo[usados])
+                    produto_coluna.append(k)
+                    novas += 1
+            else:
+                # Sem colunas melhores, ou com o mestre já no limite de Lagrange, o mestre é ótimo
+                limite_inferior = max(limite_inferior, valor_lagrange - preco @ limites)
+                if novas == 0 or (lambdas is not None and
+                                  valor_mestre - limite_inferior <= tolerancia * (1.0 + abs(valor_mestre))):
+                    status = 'otimo'
+                    break
+
+                mestre = _resolver_mestre(np.array(custos_colunas), colunas, np.array(produto_coluna),
+                                          num_produtos, capacidade, penalidade)
+                if mestre is None:
+                    status = 'erro_mestre'
+                    break
+                lambdas, valor_mestre, folgas, preco, duais_produto = mestre
+                continue
+            break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Folga positiva no mestre ótimo: as capacidades não comportam as demandas
+    if status == 'otimo' and np.any(folgas > tolerancia * (1.0 + limites)):
+        status = 'inviavel'
+
+    fluxos = np.zeros((num_produtos, len(origem)))
+    custo_total = None
+    if lambdas is not None:
+        for (usados, fluxo), k, peso in zip(colunas, produto_coluna, lambdas):
+            fluxos[k, usados] += peso * fluxo
+        custo_total = float(np.dot(custos_colunas[:len(lambdas)], lambdas))
+
+    return {
+        'status': status,
+        'custo_total': custo_total,
+        'limite_inferior': limite_inferior,
+        'origem': origem,
+        'destino': destino,
+        'fluxos': fluxos,
+        'carga': fluxos.sum(axis=0),
+        'precos_capacidade': preco,
+        'rodadas': rodada,
+        'colunas': len(colunas),
+        'iteracoes': iteracoes,
+    }
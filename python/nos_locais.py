@@ -0,0 +1,126 @@
+"""
+Nós de trabalho conectados por sockets locais
+Substituto de um cluster: o coordenador abre um Listener TCP e cada nó (um
+processo, local ou em outra máquina) conecta-se a ele e executa as tarefas
+recebidas, funções de nível de módulo com seus argumentos, serializadas
+por pickle. O protocolo é o de multiprocessing.connection, da biblioteca
+padrão.
+
+As conexões trocam funções serializadas por pickle nos dois sentidos: quem
+conhece a chave executa código no outro lado. Com processos locais, a
+chave é gerada a cada sessão (secrets.token_bytes); com nós remotos, ela
+é obrigatória e deve ser combinada fora do programa.
+
+Para ligar um nó de outra máquina ao coordenador:
+    python nos_locais.py <host> <porta> <chave>
+"""
+
+import multiprocessing
+import secrets
+import sys
+from multiprocessing.connection import Client, Listener, wait
+
+TAMANHO_CHAVE = 32
+
+# ========================================
+# NÓ DE TRABALHO
+# ========================================
+
+def servir_no(endereco, chave):
+    """Laço de um nó: recebe (funcao, argumentos), devolve (ok, resultado) até receber None"""
+    with Client(endereco, authkey=chave) as conexao:
+        while True:
+            tarefa = conexao.recv()
+            if tarefa is None:
+                break
+            funcao, argumentos = tarefa
+            try:
+                conexao.send((True, funcao(*argumentos)))
+            except Exception as erro:
+                conexao.send((False, repr(erro)))
+
+# ========================================
+# COORDENADOR
+# ========================================
+
+def iniciar_nos(num_nos, host='127.0.0.1', porta=0, chave=None, processos_locais=True):
+    """Abre o Listener e aguarda num_nos conexões
+
+    Com processos_locais, os nós são processos desta máquina iniciados aqui
+    e, sem chave, uma chave aleatória é gerada para a sessão; sem
+    processos_locais, o endereço é impresso, os nós devem ser ligados à mão
+    (ver o cabeçalho do módulo) e a chave é obrigatória. Retorna o dict
+    usado por mapear_nos e encerrar_nos, ou None sem chave para nós remotos.
+    """
+    if chave is None:
+        if not processos_locais:
+            print("Erro: nós remotos exigem uma chave explícita (chave=...)")
+            return None
+        chave = secrets.token_bytes(TAMANHO_CHAVE)
+    elif isinstance(chave, str):
+        chave = chave.encode()
+    listener = Listener((host, porta), authkey=chave)
+    processos = []
+    if processos_locais:
+        for _ in range(num_nos):
+            processo = multiprocessing.Process(target=servir_no, args=(listener.address, chave),
+                                               daemon=True)
+            processo.start()
+            processos.append(processo)
+    else:
+        print(f"Aguardando {num_nos} nós em {listener.address[0]}:{listener.address[1]}")
+
+    conexoes = [listener.accept() for _ in range(num_nos)]
+    return {'listener': listener, 'conexoes': conexoes, 'processos': processos}
+
+def mapear_nos(nos, funcao, lista_argumentos):
+    """Executa funcao(*argumentos) para cada item, distribuindo as tarefas entre os nós
+
+    Cada nó recebe uma nova tarefa assim que devolve a anterior; os
+    resultados voltam na ordem de lista_argumentos. Se uma tarefa falha,
+    nenhuma outra é enviada e as respostas ainda pendentes são lidas antes
+    do erro, para os nós ficarem prontos para a próxima chamada.
+    """
+    lista_argumentos = list(lista_argumentos)
+    resultados = [None] * len(lista_argumentos)
+    pendentes = {}
+    proxima = 0
+    falha = None
+
+    livres = list(nos['conexoes'])
+    while pendentes or (falha is None and proxima < len(lista_argumentos)):
+        while falha is None and livres and proxima < len(lista_argumentos):
+            conexao = livres.pop()
+            conexao.send((funcao, lista_argumentos[proxima]))
+            pendentes[conexao] = proxima
+            proxima += 1
+        for conexao in wait(list(pendentes)):
+            ok, resultado = conexao.recv()
+            indice = pendentes.pop(conexao)
+            livres.append(conexao)
+            if ok:
+                resultados[indice] = resultado
+            elif falha is None:
+                falha = f"Tarefa {indice} falhou no nó: {resultado}"
+    if falha is not None:
+        raise RuntimeError(falha)
+    return resultados
+
+def encerrar_nos(nos):
+    """Envia o sinal de parada a todos os nós e fecha o Listener"""
+    for conexao in nos['conexoes']:
+        try:
+            conexao.send(None)
+        except OSError:
+            pass
+        conexao.close()
+    for processo in nos['processos']:
+        processo.join(timeout=5)
+    nos['listener'].close()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or not sys.argv[3]:
+        print("Uso: python nos_locais.py <host> <porta> <chave>")
+        print("A chave é obrigatória: é a mesma passada a iniciar_nos no coordenador")
+        sys.exit(1)
+    servir_no((sys.argv[1], int(sys.argv[2])), sys.argv[3].encode())
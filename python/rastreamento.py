@@ -0,0 +1,93 @@
+"""
+Linha do tempo de uma resolução no formato Chrome trace
+Grava trechos (construção, cada fase de cada pivô, extração, montagem do
+modelo e resolução nas bibliotecas) num buffer circular pré-alocado e os
+exporta como JSON de eventos 'X' (duração completa), aberto em
+chrome://tracing ou em https://ui.perfetto.dev.
+
+Durante a medição só há escrita em posições já alocadas: o nome é trocado
+por um código inteiro e início/fim vão para arrays NumPy. Quando o buffer
+enche, os trechos mais antigos são sobrescritos (a exportação informa
+quantos foram descartados).
+"""
+
+import os
+import json
+import time
+import contextlib
+
+import numpy as np
+
+CAPACIDADE_PADRAO = 1 << 18
+
+# ========================================
+# BUFFER CIRCULAR
+# ========================================
+
+def criar_rastreador(capacidade=CAPACIDADE_PADRAO):
+    """Buffer de `capacidade` trechos; tempos em segundos de time.perf_counter"""
+    return {
+        'capacidade': capacidade,
+        'nomes': [],
+        'codigos': {},
+        'codigo': np.zeros(capacidade, dtype=np.int32),
+        'inicio': np.zeros(capacidade),
+        'fim': np.zeros(capacidade),
+        'total': 0,
+        'origem': time.perf_counter(),
+    }
+
+def registrar_trecho(rastreador, nome, inicio, fim):
+    """Grava um trecho [inicio, fim] (perf_counter), sobrescrevendo o mais antigo se cheio"""
+    codigos = rastreador['codigos']
+    codigo = codigos.get(nome)
+    if codigo is None:
+        codigo = codigos[nome] = len(rastreador['nomes'])
+        rastreador['nomes'].append(nome)
+    posicao = rastreador['total'] % rastreador['capacidade']
+    rastreador['codigo'][posicao] = codigo
+    rastreador['inicio'][posicao] = inicio
+    rastreador['fim'][posicao] = fim
+    rastreador['total'] += 1
+
+@contextlib.contextmanager
+def trecho(rastreador, nome):
+    """Mede o bloco `with` como um trecho; sem rastreador não faz nada"""
+    if rastreador is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_trecho(rastreador, nome, inicio, time.perf_counter())
+
+# ========================================
+# EXPORTAÇÃO
+# ========================================
+
+def eventos_chrome(rastreador, processo='transporte'):
+    """Lista de eventos do Chrome trace (ts e dur em microssegundos), em ordem de gravação"""
+    total, capacidade = rastreador['total'], rastreador['capacidade']
+    guardados = min(total, capacidade)
+    posicoes = np.arange(total - guardados, total) % capacidade
+    inicio = (rastreador['inicio'][posicoes] - rastreador['origem']) * 1e6
+    duracao = (rastreador['fim'][posicoes] - rastreador['inicio'][posicoes]) * 1e6
+    nomes = rastreador['nomes']
+    pid = os.getpid()
+
+    eventos = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': processo}}]
+    eventos.extend({'name': nomes[codigo], 'cat': nomes[codigo].split('.', 1)[0], 'ph': 'X',
+                    'ts': ts, 'dur': dur, 'pid': pid, 'tid': 0}
+                   for codigo, ts, dur in zip(rastreador['codigo'][posicoes].tolist(),
+                                              inicio.tolist(), duracao.tolist()))
+    return eventos
+
+def exportar_chrome(rastreador, caminho, processo='transporte'):
+    """Grava o JSON do Chrome trace; retorna o número de trechos exportados"""
+    eventos = eventos_chrome(rastreador, processo)
+    descartados = max(0, rastreador['total'] - rastreador['capacidade'])
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms',
+                   'otherData': {'trechos_descartados': descartados}}, f)
+    return len(eventos) - 1
@@ -0,0 +1,187 @@
+"""
+Redes de transporte esparsas: apenas as rotas permitidas (arcos) existem.
+Uma rede é guardada como três arrays paralelos (origem, destino, custo),
+de modo que memória e tempo escalam com o número de arcos e não com m × n.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from gerador_instancias import gerar_oferta_demanda
+
+class RedeEsparsa(NamedTuple):
+    """Rotas permitidas de um problema de transporte m × n"""
+    m: int
+    n: int
+    origem: np.ndarray   # índice da origem de cada arco (0..m-1)
+    destino: np.ndarray  # índice do destino de cada arco (0..n-1)
+    custo: np.ndarray    # custo unitário de cada arco
+    capacidade: Optional[np.ndarray] = None  # limite superior de cada arco (None = sem limites)
+
+    @property
+    def num_arcos(self):
+        return len(self.origem)
+
+# ========================================
+# CONSTRUÇÃO
+# ========================================
+
+def criar_rede(m, n, origem, destino, custo, capacidade=None):
+    """Valida e cria uma rede a partir de arrays de arcos"""
+    origem = np.asarray(origem, dtype=np.int64)
+    destino = np.asarray(destino, dtype=np.int64)
+    custo = np.asarray(custo, dtype=np.float64)
+
+    if not (len(origem) == len(destino) == len(custo)):
+        raise ValueError("origem, destino e custo devem ter o mesmo tamanho")
+    if capacidade is not None:
+        capacidade = np.asarray(capacidade, dtype=np.float64)
+        if len(capacidade) != len(origem):
+            raise ValueError("capacidade deve ter um valor por arco")
+        if np.any(capacidade < 0):
+            raise ValueError("Capacidades devem ser não negativas")
+    if len(origem) and (origem.min() < 0 or origem.max() >= m):
+        raise ValueError(f"Índice de origem fora de 0..{m - 1}")
+    if len(destino) and (destino.min() < 0 or destino.max() >= n):
+        raise ValueError(f"Índice de destino fora de 0..{n - 1}")
+
+    return RedeEsparsa(m, n, origem, destino, custo, capacidade)
+
+def rede_de_matriz(custos, permitido=None, capacidade=None):
+    """Converte uma matriz de custos (e máscara opcional de rotas permitidas) em rede
+
+    capacidade, se informada, é uma matriz m × n com o limite de cada rota.
+    """
+    custos = np.asarray(custos)
+    m, n = custos.shape
+    if permitido is None:
+        origem = np.repeat(np.arange(m, dtype=np.int64), n)
+        destino = np.tile(np.arange(n, dtype=np.int64), m)
+    else:
+        origem, destino = np.nonzero(np.asarray(permitido, dtype=bool))
+    if capacidade is not None:
+        capacidade = np.asarray(capacidade, dtype=np.float64)[origem, destino]
+    return RedeEsparsa(m, n, origem.astype(np.int64), destino.astype(np.int64),
+                       custos[origem, destino].astype(np.float64), capacidade)
+
+def arcos_do_problema(oferta, demanda, custos):
+    """Retorna a rede de um problema, seja ele denso (matriz) ou já esparso"""
+    if isinstance(custos, RedeEsparsa):
+        return custos
+    return rede_de_matriz(np.asarray(custos).reshape(len(oferta), len(demanda)))
+
+def arcos_por_no(rede):
+    """Índices dos arcos agrupados por origem e por destino (listas de arrays)"""
+    ordem = np.argsort(rede.origem, kind='stable')
+    cortes = np.searchsorted(rede.origem[ordem], np.arange(1, rede.m))
+    por_origem = np.split(ordem, cortes)
+
+    ordem = np.argsort(rede.destino, kind='stable')
+    cortes = np.searchsorted(rede.destino[ordem], np.arange(1, rede.n))
+    por_destino = np.split(ordem, cortes)
+
+    return por_origem, por_destino
+
+def construir_restricoes_rede_csr(rede):
+    """Matriz de restrições (m + n) × num_arcos em CSR: uma coluna por arco"""
+    import scipy.sparse as sp
+
+    k = rede.num_arcos
+    linhas = np.concatenate([rede.origem, rede.m + rede.destino])
+    colunas = np.concatenate([np.arange(k), np.arange(k)])
+    return sp.csr_matrix((np.ones(2 * k), (linhas, colunas)), shape=(rede.m + rede.n, k))
+
+# ========================================
+# VALIDAÇÃO
+# ========================================
+
+def nos_sem_arcos(rede, oferta, demanda):
+    """Origens com oferta e destinos com demanda que não têm nenhum arco"""
+    grau_origem = np.bincount(rede.origem, minlength=rede.m)
+    grau_destino = np.bincount(rede.destino, minlength=rede.n)
+    origens = np.flatnonzero((grau_origem == 0) & (np.asarray(oferta) > 0))
+    destinos = np.flatnonzero((grau_destino == 0) & (np.asarray(demanda) > 0))
+    return origens, destinos
+
+# ========================================
+# GERADOR
+# ========================================
+
+def _arcos_canto_noroeste(oferta, demanda):
+    """Arcos (origem, destino, quantidade) da solução do canto noroeste: garantem que a rede seja viável"""
+    oferta = np.asarray(oferta, dtype=np.int64)
+    demanda = np.asarray(demanda, dtype=np.int64)
+    acumulado_oferta = np.cumsum(oferta)
+    acumulado_demanda = np.cumsum(demanda)
+
+    # Cada ponto de corte das somas acumuladas gera uma célula (i, j) do caminho
+    cortes = np.union1d(acumulado_oferta, acumulado_demanda)
+    cortes = cortes[cortes > 0]
+    inicio = np.concatenate([[0], cortes[:-1]])
+    origem = np.searchsorted(acumulado_oferta, inicio, side='right')
+    destino = np.searchsorted(acumulado_demanda, inicio, side='right')
+    return origem, destino, cortes - inicio
+
+def gerar_rede_esparsa(m, n, densidade=0.05, total=100000, semente=42, lado=100.0,
+                       capacidade_media=None):
+    """Gera (oferta, demanda, rede) com ~densidade·m·n rotas e custos euclidianos
+
+    Nenhuma matriz m × n é criada: os arcos são sorteados por índice linear
+    e os custos calculados apenas para eles. Os arcos do canto noroeste são
+    sempre incluídos para que a instância seja viável. Com capacidade_media,
+    cada arco recebe capacidade uniforme em [0.5, 1.5] × capacidade_media
+    (elevada, nos arcos do canto noroeste, até o fluxo daquela solução).
+    """
+    rng = np.random.default_rng(semente)
+    oferta, demanda = gerar_oferta_demanda(rng, m, n, total)
+
+    num_sorteados = int(densidade * m * n)
+    sorteados = rng.integers(0, m * n, size=num_sorteados)
+    noroeste_i, noroeste_j, noroeste_fluxo = _arcos_canto_noroeste(oferta, demanda)
+    indices = np.unique(np.concatenate([sorteados, noroeste_i * n + noroeste_j]))
+    origem = indices // n
+    destino = indices % n
+
+    coord_origens = rng.uniform(0, lado, size=(m, 2))
+    coord_destinos = rng.uniform(0, lado, size=(n, 2))
+    distancia = np.hypot(*(coord_origens[origem] - coord_destinos[destino]).T)
+    custo = np.rint(distancia) + 1
+
+    capacidade = None
+    if capacidade_media is not None:
+        capacidade = np.rint(rng.uniform(0.5, 1.5, size=len(indices)) * capacidade_media)
+        posicao = np.searchsorted(indices, noroeste_i * n + noroeste_j)
+        np.maximum.at(capacidade, posicao, noroeste_fluxo)
+
+    return oferta, demanda, RedeEsparsa(m, n, origem, destino, custo, capacidade)
+
+def gerar_rede_separavel(m, n, num_blocos=4, densidade=0.05, total=100000, semente=42, lado=100.0,
+                         capacidade_media=None):
+    """Gera (oferta, demanda, rede) formada por num_blocos sub-redes independentes
+
+    Origens e destinos são repartidos em blocos contíguos; cada bloco é uma
+    rede de gerar_rede_esparsa balanceada por si só e nenhum arco liga blocos
+    diferentes (cada bloco é uma componente conexa separada).
+    """
+    cortes_m = np.linspace(0, m, num_blocos + 1).astype(np.int64)
+    cortes_n = np.linspace(0, n, num_blocos + 1).astype(np.int64)
+    total_blocos = np.full(num_blocos, total // num_blocos)
+    total_blocos[-1] += total - total_blocos.sum()
+
+    ofertas, demandas, origens, destinos, custos, capacidades = [], [], [], [], [], []
+    for b in range(num_blocos):
+        oferta, demanda, rede = gerar_rede_esparsa(cortes_m[b + 1] - cortes_m[b], cortes_n[b + 1] - cortes_n[b],
+                                                   densidade, int(total_blocos[b]), semente + b, lado,
+                                                   capacidade_media)
+        ofertas.append(oferta)
+        demandas.append(demanda)
+        origens.append(cortes_m[b] + rede.origem)
+        destinos.append(cortes_n[b] + rede.destino)
+        custos.append(rede.custo)
+        capacidades.append(rede.capacidade)
+
+    capacidade = None if capacidade_media is None else np.concatenate(capacidades)
+    return (np.concatenate(ofertas), np.concatenate(demandas),
+            RedeEsparsa(m, n, np.concatenate(origens), np.concatenate(destinos), np.concatenate(custos),
+                        capacidade))
@@ -0,0 +1,146 @@
+"""
+Gravação esparsa de soluções do Problema de Transporte
+Só os fluxos positivos vão para o arquivo, como triplas (origem, destino,
+fluxo), gravadas em blocos e sem passar pelo stdout.
+
+Formatos (escolhidos pela extensão do arquivo):
+    .csv:   cabeçalho origem,destino,fluxo e uma tripla por linha
+    .jsonl: 1ª linha {"m", "n", "custo_total", "num_fluxos"}; demais linhas
+            {"origem", "destino", "fluxo"}
+    .sol:   binário little-endian: cabeçalho (32 bytes): magic 'TRSO',
+            versão (uint16), reservado (2 bytes), m (uint32), n (uint32),
+            num_fluxos (uint64), custo_total (float64); depois
+            origem int32[k], destino int32[k], fluxo float64[k]
+
+Índices a partir de 0, como no CSV de arcos do carregador_instancias.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from rede_esparsa import RedeEsparsa
+
+MAGIC = b'TRSO'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sH2xIIQd')
+
+FORMATOS = {'.csv': 'csv', '.jsonl': 'jsonl', '.sol': 'binario'}
+
+TRIPLAS_POR_BLOCO = 65536
+
+# ========================================
+# TRIPLAS
+# ========================================
+
+def fluxos_positivos(valores, n=None, rede=None, tolerancia=1e-6):
+    """Retorna (origem, destino, fluxo) das rotas com fluxo acima da tolerância
+
+    valores no layout denso i*n + j (informar n) ou um valor por arco de
+    `rede` (RedeEsparsa).
+    """
+    valores = np.asarray(valores, dtype=np.float64).ravel()
+    indices = np.flatnonzero(valores > tolerancia)
+    if rede is not None:
+        origem, destino = rede.origem[indices], rede.destino[indices]
+    else:
+        origem, destino = np.divmod(indices, n)
+    return origem, destino, valores[indices]
+
+def _formato(caminho, formato):
+    if formato is not None:
+        return formato
+    for extensao, nome in FORMATOS.items():
+        if str(caminho).endswith(extensao):
+            return nome
+    raise ValueError(f"{caminho}: extensão desconhecida (use {', '.join(FORMATOS)})")
+
+# ========================================
+# ESCRITA
+# ========================================
+
+def _escrever_csv(caminho, origem, destino, fluxo, tamanho_bloco):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        f.write("origem,destino,fluxo\n")
+        for inicio in range(0, len(fluxo), tamanho_bloco):
+            fim = inicio + tamanho_bloco
+            f.write(''.join(f"{i},{j},{x!r}\n"
+                            for i, j, x in zip(origem[inicio:fim].tolist(), destino[inicio:fim].tolist(),
+                                               fluxo[inicio:fim].tolist())))
+
+def _escrever_jsonl(caminho, origem, destino, fluxo, m, n, custo_total, tamanho_bloco):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'m': m, 'n': n, 'custo_total': custo_total, 'num_fluxos': len(fluxo)}) + "\n")
+        for inicio in range(0, len(fluxo), tamanho_bloco):
+            fim = inicio + tamanho_bloco
+            f.write(''.join(f'{{"origem": {i}, "destino": {j}, "fluxo": {x!r}}}\n'
+                            for i, j, x in zip(origem[inicio:fim].tolist(), destino[inicio:fim].tolist(),
+                                               fluxo[inicio:fim].tolist())))
+
+def _escrever_binario(caminho, origem, destino, fluxo, m, n, custo_total):
+    with open(caminho, 'wb') as f:
+        f.write(CABECALHO.pack(MAGIC, VERSAO, m, n, len(fluxo),
+                               np.nan if custo_total is None else custo_total))
+        f.write(np.asarray(origem, dtype='<i4').tobytes())
+        f.write(np.asarray(destino, dtype='<i4').tobytes())
+        f.write(np.asarray(fluxo, dtype='<f8').tobytes())
+
+def escrever_solucao(caminho, valores, m, n, custos=None, custo_total=None, formato=None,
+                     tolerancia=1e-6, tamanho_bloco=TRIPLAS_POR_BLOCO):
+    """Grava os fluxos positivos de uma solução; retorna o número de triplas gravadas
+
+    valores no layout i*n + j ou, se custos for uma RedeEsparsa, um valor por
+    arco. formato 'csv', 'jsonl' ou 'binario' (padrão: pela extensão).
+    """
+    formato = _formato(caminho, formato)
+    rede = custos if isinstance(custos, RedeEsparsa) else None
+    origem, destino, fluxo = fluxos_positivos(valores, n, rede, tolerancia)
+
+    if formato == 'csv':
+        _escrever_csv(caminho, origem, destino, fluxo, tamanho_bloco)
+    elif formato == 'jsonl':
+        _escrever_jsonl(caminho, origem, destino, fluxo, m, n, custo_total, tamanho_bloco)
+    elif formato == 'binario':
+        _escrever_binario(caminho, origem, destino, fluxo, m, n, custo_total)
+    else:
+        raise ValueError(f"Formato de solução não suportado: {formato}")
+    return len(fluxo)
+
+# ========================================
+# LEITURA
+# ========================================
+
+def carregar_solucao(caminho, formato=None):
+    """Lê uma solução gravada por escrever_solucao; retorna (origem, destino, fluxo)
+
+    O formato binário é lido via memory-map, sem cópia.
+    """
+    formato = _formato(caminho, formato)
+    if formato == 'binario':
+        dados = np.memmap(caminho, dtype=np.uint8, mode='r')
+        magic, versao, _, _, k, _ = CABECALHO.unpack(dados[:CABECALHO.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{caminho}: não é um arquivo de solução de transporte")
+        if versao != VERSAO:
+            raise ValueError(f"{caminho}: versão {versao} não suportada")
+        inicio = CABECALHO.size
+        if len(dados) < inicio + 16 * k:
+            raise ValueError(f"{caminho}: arquivo truncado")
+        origem = dados[inicio:inicio + 4 * k].view('<i4')
+        destino = dados[inicio + 4 * k:inicio + 8 * k].view('<i4')
+        fluxo = dados[inicio + 8 * k:inicio + 16 * k].view('<f8')
+        return origem, destino, fluxo
+
+    if formato == 'csv':
+        with open(caminho, encoding='utf-8') as f:
+            next(f, None)
+            triplas = [linha.split(',') for linha in f if linha.strip()]
+    elif formato == 'jsonl':
+        with open(caminho, encoding='utf-8') as f:
+            next(f, None)
+            triplas = [(r['origem'], r['destino'], r['fluxo']) for r in map(json.loads, filter(str.strip, f))]
+    else:
+        raise ValueError(f"Formato de solução não suportado: {formato}")
+    triplas = np.array(triplas, dtype=np.float64).reshape(-1, 3)
+    return triplas[:, 0].astype(np.int64), triplas[:, 1].astype(np.int64), triplas[:, 2].copy()
@@ -0,0 +1,195 @@
+"""
+Análise de sensibilidade a partir da base ótima do Simplex de Rede
+Com a árvore final e os potenciais, uma única passada vetorizada dá os
+custos reduzidos de todos os arcos, o intervalo de custo de cada arco em
+que a base continua ótima e o intervalo de suprimento de cada nó em que
+ela continua viável. Substitui as re-resoluções do tipo "e se".
+
+Convenções (as do motor): custo reduzido c + pi[cauda] - pi[cabeca]; no
+problema de transporte u_i = -pi[i] e v_j = pi[m + j], com u_i + v_j = c_ij
+nas rotas da base.
+"""
+
+import numpy as np
+
+# ========================================
+# ÁRVORE DA BASE
+# ========================================
+
+def _arvore_da_base(num_nos, cauda, cabeca, base, referencia):
+    """Reconstrói a floresta da base com raiz virtual num_nos
+
+    A componente de `referencia` é enraizada nela; as demais (ligadas à raiz
+    por arcos artificiais degenerados) num nó qualquer. Retorna (pai,
+    arco_pai (-1 = artificial), para_cima (arco aponta do filho para o pai),
+    profundidade, níveis: lista com os nós de cada profundidade >= 1).
+    """
+    raiz = num_nos
+    vizinhos = [[] for _ in range(num_nos)]
+    for k, t, h in zip(base.tolist(), cauda[base].tolist(), cabeca[base].tolist()):
+        vizinhos[t].append((h, k))
+        vizinhos[h].append((t, k))
+
+    pai = np.full(num_nos + 1, raiz, dtype=np.int64)
+    arco_pai = np.full(num_nos + 1, -1, dtype=np.int64)
+    profundidade = np.zeros(num_nos + 1, dtype=np.int64)
+    visitado = [False] * num_nos
+    inicios = [referencia] + [v for v in range(num_nos) if v != referencia]
+    for r in inicios:
+        if visitado[r]:
+            continue
+        visitado[r] = True
+        profundidade[r] = 1
+        fila = [r]
+        for v in fila:
+            for w, k in vizinhos[v]:
+                if not visitado[w]:
+                    visitado[w] = True
+                    pai[w] = v
+                    arco_pai[w] = k
+                    profundidade[w] = profundidade[v] + 1
+                    fila.append(w)
+    pai[raiz] = raiz
+
+    para_cima = np.zeros(num_nos + 1, dtype=bool)
+    reais = np.flatnonzero(arco_pai >= 0)
+    para_cima[reais] = cauda[arco_pai[reais]] == reais
+
+    ordem = np.argsort(profundidade[:num_nos], kind='stable')
+    cortes = np.searchsorted(profundidade[ordem], np.arange(2, profundidade.max() + 1))
+    niveis = np.split(ordem, cortes)
+    return pai, arco_pai, para_cima, profundidade, niveis
+
+# ========================================
+# INTERVALOS DE CUSTO
+# ========================================
+
+def _folgas_arcos_base(pai, arco_pai, para_cima, profundidade, cauda, cabeca, fora, folga, lado):
+    """Quanto o custo de cada arco da base pode subir e descer (indexado pelo nó filho)
+
+    Mudar o custo do arco do nó w em δ desloca os potenciais da subárvore de
+    w em -δ (arco para cima) ou +δ (para baixo), e com eles o custo reduzido
+    dos arcos fora da base cujo ciclo passa por w. Os ciclos são percorridos
+    juntos, um passo de subida por iteração, para todos os arcos fora da base.
+    """
+    num_nos = len(pai)
+    aumento = np.full(num_nos, np.inf)
+    reducao = np.full(num_nos, np.inf)
+
+    a = cauda[fora]
+    b = cabeca[fora]
+    ativos = np.arange(len(fora))
+    while len(ativos):
+        pa, pb = profundidade[a], profundidade[b]
+        for no, lado_no, sobe in ((a, lado, pa >= pb), (b, -lado, pb >= pa)):
+            w = no[sobe]
+            # Variação do custo reduzido por unidade de δ, já no sentido da folga do arco
+            g = np.where(para_cima[w], -1, 1) * lado_no[sobe]
+            f = folga[ativos[sobe]]
+            np.minimum.at(aumento, w[g < 0], f[g < 0])
+            np.minimum.at(reducao, w[g > 0], f[g > 0])
+        a = np.where(pa >= pb, pai[a], a)
+        b = np.where(pb >= pa, pai[b], b)
+        continua = a != b
+        a, b, ativos, lado = a[continua], b[continua], ativos[continua], lado[continua]
+    return aumento, reducao
+
+# ========================================
+# INTERVALOS DE SUPRIMENTO
+# ========================================
+
+def _folgas_caminho(pai, arco_pai, para_cima, niveis, fluxo, capacidade, referencia):
+    """Quanto o suprimento de cada nó pode subir e descer, compensado na raiz da sua árvore
+
+    Mais δ no nó v manda δ unidades pelo caminho da árvore de v até a raiz;
+    o limite é o menor, ao longo do caminho, entre o fluxo que pode ser
+    reduzido e a capacidade que sobra. Arcos artificiais não aceitam fluxo.
+    """
+    num_nos = len(pai)
+    sobe = np.zeros(num_nos)
+    desce = np.zeros(num_nos)
+    reais = np.flatnonzero(arco_pai >= 0)
+    k = arco_pai[reais]
+    livre = fluxo[k]
+    restante = (np.inf if capacidade is None else capacidade[k]) - fluxo[k]
+    sobe[reais] = np.where(para_cima[reais], restante, livre)
+    desce[reais] = np.where(para_cima[reais], livre, restante)
+
+    aumento = np.full(num_nos, np.inf)
+    reducao = np.full(num_nos, np.inf)
+    for nivel, nos in enumerate(niveis):
+        if nivel == 0:
+            # Raízes: fora a referência, pendem da raiz virtual por arcos artificiais
+            aumento[nos] = reducao[nos] = np.where(nos == referencia, np.inf, 0.0)
+            continue
+        aumento[nos] = np.minimum(aumento[pai[nos]], sobe[nos])
+        reducao[nos] = np.minimum(reducao[pai[nos]], desce[nos])
+    return aumento, reducao
+
+# ========================================
+# ANÁLISE COMPLETA
+# ========================================
+
+def analisar_base(suprimento, cauda, cabeca, custo, resultado, capacidade=None, referencia=None,
+                  tolerancia=1e-9):
+    """Custos reduzidos e intervalos de sensibilidade de uma solução ótima de simplex_rede
+
+    resultado é o dict de simplex_rede (usa fluxo, potenciais e base).
+    Retorna dict com custos_reduzidos, custo_minimo/custo_maximo (por arco: a
+    base continua ótima com o custo do arco nesse intervalo, os demais fixos)
+    e suprimento_minimo/suprimento_maximo (por nó: a base continua viável,
+    com a diferença compensada no nó `referencia`, padrão o último nó; o
+    intervalo da própria referência é nan).
+    """
+    suprimento = np.asarray(suprimento, dtype=np.float64)
+    cauda = np.asarray(cauda, dtype=np.int64)
+    cabeca = np.asarray(cabeca, dtype=np.int64)
+    custo = np.asarray(custo, dtype=np.float64)
+    num_nos = len(suprimento)
+    if referencia is None:
+        referencia = num_nos - 1
+
+    pi = resultado['potenciais'][:num_nos]
+    fluxo = resultado['fluxo']
+    base = np.asarray(resultado['base'], dtype=np.int64)
+    custos_reduzidos = custo + pi[cauda] - pi[cabeca]
+    tolerancia = tolerancia * (1.0 + float(np.abs(custo).max(initial=0.0)))
+
+    pai, arco_pai, para_cima, profundidade, niveis = _arvore_da_base(
+        num_nos, cauda, cabeca, base, referencia)
+
+    # Arcos fora da base: no limite inferior (folga = custo reduzido >= 0) ou
+    # no superior (folga = -custo reduzido >= 0)
+    na_base = np.zeros(len(custo), dtype=bool)
+    na_base[base] = True
+    fora = np.flatnonzero(~na_base)
+    lado = np.ones(len(fora), dtype=np.int64)
+    if capacidade is not None:
+        capacidade = np.asarray(capacidade, dtype=np.float64)
+        lado[(fluxo[fora] > tolerancia) & (fluxo[fora] >= capacidade[fora] - tolerancia)] = -1
+    folga = np.maximum(lado * custos_reduzidos[fora], 0.0)
+
+    custo_minimo = np.empty(len(custo))
+    custo_maximo = np.empty(len(custo))
+    custo_minimo[fora] = np.where(lado > 0, custo[fora] - folga, -np.inf)
+    custo_maximo[fora] = np.where(lado > 0, np.inf, custo[fora] + folga)
+
+    aumento, reducao = _folgas_arcos_base(pai, arco_pai, para_cima, profundidade,
+                                          cauda, cabeca, fora, folga, lado)
+    filhos = np.flatnonzero(arco_pai >= 0)
+    arcos_base = arco_pai[filhos]
+    custo_minimo[arcos_base] = custo[arcos_base] - reducao[filhos]
+    custo_maximo[arcos_base] = custo[arcos_base] + aumento[filhos]
+
+    sobe, desce = _folgas_caminho(pai, arco_pai, para_cima, niveis, fluxo, capacidade, referencia)
+    suprimento_minimo = suprimento - desce[:num_nos]
+    suprimento_maximo = suprimento + sobe[:num_nos]
+    suprimento_minimo[referencia] = suprimento_maximo[referencia] = np.nan
+
+    return {
+        'custos_reduzidos': custos_reduzidos,
+        'custo_minimo': custo_minimo,
+        'custo_maximo': custo_maximo,
+        'suprimento_minimo': suprimento_minimo,
+        'suprimento_maximo': suprimento_maximo,
+    }
@@ -2,6 +2,13 @@ import random
 import time
 import psutil
 import os
+import sys
+
+from balanceamento import penalidades
+from certificado import verificar_solucao
+from saida_solucao import escrever_solucao
+from instrumentacao import registrar
+from rastreamento import criar_rastreador, exportar_chrome, trecho
 
 def mostrar_tabela(tabela):
     print("\nTabela Simplex:")
@@ -56,11 +63,20 @@ def pivotear(tabela, linha_pivo, coluna_pivo):
             for j in range(num_colunas):
                 tabela[i][j] -= multiplicador * tabela[linha_pivo][j]
 
-def simplex(tabela, verbose=False, max_iteracoes=1000000):
-    """Algoritmo Simplex padrão"""
+def simplex(tabela, verbose=False, max_iteracoes=1000000, instrumentacao=None, callback=None,
+            rastreador=None):
+    """Algoritmo Simplex padrão
+
+    instrumentacao (dict de criar_instrumentacao) acumula o tempo de cada
+    fase; callback(iteracao, entrando, saindo, objetivo, passo) é chamado
+    após cada pivô.
+    rastreador (de rastreamento.criar_rastreador) grava as fases como trechos
+    da linha do tempo.
+    """
     print("Iniciando método Simplex...")
     inicio = time.time()
     iteracao = 0
+    medir = instrumentacao is not None or rastreador is not None
     
     while iteracao < max_iteracoes:
         iteracao += 1
@@ -70,8 +86,13 @@ def simplex(tabela, verbose=False, max_iteracoes=1000000):
             if verbose:
                 mostrar_tabela(tabela)
         
+        if medir:
+            marca = time.perf_counter()
+        
         # Passo 1: Encontrar coluna pivô
         coluna_pivo = encontrar_coluna_pivo(tabela)
+        if medir:
+            marca = registrar(instrumentacao, 'precificacao', marca, rastreador)
         if coluna_pivo == -1:
             tempo_total = time.time() - inicio
             print(f"Solução ótima encontrada em {iteracao} iterações!")
@@ -80,6 +101,8 @@ def simplex(tabela, verbose=False, max_iteracoes=1000000):
         
         # Passo 2: Encontrar linha pivô
         linha_pivo = encontrar_linha_pivo(tabela, coluna_pivo)
+        if medir:
+            marca = registrar(instrumentacao, 'razao', marca, rastreador)
         if linha_pivo == -1:
             print("Problema ilimitado - não há solução ótima finita.")
             break
@@ -88,16 +111,28 @@ def simplex(tabela, verbose=False, max_iteracoes=1000000):
             print(f"Pivoteando: linha {linha_pivo + 1}, coluna {coluna_pivo + 1}")
             print(f"Elemento pivô: {tabela[linha_pivo][coluna_pivo]:.6f}")
         
+        if callback is not None:
+            passo = tabela[linha_pivo][-1] / tabela[linha_pivo][coluna_pivo]
+        
         # Passo 3: Pivotear
         pivotear(tabela, linha_pivo, coluna_pivo)
+        if medir:
+            registrar(instrumentacao, 'pivoteamento', marca, rastreador)
+        if callback is not None:
+            callback(iteracao, coluna_pivo, linha_pivo, -tabela[-1][-1], passo)
     
     if iteracao >= max_iteracoes:
         print(f"ATENÇÃO: Limite de {max_iteracoes} iterações atingido!")
     
     return tabela
 
-def construir_tabela_transporte(oferta, demanda, custos):
-    """Constrói a tabela simplex para o problema de transporte"""
+def construir_tabela_transporte(oferta, demanda, custos, custo_ficticio=0.0):
+    """Constrói a tabela simplex para o problema de transporte
+
+    Se oferta ≠ demanda, a diferença vai para um nó fictício: uma coluna por
+    origem (oferta não enviada) ou por destino (demanda não atendida), logo
+    após as variáveis x_ij e com custo custo_ficticio por unidade.
+    """
     m = len(oferta)  # número de origens
     n = len(demanda) # número de destinos
     num_vars = m * n  # variáveis x_ij
@@ -108,11 +143,13 @@ def construir_tabela_transporte(oferta, demanda, custos):
     # Verificar balanceamento
     total_oferta = sum(oferta)
     total_demanda = sum(demanda)
-    if abs(total_oferta - total_demanda) > 1e-6:
-        print(f"ERRO: Problema desbalanceado!")
+    excesso = total_oferta - total_demanda
+    num_ficticias = 0
+    if abs(excesso) > 1e-6:
+        num_ficticias = m if excesso > 0 else n
+        print(f"Problema desbalanceado: adicionando {num_ficticias} variáveis fictícias")
         print(f"Oferta total: {total_oferta}")
         print(f"Demanda total: {total_demanda}")
-        return None
     
     tabela = []
     
@@ -122,6 +159,11 @@ def construir_tabela_transporte(oferta, demanda, custos):
         for j in range(n):
             linha[i * n + j] = 1.0
         
+        # Variáveis fictícias (oferta não enviada)
+        ficticias = [0.0] * num_ficticias
+        if num_ficticias and excesso > 0:
+            ficticias[i] = 1.0
+        
         # Variáveis de folga para restrições de oferta
         folgas_oferta = [0.0] * m
         folgas_oferta[i] = 1.0
@@ -129,7 +171,7 @@ def construir_tabela_transporte(oferta, demanda, custos):
         # Variáveis de folga para restrições de demanda
         folgas_demanda = [0.0] * n
         
-        linha += folgas_oferta + folgas_demanda
+        linha += ficticias + folgas_oferta + folgas_demanda
         linha.append(float(oferta[i]))
         tabela.append(linha)
     
@@ -146,7 +188,12 @@ def construir_tabela_transporte(oferta, demanda, custos):
         folgas_demanda = [0.0] * n
         folgas_demanda[j] = 1.0
         
-        linha += folgas_oferta + folgas_demanda
+        # Variáveis fictícias (demanda não atendida)
+        ficticias = [0.0] * num_ficticias
+        if num_ficticias and excesso < 0:
+            ficticias[j] = 1.0
+        
+        linha += ficticias + folgas_oferta + folgas_demanda
         linha.append(float(demanda[j]))
         tabela.append(linha)
     
@@ -157,6 +204,10 @@ def construir_tabela_transporte(oferta, demanda, custos):
         for j in range(n):
             linha_obj.append(-float(custos[i][j]))
     
+    # Penalidade por unidade nas variáveis fictícias: escalar ou um valor por variável
+    if num_ficticias:
+        linha_obj += (-penalidades(custo_ficticio, num_ficticias)).tolist()
+    
     # Coeficientes zero para variáveis de folga
     linha_obj += [0.0] * (m + n)
     linha_obj.append(0.0)  # RHS da função objetivo
@@ -183,6 +234,14 @@ def extrair_solucao(tabela, m, n):
     
     return valores, custo_total
 
+def extrair_duais(tabela, m, n):
+    """Duais (u, v) lidos na linha objetivo, sob as colunas de folga das restrições"""
+    inicio = len(tabela[0]) - 1 - (m + n)
+    linha_obj = tabela[-1]
+    u = [-linha_obj[inicio + i] for i in range(m)]
+    v = [-linha_obj[inicio + m + j] for j in range(n)]
+    return u, v
+
 def gerar_problema_transporte_grande(m=15, n=15, semente=42):
     """Gera um problema de transporte balanceado"""
     random.seed(semente)
@@ -222,37 +281,45 @@ if __name__ == "__main__":
     m = 200   # número de origens
     n = 200   # número de destinos
     
+    # Saída: --silencioso não imprime vetores, matriz nem x_ij (só resumos);
+    # --saida=arquivo grava os fluxos positivos em .csv, .jsonl ou .sol (binário);
+    # --rastro=arquivo grava a linha do tempo (Chrome trace / Perfetto)
+    silencioso = '--silencioso' in sys.argv
+    arquivo_solucao = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--saida=')), None)
+    arquivo_rastro = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--rastro=')), None)
+    rastreador = criar_rastreador() if arquivo_rastro else None
+    
     print(f"\nGerando problema de transporte: {m}×{n}")
     
     # Gerar problema
     oferta, demanda, custos = gerar_problema_transporte_grande(m, n)
     
-    print(f"\nOferta: {oferta}")
-    print(f"Demanda: {demanda}")
+    if not silencioso:
+        print(f"\nOferta: {oferta}")
+        print(f"Demanda: {demanda}")
     print(f"Soma oferta: {sum(oferta)}")
     print(f"Soma demanda: {sum(demanda)}")
     
-    print("\nMatriz de custos:")
-    for i, linha in enumerate(custos):
-        print(f"Origem {i+1}: {linha}")
+    if not silencioso:
+        print("\nMatriz de custos:")
+        for i, linha in enumerate(custos):
+            print(f"Origem {i+1}: {linha}")
     
     # Construir tabela simplex
     print("\n" + "-" * 40)
-    tabela = construir_tabela_transporte(oferta, demanda, custos)
-    
-    if tabela is None:
-        print("Erro na construção da tabela!")
-        exit(1)
+    with trecho(rastreador, 'construcao'):
+        tabela = construir_tabela_transporte(oferta, demanda, custos)
     
     print(f"Tabela construída: {len(tabela)}×{len(tabela[0])}")
     
     # Resolver com Simplex
     print("\n" + "-" * 40)
-    tabela_final = simplex(tabela, verbose=False)
+    tabela_final = simplex(tabela, verbose=False, rastreador=rastreador)
     
     # Extrair e mostrar solução
     print("\n" + "-" * 40)
-    valores, custo_total = extrair_solucao(tabela_final, m, n)
+    with trecho(rastreador, 'simplex.extracao'):
+        valores, custo_total = extrair_solucao(tabela_final, m, n)
     
     print("SOLUÇÃO ÓTIMA:")
     print("-" * 20)
@@ -264,32 +331,38 @@ if __name__ == "__main__":
     memoria = processo.memory_info().rss / (1024 * 1024)  # MB
     cpu_percent = processo.cpu_percent(interval=1.0)  # % CPU
     
-    solucao_encontrada = False
-    for i in range(m):
-        for j in range(n):
-            x = valores[i * n + j]
-            if x > 1e-6:  # Mostrar apenas valores significativos
-                print(f"x_{i+1},{j+1} = {x:>10.2f}  (custo unitário: {custos[i][j]})")
-                solucao_encontrada = True
+    solucao_encontrada = any(x > 1e-6 for x in valores)
+    if not silencioso:
+        for i in range(m):
+            for j in range(n):
+                x = valores[i * n + j]
+                if x > 1e-6:  # Mostrar apenas valores significativos
+                    print(f"x_{i+1},{j+1} = {x:>10.2f}  (custo unitário: {custos[i][j]})")
     
     if not solucao_encontrada:
         print("Nenhuma variável com valor positivo encontrada.")
     
-    print(f"\nCUSTO TOTAL MÍNIMO: {custo_total:.2f}")
+    if arquivo_solucao is not None:
+        num_fluxos = escrever_solucao(arquivo_solucao, valores, m, n, custo_total=custo_total)
+        print(f"{num_fluxos} fluxos positivos gravados em {arquivo_solucao}")
     
-    # Verificação das restrições
-    print("\n" + "-" * 40)
-    print("VERIFICAÇÃO DAS RESTRIÇÕES:")
+    if rastreador is not None:
+        num_trechos = exportar_chrome(rastreador, arquivo_rastro, 'simplex')
+        print(f"{num_trechos} trechos da linha do tempo gravados em {arquivo_rastro}")
     
-    # Verificar oferta
-    for i in range(m):
-        soma_linha = sum(valores[i * n + j] for j in range(n))
-        print(f"Origem {i+1}: {soma_linha:.2f} = {oferta[i]} ✓" if abs(soma_linha - oferta[i]) < 1e-6 else f"Origem {i+1}: {soma_linha:.2f} ≠ {oferta[i]} ✗")
+    print(f"\nCUSTO TOTAL MÍNIMO: {custo_total:.2f}")
     
-    # Verificar demanda  
-    for j in range(n):
-        soma_coluna = sum(valores[i * n + j] for i in range(m))
-        print(f"Destino {j+1}: {soma_coluna:.2f} = {demanda[j]} ✓" if abs(soma_coluna - demanda[j]) < 1e-6 else f"Destino {j+1}: {soma_coluna:.2f} ≠ {demanda[j]} ✗")
+    # Verificação do certificado de otimalidade (primal, dual e folgas complementares)
+    print("\n" + "-" * 40)
+    print("VERIFICAÇÃO DO CERTIFICADO:")
+    
+    u, v = extrair_duais(tabela_final, m, n)
+    relatorio = verificar_solucao(oferta, demanda, custos, valores, u, v)
+    print(f"Viável (primal): {'✓' if relatorio['viavel_primal'] else '✗'}  "
+          f"(oferta {relatorio['violacao_oferta']:.2e}, demanda {relatorio['violacao_demanda']:.2e})")
+    print(f"Ótimo (dual e folgas complementares): {'✓' if relatorio['otimo'] else '✗'}  "
+          f"(dual {relatorio['violacao_dual']:.2e}, complementar {relatorio['violacao_complementar']:.2e})")
+    print(f"Gap primal-dual: {relatorio['gap']:.6f}")
         
     print("\n--- MÉTRICAS PYTHON ---")
     print(f"Tempo de execução: {tempo_execucao:.2f} segundos")
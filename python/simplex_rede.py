@@ -0,0 +1,648 @@
+"""
+Simplex de Rede (network simplex) para fluxo de custo mínimo
+Resolve o Problema de Transporte trabalhando apenas sobre os arcos
+existentes: a base é uma árvore geradora e cada pivô custa O(altura da
+árvore + subárvore) em vez de O((m + n) × m·n) como na tabela densa.
+
+Os arcos podem ser explícitos (arrays cauda/cabeça/custo) ou implícitos:
+no modo oráculo o grafo bipartido completo m × n nunca é materializado e
+os custos são calculados em blocos, sob demanda, durante o pricing.
+
+Capacidades 0 <= x_ij <= u_ij (opcionais, apenas com arcos explícitos) são
+tratadas como variáveis limitadas: um arco fora da árvore fica no limite
+inferior ou superior e o teste da razão considera os dois limites, sem
+nenhuma restrição extra.
+
+Convenções:
+    suprimento[v] > 0 para origens, < 0 para destinos (soma zero)
+    potencial pi com custo reduzido c_ij + pi_i - pi_j (zero nos arcos da árvore)
+    arcos fora da árvore têm fluxo zero (ou u_ij no limite superior); o fluxo
+    dos arcos da árvore é guardado no nó filho (fluxo_pai), então a memória
+    do motor sem capacidades é O(nós)
+"""
+
+import math
+
+import numpy as np
+
+from rede_esparsa import arcos_do_problema, nos_sem_arcos
+from balanceamento import CUSTO_FICTICIO, excesso_oferta, arcos_ficticios, folgas_do_fluxo
+from sensibilidade import analisar_base
+
+# Sentido do arco que liga um nó ao seu pai na árvore
+PARA_CIMA = 1     # nó -> pai
+PARA_BAIXO = -1   # pai -> nó
+
+# Estado de um arco no modo capacitado (multiplica o custo reduzido no pricing)
+NO_LIMITE_INFERIOR = 1
+NA_ARVORE = 0
+NO_LIMITE_SUPERIOR = -1
+
+BLOCO_VARREDURA = 1 << 20
+
+# ========================================
+# MOTOR
+# ========================================
+
+def _arvore_inicial(suprimento, num_arcos, bloco_arcos, extremos_arco, arcos_iniciais,
+                    custo_artificial, capacidade, tolerancia):
+    """Base inicial a partir de arcos de uma base anterior (partida a quente)
+
+    Os arcos formam uma floresta; os fluxos são recalculados de baixo para
+    cima com o suprimento atual. Um arco que ficaria com fluxo negativo,
+    acima da capacidade ou degenerado no sentido errado (a árvore deixaria de
+    ser fortemente viável) é cortado, e a subárvore passa a pendurar na raiz
+    por um arco artificial, como na partida a frio.
+    """
+    num_nos = len(suprimento)
+    raiz = num_nos
+
+    vizinhos = [[] for _ in range(num_nos)]
+    for k in arcos_iniciais:
+        cauda, cabeca = extremos_arco(k)
+        vizinhos[cauda].append((cabeca, k))
+        vizinhos[cabeca].append((cauda, k))
+
+    # Busca em largura em cada árvore da floresta (arcos que fechariam ciclo são ignorados)
+    pai = [raiz] * num_nos + [-1]
+    arco_pai = list(range(num_arcos, num_arcos + num_nos)) + [-1]
+    visitado = [False] * num_nos
+    ordem = []
+    for r in range(num_nos):
+        if visitado[r]:
+            continue
+        visitado[r] = True
+        inicio = len(ordem)
+        ordem.append(r)
+        i = inicio
+        while i < len(ordem):
+            v = ordem[i]
+            i += 1
+            for w, k in vizinhos[v]:
+                if not visitado[w]:
+                    visitado[w] = True
+                    pai[w] = v
+                    arco_pai[w] = k
+                    ordem.append(w)
+
+    # Fluxos de baixo para cima: o excesso de cada subárvore passa pelo arco do pai
+    excesso = np.asarray(suprimento, dtype=np.float64).tolist()
+    fluxo_pai = [0.0] * (num_nos + 1)
+    sentido = [0] * (num_nos + 1)
+    capacidade_pai = [math.inf] * (num_nos + 1)
+    for v in reversed(ordem):
+        e = excesso[v]
+        k = arco_pai[v]
+        if k < num_arcos:
+            para_cima = extremos_arco(k)[0] == v
+            fluxo = e if para_cima else -e
+            limite = math.inf if capacidade is None else float(capacidade[k])
+            degenerado = (fluxo <= tolerancia and not para_cima) or \
+                         (fluxo >= limite - tolerancia and para_cima)
+            if fluxo >= 0 and fluxo <= limite and not degenerado:
+                fluxo_pai[v] = fluxo
+                sentido[v] = PARA_CIMA if para_cima else PARA_BAIXO
+                capacidade_pai[v] = limite
+                excesso[pai[v]] += e
+                continue
+            # Corta o arco: a subárvore de v pendura na raiz
+            pai[v] = raiz
+            arco_pai[v] = num_arcos + v
+        fluxo_pai[v] = abs(e)
+        sentido[v] = PARA_CIMA if e >= 0 else PARA_BAIXO
+
+    # Profundidades e potenciais de cima para baixo (custo reduzido zero na árvore)
+    filhos = [set() for _ in range(num_nos + 1)]
+    for v in range(num_nos):
+        filhos[pai[v]].add(v)
+    profundidade = [0] * (num_nos + 1)
+    pi = np.zeros(num_nos + 1)
+    fila = [raiz]
+    for u in fila:
+        for v in filhos[u]:
+            profundidade[v] = profundidade[u] + 1
+            k = arco_pai[v]
+            if k < num_arcos:
+                custo = float(bloco_arcos(k, k + 1)[2][0])
+            else:
+                custo = 0.0 if sentido[v] == PARA_CIMA else custo_artificial
+            pi[v] = pi[u] - custo if sentido[v] == PARA_CIMA else pi[u] + custo
+            fila.append(v)
+
+    return pai, arco_pai, fluxo_pai, sentido, profundidade, filhos, pi, capacidade_pai
+
+def _simplex_rede(suprimento, num_arcos, bloco_arcos, extremos_arco, custo_max,
+                  max_iteracoes, tamanho_bloco, tolerancia, capacidade=None, arcos_iniciais=None,
+                  saturados_iniciais=None):
+    """Núcleo do simplex de rede sobre uma fonte de arcos qualquer
+
+    bloco_arcos(inicio, fim) -> (caudas, cabecas, custos) dos arcos [inicio, fim)
+    extremos_arco(k) -> (cauda, cabeca) do arco k
+    capacidade: array com o limite superior de cada arco (np.inf = sem limite) ou None
+    arcos_iniciais: arcos da base de uma resolução anterior (partida a quente) ou None
+    saturados_iniciais: arcos que começam no limite superior (só no modo capacitado)
+    """
+    num_nos = len(suprimento)
+    raiz = num_nos
+    custo_artificial = (custo_max + 1.0) * (num_nos + 1)
+    tolerancia = tolerancia * (1.0 + custo_max)
+
+    if arcos_iniciais is None:
+        # Base inicial: um arco artificial por nó, ligando-o à raiz.
+        # Nós com suprimento >= 0 enviam para a raiz (custo 0); a raiz envia para
+        # os demais com custo artificial alto. Fluxo pela raiz só sobra se inviável.
+        envia = suprimento >= 0
+
+        pi = np.append(np.where(envia, 0.0, custo_artificial), 0.0)
+
+        pai = [raiz] * num_nos + [-1]
+        arco_pai = list(range(num_arcos, num_arcos + num_nos)) + [-1]
+        fluxo_pai = np.abs(suprimento).tolist() + [0.0]
+        sentido = np.where(envia, PARA_CIMA, PARA_BAIXO).tolist() + [0]
+        profundidade = [1] * num_nos + [0]
+        filhos = [set() for _ in range(num_nos)] + [set(range(num_nos))]
+        capacidade_pai = [math.inf] * (num_nos + 1)
+    else:
+        # Arcos saturados da base anterior já levam sua capacidade: o restante do
+        # suprimento é que precisa passar pela árvore
+        saturados = []
+        if capacidade is not None and saturados_iniciais is not None:
+            suprimento = np.array(suprimento, dtype=np.float64)
+            arcos_na_base = set(int(k) for k in arcos_iniciais)
+            for k in saturados_iniciais:
+                k = int(k)
+                if k in arcos_na_base or not np.isfinite(capacidade[k]):
+                    continue
+                cauda, cabeca = extremos_arco(k)
+                suprimento[cauda] -= capacidade[k]
+                suprimento[cabeca] += capacidade[k]
+                saturados.append(k)
+        pai, arco_pai, fluxo_pai, sentido, profundidade, filhos, pi, capacidade_pai = \
+            _arvore_inicial(suprimento, num_arcos, bloco_arcos, extremos_arco, arcos_iniciais,
+                            custo_artificial, capacidade, tolerancia)
+
+    # Modo capacitado: estado de cada arco (a capacidade do arco que liga o nó ao pai
+    # fica em capacidade_pai)
+    capacitado = capacidade is not None
+    if capacitado:
+        estado = np.full(num_arcos, NO_LIMITE_INFERIOR, dtype=np.int8)
+        if arcos_iniciais is not None:
+            estado[saturados] = NO_LIMITE_SUPERIOR
+            estado[[k for k in arco_pai[:num_nos] if k < num_arcos]] = NA_ARVORE
+
+    if tamanho_bloco is None:
+        tamanho_bloco = max(int(math.sqrt(num_arcos)), 10)
+
+    iteracao = 0
+    proximo = 0
+    status = 'otimo'
+
+    while True:
+        # ---- Pricing parcial por blocos: primeiro bloco com arco violado ----
+        # Arcos da árvore têm custo reduzido zero e nunca são escolhidos
+        entrada = -1
+        examinados = 0
+        while examinados < num_arcos:
+            fim = min(proximo + tamanho_bloco, num_arcos)
+            caudas, cabecas, custos = bloco_arcos(proximo, fim)
+            reduzidos = custos + pi[caudas] - pi[cabecas]
+            if capacitado:
+                # No limite superior o arco melhora se o custo reduzido for positivo
+                reduzidos *= estado[proximo:fim]
+            k = int(np.argmin(reduzidos))
+            candidato = proximo + k
+            examinados += fim - proximo
+            proximo = fim if fim < num_arcos else 0
+            if reduzidos[k] < -tolerancia:
+                entrada = candidato
+                custo_entrada = float(custos[k])
+                break
+
+        if entrada == -1:
+            break
+
+        if iteracao >= max_iteracoes:
+            status = 'limite_iteracoes'
+            break
+        iteracao += 1
+
+        # ---- Ciclo formado pelo arco de entrada ----
+        # O fluxo percorre o ciclo de primeiro para segundo pelo arco de entrada:
+        # no limite superior o arco é percorrido ao contrário (seu fluxo diminui)
+        cauda_entra, cabeca_entra = extremos_arco(entrada)
+        primeiro, segundo = cauda_entra, cabeca_entra
+        sinal_entra = 1
+        if capacitado and estado[entrada] == NO_LIMITE_SUPERIOR:
+            primeiro, segundo = cabeca_entra, cauda_entra
+            sinal_entra = -1
+
+        u, v = primeiro, segundo
+        while u != v:
+            if profundidade[u] > profundidade[v]:
+                u = pai[u]
+            elif profundidade[v] > profundidade[u]:
+                v = pai[v]
+            else:
+                u = pai[u]
+                v = pai[v]
+        juncao = u
+
+        # ---- Teste da razão (regra da árvore fortemente viável) ----
+        # Arcos percorridos no sentido contrário limitam o passo pelo fluxo; com
+        # capacidades, os percorridos no próprio sentido limitam pela folga u - x
+        delta = math.inf
+        u_sai = -1
+        lado = 0
+        sai_no_superior = False
+
+        if capacitado:
+            delta = float(capacidade[entrada])
+
+            u = primeiro
+            while u != juncao:
+                if sentido[u] == PARA_CIMA:
+                    folga = fluxo_pai[u]
+                else:
+                    folga = capacidade_pai[u] - fluxo_pai[u]
+                if folga < delta:
+                    delta = folga
+                    u_sai = u
+                    lado = 1
+                    sai_no_superior = sentido[u] == PARA_BAIXO
+                u = pai[u]
+
+            u = segundo
+            while u != juncao:
+                if sentido[u] == PARA_BAIXO:
+                    folga = fluxo_pai[u]
+                else:
+                    folga = capacidade_pai[u] - fluxo_pai[u]
+                if folga <= delta:
+                    delta = folga
+                    u_sai = u
+                    lado = 2
+                    sai_no_superior = sentido[u] == PARA_CIMA
+                u = pai[u]
+        else:
+            u = primeiro
+            while u != juncao:
+                if sentido[u] == PARA_CIMA and fluxo_pai[u] < delta:
+                    delta = fluxo_pai[u]
+                    u_sai = u
+                    lado = 1
+                u = pai[u]
+
+            u = segundo
+            while u != juncao:
+                if sentido[u] == PARA_BAIXO and fluxo_pai[u] <= delta:
+                    delta = fluxo_pai[u]
+                    u_sai = u
+                    lado = 2
+                u = pai[u]
+
+        if delta == math.inf:
+            status = 'ilimitado'
+            break
+
+        # ---- Atualização do fluxo ao longo do ciclo ----
+        if delta > 0:
+            u = primeiro
+            while u != juncao:
+                fluxo_pai[u] -= sentido[u] * delta
+                u = pai[u]
+            u = segundo
+            while u != juncao:
+                fluxo_pai[u] += sentido[u] * delta
+                u = pai[u]
+
+        # O próprio arco de entrada é o gargalo: só troca de limite, a árvore não muda
+        if u_sai == -1:
+            estado[entrada] = -estado[entrada]
+            continue
+
+        # ---- Atualização da árvore: inverte o caminho u_entra -> u_sai ----
+        if lado == 1:
+            u_entra, v_entra = primeiro, segundo
+        else:
+            u_entra, v_entra = segundo, primeiro
+
+        if cauda_entra == u_entra:
+            pi_entra = pi[v_entra] - custo_entrada
+        else:
+            pi_entra = pi[v_entra] + custo_entrada
+        sigma = pi_entra - pi[u_entra]
+
+        if capacitado:
+            arco_sai = arco_pai[u_sai]
+            if arco_sai < num_arcos:
+                estado[arco_sai] = NO_LIMITE_SUPERIOR if sai_no_superior else NO_LIMITE_INFERIOR
+            estado[entrada] = NA_ARVORE
+
+        # Cada nó do caminho herda o arco (e o fluxo) do nó anterior
+        novo_pai, novo_arco = v_entra, entrada
+        novo_fluxo = delta if sinal_entra == 1 else float(capacidade[entrada]) - delta
+        novo_sentido = PARA_CIMA if cauda_entra == u_entra else PARA_BAIXO
+        novo_capacidade = float(capacidade[entrada]) if capacitado else math.inf
+        u = u_entra
+        while True:
+            antigo_pai = pai[u]
+            antigo_arco = arco_pai[u]
+            antigo_fluxo = fluxo_pai[u]
+            antigo_sentido = sentido[u]
+            filhos[antigo_pai].discard(u)
+            pai[u] = novo_pai
+            arco_pai[u] = novo_arco
+            fluxo_pai[u] = novo_fluxo
+            sentido[u] = novo_sentido
+            filhos[novo_pai].add(u)
+            if capacitado:
+                antigo_capacidade = capacidade_pai[u]
+                capacidade_pai[u] = novo_capacidade
+                novo_capacidade = antigo_capacidade
+            if u == u_sai:
+                break
+            novo_pai, novo_arco, novo_fluxo = u, antigo_arco, antigo_fluxo
+            novo_sentido = -antigo_sentido
+            u = antigo_pai
+
+        # Profundidades e potenciais da subárvore realocada (deslocamento constante)
+        subarvore = [u_entra]
+        profundidade[u_entra] = profundidade[v_entra] + 1
+        for w in subarvore:  # a lista cresce durante a iteração (busca em largura)
+            for f in filhos[w]:
+                profundidade[f] = profundidade[w] + 1
+                subarvore.append(f)
+        pi[subarvore] += sigma
+
+    arcos_base = np.array(arco_pai[:num_nos], dtype=np.int64)
+    fluxo_base = np.array(fluxo_pai[:num_nos])
+
+    artificiais = arcos_base >= num_arcos
+    if status == 'otimo' and np.any(fluxo_base[artificiais] > tolerancia):
+        status = 'inviavel'
+
+    # Apenas arcos reais com fluxo positivo (todo o resto tem fluxo zero)
+    positivos = ~artificiais & (fluxo_base > 0)
+    arcos = arcos_base[positivos]
+    fluxo_arcos = fluxo_base[positivos]
+
+    # Arcos fora da árvore no limite superior transportam a capacidade inteira
+    saturados = np.zeros(0, dtype=np.int64)
+    if capacitado:
+        saturados = np.flatnonzero(estado == NO_LIMITE_SUPERIOR)
+        arcos = np.concatenate([arcos, saturados])
+        fluxo_arcos = np.concatenate([fluxo_arcos, capacidade[saturados]])
+
+    return {
+        'status': status,
+        'arcos': arcos,
+        'fluxo_arcos': fluxo_arcos,
+        'base': arcos_base[~artificiais],
+        'saturados': saturados,
+        'potenciais': pi[:num_nos],
+        'iteracoes': iteracao,
+    }
+
+def simplex_rede(suprimento, cauda, cabeca, custo, max_iteracoes=10000000,
+                 tamanho_bloco=None, tolerancia=1e-9, custo_max=None, capacidade=None,
+                 arcos_iniciais=None, saturados_iniciais=None):
+    """Simplex de rede com base artificial, pricing por blocos e árvore fortemente viável
+
+    Retorna dict com status ('otimo', 'inviavel', 'ilimitado', 'limite_iteracoes'),
+    fluxo por arco, custo_total, potenciais e iteracoes. custo_max (padrão: maior
+    |custo| dos arcos) calibra o custo dos arcos artificiais. capacidade (opcional)
+    limita o fluxo de cada arco (np.inf = sem limite). 'base' e 'saturados'
+    trazem os arcos da árvore final e os arcos no limite superior; passados em
+    arcos_iniciais/saturados_iniciais de outra resolução do mesmo grafo (ou de
+    um parecido), servem de partida a quente.
+    """
+    suprimento = np.asarray(suprimento, dtype=np.float64)
+    cauda = np.asarray(cauda, dtype=np.int64)
+    cabeca = np.asarray(cabeca, dtype=np.int64)
+    custo = np.asarray(custo, dtype=np.float64)
+    num_arcos = len(cauda)
+
+    def bloco_arcos(inicio, fim):
+        return cauda[inicio:fim], cabeca[inicio:fim], custo[inicio:fim]
+
+    def extremos_arco(k):
+        return int(cauda[k]), int(cabeca[k])
+
+    if capacidade is not None:
+        capacidade = np.asarray(capacidade, dtype=np.float64)
+
+    if custo_max is None:
+        custo_max = float(np.abs(custo).max()) if num_arcos else 0.0
+    resultado = _simplex_rede(suprimento, num_arcos, bloco_arcos, extremos_arco, float(custo_max),
+                              max_iteracoes, tamanho_bloco, tolerancia, capacidade, arcos_iniciais,
+                              saturados_iniciais)
+
+    fluxo = np.zeros(num_arcos)
+    fluxo[resultado.pop('arcos')] = resultado.pop('fluxo_arcos')
+    resultado['fluxo'] = fluxo
+    resultado['custo_total'] = float(custo @ fluxo)
+    return resultado
+
+# ========================================
+# ORÁCULO DE CUSTOS (arcos implícitos)
+# ========================================
+
+def oraculo_escalar(funcao):
+    """Adapta uma função custo(i, j) escalar para a interface vetorizada por blocos"""
+    vetorizada = np.frompyfunc(funcao, 2, 1)
+
+    def custo_bloco(origens, destinos):
+        return vetorizada(origens, destinos).astype(np.float64)
+
+    return custo_bloco
+
+def oraculo_euclidiano(coord_origens, coord_destinos, tarifa=1.0):
+    """Custo = distância euclidiana × tarifa, calculado apenas para os pares pedidos"""
+    coord_origens = np.asarray(coord_origens, dtype=np.float64)
+    coord_destinos = np.asarray(coord_destinos, dtype=np.float64)
+    tarifa = np.asarray(tarifa, dtype=np.float64)
+
+    def custo_bloco(origens, destinos):
+        dx = coord_origens[origens, 0] - coord_destinos[destinos, 0]
+        dy = coord_origens[origens, 1] - coord_destinos[destinos, 1]
+        t = tarifa[origens] if tarifa.ndim else tarifa
+        return np.hypot(dx, dy) * t
+
+    return custo_bloco
+
+def _maior_custo(m, n, custo_bloco, tamanho=BLOCO_VARREDURA):
+    """Varre todos os pares em blocos (memória limitada) para achar max |custo|"""
+    maior = 0.0
+    for inicio in range(0, m * n, tamanho):
+        k = np.arange(inicio, min(inicio + tamanho, m * n))
+        maior = max(maior, float(np.abs(custo_bloco(k // n, k % n)).max()))
+    return maior
+
+def simplex_rede_oraculo(oferta, demanda, custo_bloco, custo_max=None,
+                         max_iteracoes=10000000, tamanho_bloco=None, tolerancia=1e-9,
+                         custo_ficticio=CUSTO_FICTICIO):
+    """Simplex de rede no bipartido completo m × n sem matriz de custos em memória
+
+    custo_bloco(origens, destinos) recebe arrays de índices e devolve os custos.
+    O arco k corresponde à rota (k // n, k % n). Se custo_max não for informado,
+    os custos são varridos uma vez em blocos para calibrar o custo artificial.
+    Se oferta ≠ demanda, os arcos k >= m·n ligam o nó fictício (balanceamento.py).
+    """
+    oferta = np.asarray(oferta, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    m, n = len(oferta), len(demanda)
+    num_rotas = m * n
+
+    suprimento = np.concatenate([oferta, -demanda])
+    excesso = excesso_oferta(oferta, demanda)
+    if excesso:
+        suprimento_ficticio, cauda_ficticia, cabeca_ficticia, custo_ficticio = \
+            arcos_ficticios(m, n, excesso, custo_ficticio)
+        suprimento = np.append(suprimento, suprimento_ficticio)
+    else:
+        cauda_ficticia = cabeca_ficticia = custo_ficticio = np.zeros(0)
+
+    def bloco_rotas(inicio, fim):
+        k = np.arange(inicio, fim)
+        origens = k // n
+        destinos = k % n
+        return origens, m + destinos, np.asarray(custo_bloco(origens, destinos), dtype=np.float64)
+
+    def bloco_arcos(inicio, fim):
+        if fim <= num_rotas:
+            return bloco_rotas(inicio, fim)
+        # Bloco que alcança os arcos fictícios (depois das m·n rotas)
+        a, b = max(inicio, num_rotas) - num_rotas, fim - num_rotas
+        partes = [bloco_rotas(inicio, num_rotas)] if inicio < num_rotas else []
+        partes.append((cauda_ficticia[a:b], cabeca_ficticia[a:b], custo_ficticio[a:b]))
+        return tuple(np.concatenate(p) for p in zip(*partes))
+
+    def extremos_arco(k):
+        if k >= num_rotas:
+            return int(cauda_ficticia[k - num_rotas]), int(cabeca_ficticia[k - num_rotas])
+        return k // n, m + k % n
+
+    if custo_max is None:
+        custo_max = _maior_custo(m, n, custo_bloco)
+    if len(custo_ficticio):
+        custo_max = max(custo_max, float(np.abs(custo_ficticio).max()))
+
+    resultado = _simplex_rede(suprimento, num_rotas + len(cauda_ficticia), bloco_arcos,
+                              extremos_arco, float(custo_max), max_iteracoes,
+                              tamanho_bloco, tolerancia)
+
+    arcos = resultado.pop('arcos')
+    fluxo = resultado.pop('fluxo_arcos')
+    ordem = np.argsort(arcos)
+    arcos, fluxo = arcos[ordem], fluxo[ordem]
+    resultado['potenciais'] = resultado['potenciais'][:m + n]
+
+    custo_folgas = 0.0
+    if excesso:
+        ficticios = arcos >= num_rotas
+        fluxo_ficticio = np.zeros(len(cauda_ficticia))
+        fluxo_ficticio[arcos[ficticios] - num_rotas] = fluxo[ficticios]
+        resultado.update(folgas_do_fluxo(excesso, fluxo_ficticio))
+        custo_folgas = float(custo_ficticio @ fluxo_ficticio)
+        arcos, fluxo = arcos[~ficticios], fluxo[~ficticios]
+
+    resultado['origem'] = arcos // n
+    resultado['destino'] = arcos % n
+    resultado['fluxo'] = fluxo
+    resultado['custo_total'] = float(np.asarray(custo_bloco(arcos // n, arcos % n)) @ fluxo) + custo_folgas
+    return resultado
+
+# ========================================
+# PROBLEMA DE TRANSPORTE
+# ========================================
+
+def resolver_transporte_rede(oferta, demanda, custos, custo_ficticio=CUSTO_FICTICIO, sensibilidade=False,
+                             **opcoes):
+    """Resolve o problema de transporte (matriz densa, RedeEsparsa ou oráculo) pelo Simplex de Rede
+
+    Para custos densos, 'valores' segue o layout de extrair_solucao (i*n + j);
+    para RedeEsparsa, 'valores' traz o fluxo de cada arco da rede (respeitando
+    rede.capacidade, quando houver). Se custos
+    for uma função custo_bloco(origens, destinos), usa o modo oráculo e a
+    solução vem esparsa em 'origem', 'destino' e 'fluxo'.
+
+    Problemas desbalanceados ganham um nó fictício implícito com custo
+    custo_ficticio por unidade; a folga vem em 'nao_enviado' (por origem) ou
+    'nao_atendido' (por destino) e custo_total inclui a penalidade.
+
+    Com sensibilidade=True (fora do modo oráculo), a solução ótima traz
+    também os duais u (origens) e v (destinos), os custos_reduzidos no layout
+    de 'valores', o intervalo de custo de cada rota em que o plano continua
+    ótimo (custo_minimo, custo_maximo) e os intervalos de oferta e demanda
+    em que a base continua viável (oferta_minima/maxima,
+    demanda_minima/maxima). A variação de oferta ou demanda é compensada no
+    nó fictício ou, num problema balanceado, no último destino; u e v são o
+    custo marginal de uma unidade a mais de oferta ou de demanda, com essa
+    compensação.
+    """
+    oferta = np.asarray(oferta, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    m, n = len(oferta), len(demanda)
+
+    if callable(custos):
+        return simplex_rede_oraculo(oferta, demanda, custos, custo_ficticio=custo_ficticio, **opcoes)
+
+    rede = arcos_do_problema(oferta, demanda, custos)
+    excesso = excesso_oferta(oferta, demanda)
+
+    # O nó fictício liga todas as origens (ou todos os destinos): esses não ficam isolados
+    origens, destinos = nos_sem_arcos(rede, oferta, demanda)
+    if excesso > 0:
+        origens = origens[:0]
+    elif excesso < 0:
+        destinos = destinos[:0]
+    if len(origens) or len(destinos):
+        return {
+            'status': 'inviavel',
+            'origens_sem_arcos': origens.tolist(),
+            'destinos_sem_arcos': destinos.tolist(),
+            'valores': None,
+            'custo_total': None,
+            'iteracoes': 0,
+        }
+
+    suprimento = np.concatenate([oferta, -demanda])
+    cauda, cabeca, custo, capacidade = rede.origem, m + rede.destino, rede.custo, rede.capacidade
+    if excesso:
+        suprimento_ficticio, cauda_ficticia, cabeca_ficticia, custo_ficticio = \
+            arcos_ficticios(m, n, excesso, custo_ficticio)
+        suprimento = np.append(suprimento, suprimento_ficticio)
+        cauda = np.concatenate([cauda, cauda_ficticia])
+        cabeca = np.concatenate([cabeca, cabeca_ficticia])
+        custo = np.concatenate([custo, custo_ficticio])
+        if capacidade is not None:
+            capacidade = np.concatenate([capacidade, np.full(len(cauda_ficticia), np.inf)])
+
+    resultado = simplex_rede(suprimento, cauda, cabeca, custo, capacidade=capacidade, **opcoes)
+    if sensibilidade and resultado['status'] == 'otimo':
+        resultado.update(_sensibilidade_transporte(suprimento, cauda, cabeca, custo, capacidade,
+                                                   resultado, m, n, rede.num_arcos))
+    fluxo = resultado.pop('fluxo')
+    resultado['valores'] = fluxo[:rede.num_arcos]
+    if excesso:
+        resultado.update(folgas_do_fluxo(excesso, fluxo[rede.num_arcos:]))
+        resultado['potenciais'] = resultado['potenciais'][:m + n]
+    return resultado
+
+def _sensibilidade_transporte(suprimento, cauda, cabeca, custo, capacidade, resultado, m, n, num_arcos):
+    """Traduz analisar_base para origens, destinos e rotas (sem os arcos do nó fictício)"""
+    analise = analisar_base(suprimento, cauda, cabeca, custo, resultado, capacidade)
+    # Potencial zero no nó de referência: u_i e v_j viram o custo marginal de
+    # uma unidade a mais de oferta em i ou de demanda em j
+    pi = resultado['potenciais'] - resultado['potenciais'][len(suprimento) - 1]
+    return {
+        'u': -pi[:m],
+        'v': pi[m:m + n],
+        'custos_reduzidos': analise['custos_reduzidos'][:num_arcos],
+        'custo_minimo': analise['custo_minimo'][:num_arcos],
+        'custo_maximo': analise['custo_maximo'][:num_arcos],
+        'oferta_minima': analise['suprimento_minimo'][:m],
+        'oferta_maxima': analise['suprimento_maximo'][:m],
+        'demanda_minima': -analise['suprimento_maximo'][m:m + n],
+        'demanda_maxima': -analise['suprimento_minimo'][m:m + n],
+    }
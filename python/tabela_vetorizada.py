@@ -0,0 +1,209 @@
+"""
+Construção vetorizada da tabela Simplex para Problemas de Transporte
+Gera a mesma tabela de construir_tabela_transporte diretamente em NumPy
+ou as restrições em formato esparso (COO/CSR), sem listas temporárias.
+"""
+
+import time
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+from instrumentacao import registrar
+
+# ========================================
+# TABELA DENSA (NumPy)
+# ========================================
+
+def _colunas_ficticias(tabela, oferta, demanda, primeira, custo_ficticio):
+    """Preenche as colunas fictícias (uma por origem ou por destino) de um problema desbalanceado"""
+    m, n = len(oferta), len(demanda)
+    excesso = oferta.sum() - demanda.sum()
+    if abs(excesso) <= 1e-6:
+        return
+    if excesso > 0:
+        linhas = np.arange(m)
+    else:
+        linhas = m + np.arange(n)
+    colunas = primeira + np.arange(len(linhas))
+    tabela[linhas, colunas] = 1.0
+    tabela[-1, colunas] = -np.broadcast_to(custo_ficticio, len(linhas))
+
+def _num_ficticias(oferta, demanda):
+    excesso = oferta.sum() - demanda.sum()
+    if abs(excesso) <= 1e-6:
+        return 0
+    return len(oferta) if excesso > 0 else len(demanda)
+
+def construir_tabela_transporte_numpy(oferta, demanda, custos, dtype=np.float64, custo_ficticio=0.0):
+    """Constrói a tabela simplex do problema de transporte em um ndarray pré-alocado
+
+    Se oferta ≠ demanda, as colunas logo após as variáveis x_ij são as
+    variáveis fictícias (sobra por origem ou falta por destino).
+    """
+    oferta = np.asarray(oferta, dtype=dtype)
+    demanda = np.asarray(demanda, dtype=dtype)
+    m = len(oferta)
+    n = len(demanda)
+    num_vars = m * n
+    num_ficticias = _num_ficticias(oferta, demanda)
+
+    # Uma única alocação: (m + n) restrições + linha objetivo
+    tabela = np.zeros((m + n + 1, num_vars + num_ficticias + m + n + 1), dtype=dtype)
+
+    # Coluna k = i*n + j aparece na linha de oferta i e na linha de demanda m + j
+    colunas = np.arange(num_vars)
+    tabela[colunas // n, colunas] = 1.0
+    tabela[m + colunas % n, colunas] = 1.0
+    _colunas_ficticias(tabela, oferta, demanda, num_vars, custo_ficticio)
+
+    # Variáveis de folga (identidade após as variáveis x_ij e fictícias)
+    restricoes = np.arange(m + n)
+    tabela[restricoes, num_vars + num_ficticias + restricoes] = 1.0
+
+    # Lado direito
+    tabela[:m, -1] = oferta
+    tabela[m:m + n, -1] = demanda
+
+    # Função objetivo (mesma convenção da versão em listas: -custo_ij)
+    tabela[-1, :num_vars] = -np.asarray(custos, dtype=dtype).reshape(num_vars)
+
+    return tabela
+
+def construir_tabela_transporte_rede(oferta, demanda, rede, dtype=np.float64, custo_ficticio=0.0):
+    """Tabela simplex com uma coluna por arco de uma RedeEsparsa (rotas ausentes não viram variáveis)"""
+    oferta = np.asarray(oferta, dtype=dtype)
+    demanda = np.asarray(demanda, dtype=dtype)
+    m, n, k = rede.m, rede.n, rede.num_arcos
+    num_ficticias = _num_ficticias(oferta, demanda)
+
+    tabela = np.zeros((m + n + 1, k + num_ficticias + m + n + 1), dtype=dtype)
+
+    arcos = np.arange(k)
+    tabela[rede.origem, arcos] = 1.0
+    tabela[m + rede.destino, arcos] = 1.0
+    _colunas_ficticias(tabela, oferta, demanda, k, custo_ficticio)
+
+    restricoes = np.arange(m + n)
+    tabela[restricoes, k + num_ficticias + restricoes] = 1.0
+
+    tabela[:m, -1] = oferta
+    tabela[m:m + n, -1] = demanda
+    tabela[-1, :k] = -rede.custo
+
+    return tabela
+
+def simplex_numpy(tabela, max_iteracoes=1000000, instrumentacao=None, callback=None,
+                  rastreador=None):
+    """Simplex sobre a tabela NumPy - mesmas regras de pivoteamento, retorna número de iterações
+
+    instrumentacao, callback e rastreador como em simplex.simplex.
+    """
+    num_restricoes = tabela.shape[0] - 1
+    iteracao = 0
+    medir = instrumentacao is not None or rastreador is not None
+
+    while iteracao < max_iteracoes:
+        iteracao += 1
+        if medir:
+            marca = time.perf_counter()
+
+        # Coluna pivô: menor valor da linha objetivo
+        linha_obj = tabela[-1, :-1]
+        coluna_pivo = int(np.argmin(linha_obj))
+        if medir:
+            marca = registrar(instrumentacao, 'precificacao', marca, rastreador)
+        if linha_obj[coluna_pivo] >= 0:
+            return iteracao
+
+        # Linha pivô: teste da razão mínima apenas nos elementos positivos
+        coluna = tabela[:num_restricoes, coluna_pivo]
+        rhs = tabela[:num_restricoes, -1]
+        positivos = coluna > 0
+        if not positivos.any():
+            print("Problema ilimitado")
+            return -1
+        razoes = np.full(num_restricoes, np.inf)
+        np.divide(rhs, coluna, out=razoes, where=positivos)
+        razoes[razoes < 0] = np.inf
+        linha_pivo = int(np.argmin(razoes))
+        if medir:
+            marca = registrar(instrumentacao, 'razao', marca, rastreador)
+
+        # Pivoteamento como atualização de posto 1 (apenas linhas afetadas)
+        passo = razoes[linha_pivo]
+        tabela[linha_pivo] /= tabela[linha_pivo, coluna_pivo]
+        multiplicadores = tabela[:, coluna_pivo].copy()
+        multiplicadores[linha_pivo] = 0.0
+        afetadas = np.flatnonzero(multiplicadores)
+        tabela[afetadas] -= np.outer(multiplicadores[afetadas], tabela[linha_pivo])
+        if medir:
+            registrar(instrumentacao, 'pivoteamento', marca, rastreador)
+        if callback is not None:
+            callback(iteracao, coluna_pivo, linha_pivo, float(-tabela[-1, -1]), float(passo))
+
+    print(f"ATENÇÃO: Limite de {max_iteracoes} iterações atingido!")
+    return iteracao
+
+def extrair_solucao_numpy(tabela, m, n):
+    """Extrai a solução da tabela NumPy final"""
+    num_vars = m * n
+    colunas = tabela[:-1, :num_vars]
+
+    # Variável básica: coluna com exatamente um 1 e o resto zeros
+    uns = (colunas == 1).sum(axis=0)
+    zeros = (colunas == 0).sum(axis=0)
+    basicas = (uns == 1) & (zeros == colunas.shape[0] - 1)
+
+    valores = np.zeros(num_vars)
+    linhas_base = np.argmax(colunas[:, basicas] == 1, axis=0)
+    valores[basicas] = np.maximum(0, tabela[linhas_base, -1])
+
+    custo_total = -tabela[-1, -1]
+
+    return valores, custo_total
+
+# ========================================
+# RESTRIÇÕES ESPARSAS (COO / CSR)
+# ========================================
+
+def construir_restricoes_transporte_coo(m, n):
+    """Retorna (linhas, colunas, valores) da matriz de restrições (m + n) × (m·n)"""
+    num_vars = m * n
+    colunas = np.arange(num_vars, dtype=np.int64)
+
+    linhas = np.concatenate([colunas // n, m + colunas % n])
+    colunas = np.concatenate([colunas, colunas])
+    valores = np.ones(2 * num_vars)
+
+    return linhas, colunas, valores
+
+def construir_indices_transporte_csr(m, n):
+    """Retorna (indptr, indices, dados) da matriz de restrições CSR, por aritmética de índices"""
+    num_vars = m * n
+
+    # Linha de oferta i: colunas i*n .. i*n + n - 1 (n entradas)
+    # Linha de demanda j: colunas j, j + n, ..., j + (m-1)*n (m entradas)
+    indptr = np.concatenate([
+        np.arange(0, num_vars + 1, n, dtype=np.int64),
+        num_vars + np.arange(m, num_vars + 1, m, dtype=np.int64),
+    ])
+    indices = np.concatenate([
+        np.arange(num_vars, dtype=np.int64),
+        (np.arange(n, dtype=np.int64)[:, None] + n * np.arange(m, dtype=np.int64)).ravel(),
+    ])
+    dados = np.ones(2 * num_vars)
+
+    return indptr, indices, dados
+
+def construir_restricoes_transporte_csr(m, n):
+    """Matriz de restrições (m + n) × (m·n) como scipy.sparse.csr_matrix (exige SciPy)"""
+    if sp is None:
+        raise ImportError("construir_restricoes_transporte_csr exige SciPy; "
+                          "use construir_indices_transporte_csr para os arrays CSR")
+    indptr, indices, dados = construir_indices_transporte_csr(m, n)
+    return sp.csr_matrix((dados, indices, indptr), shape=(m + n, m * n))
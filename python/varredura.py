@@ -0,0 +1,103 @@
+"""
+Registro incremental (JSONL) das varreduras de benchmark
+Cada repetição concluída vira uma linha JSON no arquivo da varredura,
+gravada e sincronizada com o disco assim que termina: se a varredura cair
+no meio (ex.: no 100×100 depois de horas), o que já rodou não se perde.
+
+Ao retomar, as combinações (tamanho, semente, motor) já presentes no
+arquivo são puladas e a execução gravada é reaproveitada nas estatísticas.
+Uma última linha incompleta (queda durante a escrita) é descartada.
+
+Cada linha leva também os parâmetros da instância (família, densidade,
+blocos...), e a retomada exige que sejam os mesmos da varredura atual:
+um 10x10 com outra densidade não pode ser reaproveitado como se fosse o
+mesmo experimento.
+"""
+
+import os
+import json
+
+# ========================================
+# LEITURA
+# ========================================
+
+def chave_execucao(tamanho, semente, motor):
+    return (tamanho, semente, motor)
+
+def carregar_varredura(caminho):
+    """Registros de um arquivo JSONL: {(tamanho, semente, motor): registro}"""
+    concluidas = {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for numero, linha in enumerate(f, 1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                print(f"{caminho}:{numero}: linha incompleta ignorada")
+                continue
+            concluidas[chave_execucao(registro['tamanho'], registro['semente'], registro['motor'])] = registro
+    return concluidas
+
+def conferir_parametros(caminho, concluidas, parametros):
+    """Levanta ValueError se alguma execução gravada tem parâmetros de instância diferentes"""
+    for registro in concluidas.values():
+        diferentes = {chave: registro.get(chave, '(ausente)') for chave, valor in parametros.items()
+                      if registro.get(chave, '(ausente)') != valor}
+        if diferentes:
+            detalhes = ', '.join(f"{chave}={valor!r} (atual {parametros[chave]!r})"
+                                 for chave, valor in diferentes.items())
+            raise ValueError(f"{caminho}: execução {registro['tamanho']}/{registro['semente']}/{registro['motor']} "
+                             f"gravada com outros parâmetros: {detalhes}")
+
+# ========================================
+# ESCRITA
+# ========================================
+
+def abrir_varredura(caminho, retomar=False, parametros=None):
+    """Abre o arquivo da varredura para acrescentar linhas
+
+    parametros: parâmetros da instância (ex.: familia, densidade), gravados
+    em todas as linhas. Com retomar, carrega as execuções já gravadas e
+    levanta ValueError se alguma foi feita com outros parâmetros; sem,
+    começa um arquivo novo (sobrescrevendo um existente).
+    """
+    parametros = dict(parametros or {})
+    concluidas = {}
+    if retomar and os.path.exists(caminho):
+        concluidas = carregar_varredura(caminho)
+        conferir_parametros(caminho, concluidas, parametros)
+        print(f"Retomando {caminho}: {len(concluidas)} execuções já concluídas")
+    arquivo = open(caminho, 'a' if retomar else 'w', encoding='utf-8')
+    # Queda no meio de uma linha: a próxima começa numa linha nova
+    if retomar and arquivo.tell() > 0:
+        with open(caminho, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                arquivo.write('\n')
+    return {'caminho': caminho, 'arquivo': arquivo, 'concluidas': concluidas, 'parametros': parametros}
+
+def execucao_concluida(varredura, tamanho, semente, motor):
+    """Execução já gravada para a combinação, ou None (também sem varredura)"""
+    if varredura is None:
+        return None
+    registro = varredura['concluidas'].get(chave_execucao(tamanho, semente, motor))
+    return None if registro is None else registro['execucao']
+
+def gravar_execucao(varredura, tamanho, semente, motor, execucao, **contexto):
+    """Acrescenta uma linha com a execução e a sincroniza com o disco; sem varredura não faz nada
+
+    A linha leva os parâmetros da varredura; contexto: campos extras.
+    """
+    if varredura is None:
+        return
+    registro = {'tamanho': tamanho, 'semente': semente, 'motor': motor, **varredura['parametros'], **contexto,
+                'execucao': execucao}
+    arquivo = varredura['arquivo']
+    arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+    arquivo.flush()
+    os.fsync(arquivo.fileno())
+    varredura['concluidas'][chave_execucao(tamanho, semente, motor)] = registro
+
+def fechar_varredura(varredura):
+    varredura['arquivo'].close()